@@ -0,0 +1,43 @@
+from fastapi import Depends, HTTPException
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+
+from core.security import TokenClaims, decode_token
+
+bearer_scheme = HTTPBearer(auto_error=False)
+
+
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials | None = Depends(bearer_scheme),
+) -> TokenClaims:
+    """``Authorization: Bearer <token>`` 헤더의 세션 토큰으로 현재 유저를 확인한다.
+
+    토큰만 검증하므로 DB 조회가 없다.
+    """
+    if credentials is None:
+        raise HTTPException(
+            status_code=401, detail="로그인이 필요합니다.", headers={"WWW-Authenticate": "Bearer"}
+        )
+    claims = decode_token(credentials.credentials)
+    if claims is None:
+        raise HTTPException(
+            status_code=401,
+            detail="세션이 만료되었거나 올바르지 않습니다.",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return claims
+
+
+async def require_admin(current_user: TokenClaims = Depends(get_current_user)) -> TokenClaims:
+    """운영진/모임장만 허용한다."""
+    if not current_user.is_admin:
+        raise HTTPException(status_code=403, detail="권한이 없습니다.")
+    return current_user
+
+
+def resolve_user_id(current_user: TokenClaims, user_id: int | None) -> int:
+    """요청한 user_id 를 확인한다. 생략하면 본인, 다른 유저는 운영진만 가능."""
+    if user_id is None or user_id == current_user.user_id:
+        return current_user.user_id
+    if not current_user.is_admin:
+        raise HTTPException(status_code=403, detail="다른 유저의 정보에 접근할 수 없습니다.")
+    return user_id
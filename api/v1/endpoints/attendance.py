@@ -1,116 +1,99 @@
-from sqlalchemy import func, select
+from datetime import date
+
+from sqlalchemy import and_, asc, select
 from fastapi import APIRouter, Depends, HTTPException, Form, Query
+from pydantic import BaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncSession
+from api.v1.deps import get_current_user, require_admin, resolve_user_id
+from core.cache import GROUP_LIST_NAMESPACE, response_cache
+from core.security import TokenClaims
 from db.session import get_db
+from db.write_queue import run_write
 from models.attendance import Attendance, AttendanceStatus
 from models.group import PartEnum
-from models.user import User
 from models.group import Group
+from services.attendance_service import (
+    AppliedChange,
+    AttendanceChange,
+    MissingEntityError,
+    apply_attendance_changes,
+)
+from services.group_events import attendance_events, publish_attendance
 
 router = APIRouter()
 
 
+class AttendanceChangeIn(BaseModel):
+    group_id: int
+    user_id: int
+    part: PartEnum
+    status: AttendanceStatus
+
+
+class BulkAttendanceIn(BaseModel):
+    changes: list[AttendanceChangeIn] = Field(..., min_length=1, max_length=500)
+
+
+async def _apply_changes(
+    session: AsyncSession, changes: list[AttendanceChange]
+) -> tuple[list[AppliedChange], list[dict]]:
+    """출석 변경을 적용하고, 같은 트랜잭션에서 버전을 매긴 알림 이벤트를 만든다."""
+    applied = await apply_attendance_changes(session, changes)
+    return applied, await attendance_events(session, applied)
+
+
 @router.post("/set")
 async def set_attendance(
     group_id: int = Form(...),
     user_id: int = Form(...),
     part: PartEnum = Form(...),
     status: AttendanceStatus = Form(...),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    current_user: TokenClaims = Depends(get_current_user),
 ):
-    # 기존 출석 기록 조회
-    stmt = select(Attendance).where(
-        Attendance.group_id == group_id,
-        Attendance.user_id == user_id,
-        Attendance.part == part
-    )
-    result = await db.execute(stmt)
-    record = result.scalars().first()
+    user_id = resolve_user_id(current_user, user_id)
+    change = AttendanceChange(group_id, user_id, part, status)
 
-    # 유저와 모임 정보
-    user = await db.get(User, user_id)
-    group = await db.get(Group, group_id)
-    if not user or not group:
+    try:
+        _, events = await run_write(db, lambda session: _apply_changes(session, [change]))
+    except MissingEntityError:
         raise HTTPException(status_code=404, detail="유저 또는 모임을 찾을 수 없습니다.")
-
-    # 특정 날짜에 이미 참석한 기록이 있는지 확인하는 헬퍼
-    async def already_attended(exclude_id: int | None = None) -> bool:
-        q = (
-            select(func.count())
-            .select_from(Attendance)
-            .join(Group, Attendance.group_id == Group.id)
-            .where(
-                Attendance.user_id == user_id,
-                Group.date == group.date,
-                Attendance.status == AttendanceStatus.attending,
-            )
-        )
-        if exclude_id is not None:
-            q = q.where(Attendance.id != exclude_id)
-        res = await db.execute(q)
-        return res.scalar_one() > 0
-
-    # 출석 상태 변경 로직
-    if record:
-        previous_status = record.status
-        record.status = status
-
-        if previous_status != status:
-            # 참석 ➡ 불참
-            if previous_status == AttendanceStatus.attending and status == AttendanceStatus.absent:
-                if not await already_attended(exclude_id=record.id):
-                    user.attendance_count = max(0, (user.attendance_count or 1) - 1)
-
-                    # 최신 참석일 재계산
-                    subq = (
-                        select(func.max(Group.date))
-                        .join(Attendance, Attendance.group_id == Group.id)
-                        .where(
-                            Attendance.user_id == user_id,
-                            Attendance.status == AttendanceStatus.attending,
-                        )
-                    )
-                    result = await db.execute(subq)
-                    user.last_attended = result.scalar_one_or_none()
-
-            # 불참 ➡ 참석
-            elif previous_status == AttendanceStatus.absent and status == AttendanceStatus.attending:
-                
-
-                if not await already_attended():
-                    user.attendance_count = (user.attendance_count or 0) + 1
-
-
-                if not user.last_attended or group.date > user.last_attended.date():
-                    user.last_attended = group.date
-                
-
-    else:
-        # 신규 등록
-        record = Attendance(
-            group_id=group_id,
-            user_id=user_id,
-            part=part,
-            status=status
-        )
-        db.add(record)
-
-        if status == AttendanceStatus.attending:
-            if not await already_attended():
-                user.attendance_count = (user.attendance_count or 0) + 1
-            if not user.last_attended or group.date > user.last_attended.date():
-                user.last_attended = group.date
-    await db.commit()
+    # 출석 변경은 모임 목록의 참석 인원에만 영향을 준다
+    await response_cache.invalidate(GROUP_LIST_NAMESPACE)
+    publish_attendance(events)
     return {"message": "출석 상태가 저장되었습니다."}
 
 
+@router.post("/set_bulk")
+async def set_attendance_bulk(
+    payload: BulkAttendanceIn,
+    db: AsyncSession = Depends(get_db),
+    _admin: TokenClaims = Depends(require_admin),
+):
+    """여러 출석 변경을 한 번의 트랜잭션으로 저장한다."""
+    changes = [
+        AttendanceChange(c.group_id, c.user_id, c.part, c.status)
+        for c in payload.changes
+    ]
+
+    try:
+        applied, events = await run_write(db, lambda session: _apply_changes(session, changes))
+    except MissingEntityError:
+        raise HTTPException(status_code=404, detail="유저 또는 모임을 찾을 수 없습니다.")
+    await response_cache.invalidate(GROUP_LIST_NAMESPACE)
+    publish_attendance(events)
+    return {"message": "출석 상태가 저장되었습니다.", "changed": len(applied)}
+
+
 @router.get("/get")
 async def get_attendance(
     group_id: int = Query(...),
-    user_id: int = Query(...),
+    user_id: int | None = Query(None),
     part: PartEnum = Query(...),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    current_user: TokenClaims = Depends(get_current_user),
 ):
+    user_id = resolve_user_id(current_user, user_id)
     result = await db.execute(
         select(Attendance).where(
             Attendance.group_id == group_id,
@@ -119,4 +102,36 @@ async def get_attendance(
         )
     )
     record = result.scalars().first()
-    return {"status": record.status if record else None}
\ No newline at end of file
+    return {"status": record.status if record else None}
+
+
+@router.get("/my")
+async def get_my_attendance(
+    user_id: int | None = Query(None),
+    start_date: date | None = Query(None),
+    end_date: date | None = Query(None),
+    db: AsyncSession = Depends(get_db),
+    current_user: TokenClaims = Depends(get_current_user),
+):
+    """유저의 모든 모임(또는 기간 내 모임)에 대한 부별 출석 상태를 한 번에 조회한다."""
+    user_id = resolve_user_id(current_user, user_id)
+    stmt = (
+        select(Group.id, Attendance.part, Attendance.status)
+        .select_from(Group)
+        .outerjoin(
+            Attendance,
+            and_(Attendance.group_id == Group.id, Attendance.user_id == user_id),
+        )
+        .order_by(asc(Group.date), asc(Group.id))
+    )
+    if start_date is not None:
+        stmt = stmt.where(Group.date >= start_date)
+    if end_date is not None:
+        stmt = stmt.where(Group.date <= end_date)
+
+    statuses: dict[int, dict] = {}
+    for group_id, part, status in (await db.execute(stmt)).all():
+        parts = statuses.setdefault(group_id, {p.value: None for p in PartEnum})
+        if part is not None:
+            parts[part.value] = status
+    return [{"group_id": group_id, "statuses": parts} for group_id, parts in statuses.items()]
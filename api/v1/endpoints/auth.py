@@ -1,7 +1,16 @@
 from fastapi import APIRouter, Depends, HTTPException, Form
+from sqlalchemy import update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from core.security import (
+    create_token,
+    hash_password_async,
+    needs_rehash,
+    verify_password_async,
+    verify_unknown_user_async,
+)
 from db.session import get_db
+from db.write_queue import run_write
 from models.user import User
 
 router = APIRouter()
@@ -15,13 +24,34 @@ async def login(
     result = await db.execute(select(User).where(User.email == email))
     user = result.scalars().first()
 
-    if not user or user.password != password:
+    # 해시 검증은 스레드 풀에서 실행해 이벤트 루프를 막지 않는다
+    # 없는 이메일도 같은 비용의 검증을 거쳐 응답 시간으로 가입 여부가 드러나지 않게 한다
+    if not user:
+        await verify_unknown_user_async(password)
         raise HTTPException(status_code=401, detail="이메일 또는 비밀번호가 올바르지 않습니다")
+    if not await verify_password_async(password, user.password):
+        raise HTTPException(status_code=401, detail="이메일 또는 비밀번호가 올바르지 않습니다")
+
+    # 평문 등 예전 방식으로 저장된 비밀번호는 로그인 시 다시 해시한다
+    if needs_rehash(user.password):
+        stored, rehashed = user.password, await hash_password_async(password)
+
+        async def write(session: AsyncSession):
+            # 그 사이 비밀번호가 바뀌었으면 덮어쓰지 않는다
+            await session.execute(
+                update(User)
+                .where(User.id == user.id, User.password == stored)
+                .values(password=rehashed)
+            )
+
+        await run_write(db, write)
 
     return {
         "id": user.id,
         "username": user.username,
         "role": user.role,
         "gender": user.gender,
-        "email": user.email
-    }
\ No newline at end of file
+        "email": user.email,
+        "access_token": create_token(user.id, user.username, user.role.value),
+        "token_type": "bearer",
+    }
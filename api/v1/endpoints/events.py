@@ -0,0 +1,72 @@
+from fastapi import APIRouter, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+
+from core.config import get_settings
+from core.pubsub import KEEPALIVE, RESYNC, broker, group_topic
+from db.session import ReadSessionLocal
+from models.group import GroupVersion
+
+router = APIRouter()
+settings = get_settings()
+
+
+async def _is_stale(known: dict[int, int] | None) -> bool:
+    """클라이언트가 가진 모임 버전 중 DB 와 다른 것이 있으면 True."""
+    if known is None:
+        return True
+    async with ReadSessionLocal() as db:
+        current = dict(
+            (
+                await db.execute(
+                    select(GroupVersion.group_id, GroupVersion.version).where(
+                        GroupVersion.group_id.in_(known)
+                    )
+                )
+            ).all()
+        )
+    return any(current.get(group_id, 0) != version for group_id, version in known.items())
+
+
+async def _event_stream(topics: list[str], known: dict[int, int] | None):
+    # 응답이 시작될 때 구독해야 스트림이 끝날 때 항상 해제된다
+    subscription = broker.subscribe(topics)
+    try:
+        # 연결이 끊기면 브라우저는 3초 뒤 다시 연결한다
+        yield b"retry: 3000\n\n"
+        # 구독을 마친 뒤 버전을 비교하므로, 클라이언트 스냅샷 이후의 변경은
+        # 여기서 드러나거나 구독으로 전달된다. 뒤처진 경우에만 다시 조회하게 한다
+        if await _is_stale(known):
+            yield RESYNC
+        while True:
+            frame = await subscription.next(timeout=settings.event_keepalive_seconds)
+            # 한동안 이벤트가 없으면 프록시가 연결을 끊지 않도록 주석 줄을 보낸다
+            yield frame if frame is not None else KEEPALIVE
+    finally:
+        subscription.close()
+
+
+@router.get("/groups")
+async def group_events(
+    group_id: list[int] = Query(..., min_length=1, max_length=200),
+    version: list[int] = Query([], max_length=200),
+):
+    """모임별 실시간 알림 (Server-Sent Events).
+
+    ``version`` 은 ``group_id`` 와 같은 순서로 클라이언트가 가진 모임 버전
+    (``/me/dashboard`` 의 ``version``)이다.
+
+    - ``attendance``: 출석 변경으로 생긴 ``part_counts`` 증감분
+    - ``teams``: 조 편성이 끝난 모임의 전체 명단
+    - ``resync``: 구독 시점에 클라이언트의 버전이 DB 와 다르거나(버전을
+      보내지 않은 경우 포함) 클라이언트가 너무 느려 이벤트를 놓쳤을 때
+      보내며 전체를 다시 조회하라는 뜻
+
+    ``attendance`` 와 ``teams`` 에는 변경 후의 모임 ``version`` 이 붙는다.
+    """
+    known = dict(zip(group_id, version)) if len(version) == len(group_id) else None
+    return StreamingResponse(
+        _event_stream([group_topic(g) for g in group_id], known),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,87 +1,178 @@
 # 표준 라이브러리
-from datetime import datetime
-import random
+from datetime import date, datetime
 
 # 서드파티
-from fastapi import APIRouter, Depends, Form, HTTPException
-from sqlalchemy import delete, select, asc
+from fastapi import APIRouter, Depends, Form, HTTPException, Query, Request
+from sqlalchemy import and_, asc, case, delete, func, insert, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
 # 로컬 모듈
-from db.session import get_db
+from api.v1.deps import get_current_user, require_admin, resolve_user_id
+from core.cache import GROUP_LIST_NAMESPACE, group_namespace, response_cache
+from core.pubsub import broker, group_topic
+from core.security import TokenClaims
+from db.session import get_cacheable_db, get_db
+from db.write_queue import run_write
 from models.attendance import Attendance, AttendanceStatus
-from models.group import Group, Team, TeamUser, PartEnum
-from models.user import User, RoleEnum, GenderEnum
+from models.group import Group, GroupVersion, Team, TeamUser, PartEnum
+from models.user import User, RoleEnum, HateList
+from services.attendance_service import bump_group_versions
+from services.group_events import publish_teams
+from services.team_builder import Candidate, build_teams
+from services.team_history import load_pair_counts, record_team_pairs
 
 router = APIRouter()
 
 @router.post("/create")
 async def create_group(
     date: str = Form(...),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    _admin: TokenClaims = Depends(require_admin),
 ):
     try:
         parsed_date = datetime.strptime(date, "%Y-%m-%d").date()
     except ValueError:
         raise HTTPException(status_code=400, detail="날짜 형식이 올바르지 않습니다 (YYYY-MM-DD)")
 
-    result = await db.execute(select(Group).where(Group.date == parsed_date))
-    existing = result.scalars().first()
-    if existing:
-        raise HTTPException(status_code=400, detail="이미 존재하는 날짜입니다.")
+    async def write(session: AsyncSession):
+        result = await session.execute(select(Group).where(Group.date == parsed_date))
+        existing = result.scalars().first()
+        if existing:
+            raise HTTPException(status_code=400, detail="이미 존재하는 날짜입니다.")
+        session.add(Group(date=parsed_date))
 
-    group = Group(date=parsed_date)
-    db.add(group)
-    await db.commit()
+    await run_write(db, write)
+    await response_cache.invalidate(GROUP_LIST_NAMESPACE)
     return {"message": "모임이 성공적으로 생성되었습니다."}
 
 
 
 
-# @router.get("/list")
-# async def list_groups(db: AsyncSession = Depends(get_db)):
-#     result = await db.execute(select(Group).order_by(desc(Group.date)))
-#     groups = result.scalars().all()
-#     return [{"id": g.id, "date": g.date.isoformat()} for g in groups]
+def _parse_cursor(cursor: str) -> tuple[date, int]:
+    """``"YYYY-MM-DD_<id>"`` 형식의 커서를 (날짜, id)로 변환한다."""
+    try:
+        raw_date, raw_id = cursor.split("_", 1)
+        return datetime.strptime(raw_date, "%Y-%m-%d").date(), int(raw_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="커서 형식이 올바르지 않습니다.")
 
-@router.get("/list")
-async def list_groups(db: AsyncSession = Depends(get_db)):
-    groups = (await db.execute(select(Group).order_by(asc(Group.date)))).scalars().all()
-
-    result = []
-    for group in groups:
-        attendance_rows = (await db.execute(
-            select(User.role, Attendance.part)
-            .join(Attendance, Attendance.user_id == User.id)
-            .where(Attendance.group_id == group.id)
-            .where(Attendance.status == AttendanceStatus.attending)
-        )).all()
 
-        counts = {
-            PartEnum.FIRST.value: {"admin": 0, "member": 0},
-            PartEnum.SECOND.value: {"admin": 0, "member": 0},
-        }
+def _role_bucket():
+    """운영진/모임장은 admin, 그 외는 member 로 묶는 SQL 식."""
+    return case(
+        (User.role.in_([RoleEnum.admin, RoleEnum.leader]), "admin"),
+        else_="member",
+    )
+
 
-        for role, part in attendance_rows:
-            key = "admin" if role in [RoleEnum.admin, RoleEnum.leader] else "member"
-            counts[part.value][key] += 1
+async def fetch_group_summaries(
+    db: AsyncSession,
+    start_date: date | None = None,
+    end_date: date | None = None,
+    limit: int | None = None,
+    cursor: str | None = None,
+    with_versions: bool = False,
+) -> tuple[list[dict], str | None]:
+    """모임 목록과 부별 운영진/회원 참석 수를 한 번의 집계 쿼리로 가져온다.
+
+    ``limit`` 이 주어지면 (date, id) 기준 keyset 페이지네이션을 적용하고,
+    다음 페이지가 있을 때 두 번째 값으로 다음 커서를 돌려준다.
+    ``with_versions`` 면 실시간 알림과 비교할 모임 ``version`` 을 참석 수와
+    같은 쿼리(같은 스냅샷)에서 읽어 함께 돌려준다.
+    """
+    page = select(Group.id, Group.date)
+    if start_date is not None:
+        page = page.where(Group.date >= start_date)
+    if end_date is not None:
+        page = page.where(Group.date <= end_date)
+    if cursor:
+        cursor_date, cursor_id = _parse_cursor(cursor)
+        page = page.where(
+            or_(
+                Group.date > cursor_date,
+                and_(Group.date == cursor_date, Group.id > cursor_id),
+            )
+        )
+    page = page.order_by(asc(Group.date), asc(Group.id))
+    if limit is not None:
+        # 다음 페이지 존재 여부 확인을 위해 하나 더 가져온다
+        page = page.limit(limit + 1)
+    page = page.subquery()
+
+    bucket = _role_bucket()
+    stmt = (
+        select(page.c.id, page.c.date, Attendance.part, bucket, func.count(User.id))
+        .select_from(page)
+        .outerjoin(
+            Attendance,
+            and_(
+                Attendance.group_id == page.c.id,
+                Attendance.status == AttendanceStatus.attending,
+            ),
+        )
+        .outerjoin(User, User.id == Attendance.user_id)
+        .group_by(page.c.id, page.c.date, Attendance.part, bucket)
+        .order_by(asc(page.c.date), asc(page.c.id))
+    )
+    if with_versions:
+        version = func.coalesce(GroupVersion.version, 0)
+        stmt = (
+            stmt.add_columns(version)
+            .outerjoin(GroupVersion, GroupVersion.group_id == page.c.id)
+            .group_by(version)
+        )
+    rows = (await db.execute(stmt)).all()
+
+    summaries: dict[int, dict] = {}
+    for group_id, group_date, part, key, count, *group_version in rows:
+        summary = summaries.get(group_id)
+        if summary is None:
+            summary = summaries[group_id] = {
+                "id": group_id,
+                "date": group_date.isoformat(),
+                "part_counts": {
+                    PartEnum.FIRST.value: {"admin": 0, "member": 0},
+                    PartEnum.SECOND.value: {"admin": 0, "member": 0},
+                },
+            }
+            if with_versions:
+                summary["version"] = group_version[0]
+        if part is not None:
+            summary["part_counts"][part.value][key] += count
+
+    result = list(summaries.values())
+    next_cursor = None
+    if limit is not None and len(result) > limit:
+        result = result[:limit]
+        last = result[-1]
+        next_cursor = f"{last['date']}_{last['id']}"
+    return result, next_cursor
 
-        result.append({
-            "id": group.id,
-            "date": group.date.isoformat(),
-            "part_counts": counts,
-        })
 
-    return result
+@router.get("/list")
+async def list_groups(
+    request: Request,
+    start_date: date | None = Query(None),
+    end_date: date | None = Query(None),
+    limit: int | None = Query(None, ge=1, le=500),
+    cursor: str | None = Query(None),
+    db: AsyncSession = Depends(get_cacheable_db),
+):
+    async def compute():
+        groups, next_cursor = await fetch_group_summaries(
+            db, start_date=start_date, end_date=end_date, limit=limit, cursor=cursor
+        )
+        return groups, ({"X-Next-Cursor": next_cursor} if next_cursor else {})
 
+    key = f"list:{start_date}:{end_date}:{limit}:{cursor}"
+    return await response_cache.json_response(request, GROUP_LIST_NAMESPACE, key, compute)
 
-@router.get("/{group_id}/my_team")
-async def get_my_team(group_id: int, user_id: int, db: AsyncSession = Depends(get_db)):
+
+async def _fetch_my_team(db: AsyncSession, group_id: int, user_id: int) -> dict:
     result = await db.execute(
         select(TeamUser, Team)
         .join(Team, Team.id == TeamUser.team_id)
-        .where(Team.group_id == group_id)
+        .where(TeamUser.group_id == group_id)
         .where(TeamUser.user_id == user_id)
     )
     row = result.first()
@@ -96,40 +187,67 @@ async def get_my_team(group_id: int, user_id: int, db: AsyncSession = Depends(ge
     }
 
 
-@router.get("/{group_id}/teams")
-async def get_group_teams(group_id: int, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(
-        select(Team)
-        .options(
-            selectinload(Team.members).selectinload(TeamUser.user)
-        )
+@router.get("/{group_id}/my_team")
+async def get_my_team(
+    request: Request,
+    group_id: int,
+    user_id: int | None = None,
+    db: AsyncSession = Depends(get_cacheable_db),
+    current_user: TokenClaims = Depends(get_current_user),
+):
+    user_id = resolve_user_id(current_user, user_id)
+
+    async def compute():
+        return await _fetch_my_team(db, group_id, user_id), {}
+
+    return await response_cache.json_response(
+        request, group_namespace(group_id), f"my_team:{user_id}", compute, private=True
+    )
+
+
+async def _fetch_group_teams(db: AsyncSession, group_id: int) -> list[dict]:
+    """모임의 조 명단. 필요한 컬럼만 한 번의 조인으로 가져와 ORM 객체를 만들지 않는다."""
+    rows = await db.execute(
+        select(Team.id, Team.part, User.id, User.username, User.role, TeamUser.is_leader)
+        .select_from(Team)
+        .outerjoin(TeamUser, TeamUser.team_id == Team.id)
+        .outerjoin(User, User.id == TeamUser.user_id)
         .where(Team.group_id == group_id)
+        .order_by(Team.id, TeamUser.id)
     )
-    teams = result.scalars().all()
 
-    return [
-        {
-            "team_id": team.id,
-            "part": team.part,
-            "members": [
-                {
-                    "id": member.user.id,
-                    "username": member.user.username,
-                    "role": member.user.role,
-                    "is_leader": member.is_leader,
-                }
-                for member in team.members
-            ],
-        }
-        for team in teams
-    ]
-    
+    teams: dict[int, dict] = {}
+    for team_id, part, user_id, username, role, is_leader in rows:
+        team = teams.get(team_id)
+        if team is None:
+            team = teams[team_id] = {"team_id": team_id, "part": part, "members": []}
+        if user_id is not None:
+            team["members"].append(
+                {"id": user_id, "username": username, "role": role, "is_leader": is_leader}
+            )
+    return list(teams.values())
+
+
+@router.get("/{group_id}/teams")
+async def get_group_teams(
+    request: Request, group_id: int, db: AsyncSession = Depends(get_cacheable_db)
+):
+    async def compute():
+        return await _fetch_group_teams(db, group_id), {}
+
+    return await response_cache.json_response(request, group_namespace(group_id), "teams", compute)
+
+
 @router.post("/{group_id}/shuffle")
 async def shuffle_teams(
     group_id: int,
     part: str = Form(...),
     team_size: int = Form(...),
+    seed: int | None = Form(None),
+    avoid_repeats: bool = Form(False),
+    history_groups: int = Form(10),
     db: AsyncSession = Depends(get_db),
+    _admin: TokenClaims = Depends(require_admin),
 ):
     if team_size <= 0:
         raise HTTPException(status_code=400, detail="조당 인원 수가 올바르지 않습니다.")
@@ -148,104 +266,108 @@ async def shuffle_teams(
 
     # 1. 참석자만 가져오기 (선택한 부)
     result = await db.execute(
-        select(User)
+        select(User.id, User.gender, User.role)
         .join(Attendance, Attendance.user_id == User.id)
         .where(Attendance.group_id == group_id)
         .where(Attendance.part == part_enum)
         .where(Attendance.status == AttendanceStatus.attending)
     )
-    users = result.scalars().all()
+    attendees = result.all()
 
-    if not users:
+    if not attendees:
         raise HTTPException(status_code=400, detail="참석한 유저가 없습니다.")
 
-    # 2. 남녀 분리
-    males = [u for u in users if u.gender == GenderEnum.male]
-    females = [u for u in users if u.gender == GenderEnum.female]
-
-    # 3. 운영진 이상 = 조장 후보
-    leaders = [u for u in users if u.role in [RoleEnum.leader, RoleEnum.admin]]
-
-    # 4. 조 수 결정 (입력 값 기반)
-    total_count = len(users)
-    # 모든 조가 최소 team_size명을 갖도록 team 수 계산
-    team_count = max(1, total_count // team_size)
-
-    # 5. 기존 조 제거 (해당 부만)
-    team_ids_subq = select(Team.id).where(Team.group_id == group_id, Team.part == part_enum)
-    await db.execute(delete(TeamUser).where(TeamUser.team_id.in_(team_ids_subq)))
-    await db.execute(delete(Team).where(Team.group_id == group_id, Team.part == part_enum))
-
-    # 6. 팀 목록 준비
-    teams = [[] for _ in range(team_count)]
-
-    # 랜덤 섞기
-    random.shuffle(users)
-
-    # 팀당 최소 인원만큼 배정하고 남은 인원은 앞에서부터 한 명씩 추가
-    remaining_users = users.copy()
-    random.shuffle(leaders)
-
-    for i in range(team_count):
-        if leaders:
-            leader = leaders.pop(0)
-            teams[i].append(leader)
-            if leader in remaining_users:
-                remaining_users.remove(leader)
-
-    base_size = team_size
-    extra = total_count - team_count * team_size
-
-    for idx in range(team_count):
-        target = base_size + (1 if idx < extra else 0)
-        while len(teams[idx]) < target and remaining_users:
-            teams[idx].append(remaining_users.pop())
-
-    # 남은 인원 (이론상 없지만 안전하게 처리)
-    tidx = 0
-    while remaining_users:
-        teams[tidx % team_count].append(remaining_users.pop())
-        tidx += 1
-
-    # 팀 리더 기록 (첫 번째 멤버가 리더)
-    team_leaders = [team[0] for team in teams]
-
-    # 7. 저장
-    for i, members in enumerate(teams):
-        team = Team(group_id=group_id, part=part_enum)
-        db.add(team)
-        await db.flush()
-        for user in members:
-            db.add(
-                TeamUser(
-                    team_id=team.id,
-                    user_id=user.id,
-                    group_id=group_id,
-                    part=part_enum,
-                    is_leader=(user.id == team_leaders[i].id),
-                )
-            )
+    # 2. 참석자 사이의 싫어하는 사람 관계
+    attendee_ids = [a.id for a in attendees]
+    hate_pairs = (await db.execute(
+        select(HateList.user_id, HateList.hated_user_id)
+        .where(HateList.user_id.in_(attendee_ids))
+        .where(HateList.hated_user_id.in_(attendee_ids))
+    )).all()
+
+    # 3. 최근 모임에서 같은 조였던 횟수 (옵션)
+    pair_counts = None
+    if avoid_repeats:
+        pair_counts = await load_pair_counts(db, group_id, attendee_ids, history_groups)
+
+    # 4. 조 편성 (운영진 이상 = 조장 후보)
+    plan = build_teams(
+        [
+            Candidate(id=a.id, gender=a.gender, can_lead=a.role in [RoleEnum.leader, RoleEnum.admin])
+            for a in attendees
+        ],
+        team_size,
+        hate_pairs=hate_pairs,
+        pair_counts=pair_counts,
+        seed=seed,
+    )
 
-    await db.commit()
-    return {"message": "조 편성이 완료되었습니다.", "조 수": team_count, "총원": total_count}
+    async def write(session: AsyncSession):
+        # 5. 기존 조 제거 (해당 부만)
+        team_ids_subq = select(Team.id).where(Team.group_id == group_id, Team.part == part_enum)
+        await session.execute(delete(TeamUser).where(TeamUser.team_id.in_(team_ids_subq)))
+        await session.execute(delete(Team).where(Team.group_id == group_id, Team.part == part_enum))
+
+        # 6. 저장: 조와 조원을 각각 한 번의 다중 INSERT 로 저장
+        # 새 조 행은 모두 같은 값이므로 돌려받은 id 순서와 무관하게 조원을 배정해도 된다
+        team_ids = (await session.scalars(
+            insert(Team).returning(Team.id),
+            [{"group_id": group_id, "part": part_enum} for _ in plan.teams],
+        )).all()
+        await session.execute(
+            insert(TeamUser),
+            [
+                {
+                    "team_id": team_id,
+                    "user_id": user_id,
+                    "group_id": group_id,
+                    "part": part_enum,
+                    "is_leader": user_id == leader_id,
+                }
+                for team_id, members, leader_id in zip(team_ids, plan.teams, plan.leaders)
+                for user_id in members
+            ],
+        )
 
+        # 7. 같은 조 쌍 기록 갱신 (다음 편성의 반복 만남 계산용)
+        await record_team_pairs(session, group_id, part_enum, plan.teams)
+        # 8. 실시간 알림용 모임 버전
+        return (await bump_group_versions(session, [group_id]))[group_id]
+
+    # 조 편성 계산은 쓰기 밖에서 끝내고 저장만 쓰기 트랜잭션으로 보낸다
+    version = await run_write(db, write)
+    await response_cache.invalidate(group_namespace(group_id))
+    # 조 편성을 기다리는 구독자가 있을 때만 명단을 조회해 보낸다
+    if broker.has_subscribers(group_topic(group_id)):
+        publish_teams(group_id, version, await _fetch_group_teams(db, group_id))
+    return {
+        "message": "조 편성이 완료되었습니다.",
+        "조 수": len(plan.teams),
+        "총원": len(attendees),
+        "cost": plan.cost,
+    }
 
-@router.get("/{group_id}/attendee_count")
-async def group_attendee_count(group_id: int, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(
-        select(User)
-        .join(Attendance, Attendance.user_id == User.id)
-        .where(Attendance.group_id == group_id)
-        .where(Attendance.status == AttendanceStatus.attending)
+
+async def _count_attendees(db: AsyncSession, group_id: int) -> dict:
+    """역할별 참석 인원을 SQL 에서 집계한다."""
+    counts = dict(
+        (
+            await db.execute(
+                select(User.role, func.count())
+                .join(Attendance, Attendance.user_id == User.id)
+                .where(Attendance.group_id == group_id)
+                .where(Attendance.status == AttendanceStatus.attending)
+                .group_by(User.role)
+            )
+        ).all()
     )
-    attendees = result.scalars().all()
+    return {
+        "총참석": sum(counts.values()),
+        "운영진": counts.get(RoleEnum.admin, 0) + counts.get(RoleEnum.leader, 0),
+        "회원": counts.get(RoleEnum.member, 0),
+    }
 
-    admin_count = sum(1 for u in attendees if u.role in [RoleEnum.admin, RoleEnum.leader])
-    member_count = sum(1 for u in attendees if u.role == RoleEnum.member)
-    total = len(attendees)
 
-    return {
-        "총참석": total,
-        "운영진": admin_count,
-        "회원": member_count
-    }
\ No newline at end of file
+@router.get("/{group_id}/attendee_count")
+async def group_attendee_count(group_id: int, db: AsyncSession = Depends(get_db)):
+    return await _count_attendees(db, group_id)
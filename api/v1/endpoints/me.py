@@ -0,0 +1,82 @@
+from datetime import date
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.v1.deps import get_current_user
+from api.v1.endpoints.group import fetch_group_summaries
+from core.security import TokenClaims
+from db.session import get_db
+from models.attendance import Attendance
+from models.group import PartEnum, Team, TeamUser
+from models.user import User
+
+router = APIRouter()
+
+
+@router.get("/dashboard")
+async def get_dashboard(
+    start_date: date | None = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_db),
+    current_user: TokenClaims = Depends(get_current_user),
+):
+    """회원 메인 화면에 필요한 데이터를 한 번에 돌려준다.
+
+    다가오는 모임(기본: 오늘부터)과 부별 참석 인원, 내 부별 출석 상태,
+    내가 속한 조와 조원을 모임 수와 무관하게 세 번의 쿼리로 가져온다.
+    모임별 ``version`` 은 참석 인원과 같은 쿼리에서 읽으므로, 실시간 알림의
+    ``version`` 과 비교해 스냅샷에 이미 반영된 이벤트를 가려낼 수 있다.
+    """
+    user_id = current_user.user_id
+    groups, _ = await fetch_group_summaries(
+        db, start_date=start_date or date.today(), limit=limit, with_versions=True
+    )
+    group_ids = [g["id"] for g in groups]
+    if not group_ids:
+        return {"groups": []}
+
+    statuses = (
+        await db.execute(
+            select(Attendance.group_id, Attendance.part, Attendance.status).where(
+                Attendance.user_id == user_id, Attendance.group_id.in_(group_ids)
+            )
+        )
+    ).all()
+
+    # 내가 속한 조의 조원 전체 (나 포함)
+    my_team_ids = select(TeamUser.team_id).where(
+        TeamUser.user_id == user_id, TeamUser.group_id.in_(group_ids)
+    )
+    members = (
+        await db.execute(
+            select(
+                Team.id, Team.group_id, Team.part,
+                User.id.label("user_id"), User.username, User.role, TeamUser.is_leader,
+            )
+            .join(TeamUser, TeamUser.team_id == Team.id)
+            .join(User, User.id == TeamUser.user_id)
+            .where(Team.id.in_(my_team_ids))
+            .order_by(Team.id, TeamUser.id)
+        )
+    ).all()
+
+    by_id = {}
+    for group in groups:
+        group["my_status"] = {part.value: None for part in PartEnum}
+        group["my_team"] = {part.value: None for part in PartEnum}
+        by_id[group["id"]] = group
+    for group_id, part, status in statuses:
+        by_id[group_id]["my_status"][part.value] = status
+    for row in members:
+        slot = by_id[row.group_id]["my_team"]
+        team = slot[row.part.value]
+        if team is None:
+            team = slot[row.part.value] = {"team_id": row.id, "is_leader": False, "members": []}
+        team["members"].append(
+            {"id": row.user_id, "username": row.username, "role": row.role, "is_leader": row.is_leader}
+        )
+        if row.user_id == user_id:
+            team["is_leader"] = row.is_leader
+    return {"groups": groups}
@@ -1,10 +1,15 @@
-from sqlalchemy import func, select
-from fastapi import APIRouter, Depends, HTTPException, Form
+from sqlalchemy import and_, func, or_, select
+from fastapi import APIRouter, Depends, HTTPException, Form, Query
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
+from api.v1.deps import get_current_user, require_admin, resolve_user_id
+from core.cache import response_cache
+from core.responses import json_rows
+from core.security import TokenClaims, hash_password_async
 from db.session import get_db
+from db.write_queue import run_write
 from models.user import User, RoleEnum, GenderEnum
-from models.group import Group
-from models.attendance import Attendance, AttendanceStatus
+from models.attendance import UserAttendanceStats
 
 router = APIRouter()
 
@@ -16,7 +21,8 @@ async def create_user(
     role: RoleEnum = Form(...),
     gender: GenderEnum = Form(...),
     interests: str = Form(""),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    _admin: TokenClaims = Depends(require_admin),
 ):
     result = await db.execute(select(User).where(User.username == username))
     existing_user = result.scalars().first()
@@ -25,58 +31,137 @@ async def create_user(
 
     new_user = User(
         username=username,
-        password=password,
+        password=await hash_password_async(password),
         email=email,
         role=role,
         gender=gender,
         interests=interests
     )
-    db.add(new_user)
-    await db.commit()
+
+    async def write(session: AsyncSession):
+        session.add(new_user)
+
+    await run_write(db, write)
     return {"message": "유저가 성공적으로 추가되었습니다."}
 
-@router.get("/get_users")
-async def get_users(db: AsyncSession = Depends(get_db)):
-    result = await db.execute(
-        User.__table__.select()
-    )
-    return result.mappings().all()
+# 목록 조회에서 선택할 수 있는 컬럼 (password 는 어떤 경우에도 내보내지 않는다)
+USER_FIELDS = {
+    "id": User.id,
+    "username": User.username,
+    "email": User.email,
+    "role": User.role,
+    "gender": User.gender,
+    "interests": User.interests,
+    "attendance_count": User.attendance_count,
+    "last_attended": User.last_attended,
+    "created_at": User.created_at,
+}
+DETAIL_FIELDS = {
+    "id": User.id,
+    "username": User.username,
+    "gender": User.gender,
+    "email": User.email,
+    "role": User.role,
+    "interests": User.interests,
+    "created_at": User.created_at,
+    "attendance_count": func.coalesce(UserAttendanceStats.attended_dates, 0).label("attendance_count"),
+    "last_attended_date": UserAttendanceStats.last_attended.label("last_attended_date"),
+    "first_part_count": func.coalesce(UserAttendanceStats.first_part_count, 0).label("first_part_count"),
+    "second_part_count": func.coalesce(UserAttendanceStats.second_part_count, 0).label("second_part_count"),
+}
+STATS_FIELDS = {"attendance_count", "last_attended_date", "first_part_count", "second_part_count"}
 
 
+def _select_fields(available: dict, fields: str | None) -> list[str]:
+    """``fields=`` 쿼리(쉼표 구분)를 검증해 선택할 컬럼 이름을 돌려준다. id 는 항상 포함한다."""
+    if not fields:
+        return list(available)
+    names = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in names if name not in available]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"알 수 없는 필드입니다: {', '.join(unknown)}")
+    return ["id"] + [name for name in dict.fromkeys(names) if name != "id"]
 
 
-@router.get("/get_users_detail")
-async def get_users_detail(db: AsyncSession = Depends(get_db)):
-    attendance_subquery = (
-        select(
-            Attendance.user_id,
-            func.count(func.distinct(Group.date)).label("total_attendance"),
-            func.max(Group.date).label("last_attended_date"),
-        )
-        .join(Group, Group.id == Attendance.group_id)
-        .where(Attendance.status == AttendanceStatus.attending)
-        .group_by(Attendance.user_id)
-        .subquery()
-    )
+def _parse_user_cursor(cursor: str) -> int:
+    try:
+        return int(cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="커서 형식이 올바르지 않습니다.")
+
 
-    stmt = (
-        select(
-            User.id,
-            User.username,
-            User.gender,
-            User.email,
-            User.role,
-            User.interests,
-            User.created_at,
-            func.coalesce(attendance_subquery.c.total_attendance, 0).label("attendance_count"),
-            attendance_subquery.c.last_attended_date,
+def _filter_users(stmt, q: str | None, role: RoleEnum | None, gender: GenderEnum | None, cursor: str | None):
+    """검색 조건과 (created_at, id) 내림차순 keyset 커서를 적용한다.
+
+    커서는 이전 페이지 마지막 유저의 id 이다. 기준 created_at 은 PK 로 다시
+    조회해 비교하는데, SQLite 에 저장된 시각 문자열과 바인딩된 datetime 의
+    형식이 달라 값을 커서에 실어 보내면 같은 시각의 행이 어긋나기 때문이다.
+    """
+    if q:
+        # 검색어의 %, _ 는 와일드카드가 아니라 글자 그대로 찾는다
+        escaped = q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        pattern = f"%{escaped}%"
+        stmt = stmt.where(
+            or_(User.username.like(pattern, escape="\\"), User.email.like(pattern, escape="\\"))
         )
-        .outerjoin(attendance_subquery, User.id == attendance_subquery.c.user_id)
-        .order_by(User.created_at.desc())
-    )
+    if role is not None:
+        stmt = stmt.where(User.role == role)
+    if gender is not None:
+        stmt = stmt.where(User.gender == gender)
+    if cursor:
+        cursor_id = _parse_user_cursor(cursor)
+        anchor = select(User.created_at).where(User.id == cursor_id).scalar_subquery()
+        stmt = stmt.where(
+            or_(
+                User.created_at < anchor,
+                and_(User.created_at == anchor, User.id < cursor_id),
+            )
+        )
+    return stmt.order_by(User.created_at.desc(), User.id.desc())
+
 
-    result = await db.execute(stmt)
-    return result.mappings().all()
+async def _user_page(db: AsyncSession, stmt, limit: int) -> ORJSONResponse:
+    # 다음 페이지 존재 여부 확인을 위해 하나 더 가져온다
+    rows = (await db.execute(stmt.limit(limit + 1))).mappings().all()
+    if len(rows) > limit:
+        return json_rows(rows[:limit], {"X-Next-Cursor": str(rows[limit - 1]["id"])})
+    return json_rows(rows)
+
+
+@router.get("/get_users")
+async def get_users(
+    q: str | None = Query(None),
+    role: RoleEnum | None = Query(None),
+    gender: GenderEnum | None = Query(None),
+    fields: str | None = Query(None),
+    limit: int = Query(100, ge=1, le=500),
+    cursor: str | None = Query(None),
+    db: AsyncSession = Depends(get_db),
+    _admin: TokenClaims = Depends(require_admin),
+):
+    columns = [USER_FIELDS[name] for name in _select_fields(USER_FIELDS, fields)]
+    stmt = _filter_users(select(*columns), q, role, gender, cursor)
+    return await _user_page(db, stmt, limit)
+
+
+@router.get("/get_users_detail")
+async def get_users_detail(
+    q: str | None = Query(None),
+    role: RoleEnum | None = Query(None),
+    gender: GenderEnum | None = Query(None),
+    fields: str | None = Query(None),
+    limit: int = Query(100, ge=1, le=500),
+    cursor: str | None = Query(None),
+    db: AsyncSession = Depends(get_db),
+    _admin: TokenClaims = Depends(require_admin),
+):
+    names = _select_fields(DETAIL_FIELDS, fields)
+    stmt = select(*(DETAIL_FIELDS[name] for name in names))
+    if STATS_FIELDS.intersection(names):
+        # 출석 통계는 user_attendance_stats 에 증분 저장되므로 PK 조인만으로 조회
+        stmt = stmt.outerjoin(UserAttendanceStats, UserAttendanceStats.user_id == User.id)
+    stmt = _filter_users(stmt, q, role, gender, cursor)
+    return await _user_page(db, stmt, limit)
 
 
 @router.post("/update_user")
@@ -87,17 +172,25 @@ async def update_user(
     interests: str = Form(""),
     role: RoleEnum = Form(None),
     db: AsyncSession = Depends(get_db),
+    current_user: TokenClaims = Depends(get_current_user),
 ):
-    user = await db.get(User, user_id)
-    if not user:
-        raise HTTPException(status_code=404, detail="유저를 찾을 수 없습니다.")
-    
-    user.email = email
-    user.gender = gender
-    user.interests = interests
+    user_id = resolve_user_id(current_user, user_id)
 
-    if role is not None:
-        user.role = role  # 모임장만 허용하도록 추후 인증체크 가능
+    async def write(session: AsyncSession):
+        user = await session.get(User, user_id)
+        if not user:
+            raise HTTPException(status_code=404, detail="유저를 찾을 수 없습니다.")
+        if role is not None and role != user.role and current_user.role != RoleEnum.leader.value:
+            raise HTTPException(status_code=403, detail="역할은 모임장만 변경할 수 있습니다.")
+
+        user.email = email
+        user.gender = gender
+        user.interests = interests
+
+        if role is not None:
+            user.role = role
 
-    await db.commit()
+    await run_write(db, write)
+    # 역할이 바뀌면 모임 목록의 운영진/회원 집계와 조 명단이 달라진다
+    await response_cache.invalidate_all()
     return {"message": "유저가 성공적으로 수정되었습니다."}
\ No newline at end of file
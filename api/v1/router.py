@@ -1,8 +1,12 @@
 from fastapi import APIRouter
-from .endpoints import user, auth, group, attendance
+from fastapi.responses import ORJSONResponse
+from .endpoints import user, auth, group, attendance, events, me
 
-api_router = APIRouter()
+# API 응답은 기본으로 orjson 으로 직렬화한다
+api_router = APIRouter(default_response_class=ORJSONResponse)
 api_router.include_router(user.router, prefix="/users", tags=["users"])
 api_router.include_router(auth.router, prefix="/auth", tags=["auth"])  # ← auth 등록
 api_router.include_router(group.router, prefix="/groups", tags=["groups"])
 api_router.include_router(attendance.router, prefix="/attendance", tags=["attendance"])
+api_router.include_router(me.router, prefix="/me", tags=["me"])
+api_router.include_router(events.router, prefix="/events", tags=["events"])
@@ -0,0 +1,239 @@
+"""Load-test harness for the API hot paths.
+
+Seeds a synthetic club, drives the API in-process through an ASGI client
+with a configurable number of concurrent workers and reports latency
+percentiles together with the number of SQL statements per request.
+"""
+import asyncio
+import json
+import random
+import statistics
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import date
+from itertools import chain
+from typing import Awaitable, Callable
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import select
+
+from core.cache import response_cache
+from core.metrics import db_metrics
+from core.security import create_token, hash_password
+from db.bulk_import import (
+    generate_attendance,
+    generate_groups,
+    generate_users,
+    import_attendance,
+    import_groups,
+    import_users,
+)
+from models.user import GenderEnum, RoleEnum, User
+
+QUERY_SLACK = 0.1
+
+
+@dataclass(frozen=True)
+class ClubSize:
+    users: int = 2000
+    groups: int = 200
+    admins: int = 40
+    attendance_rate: float = 0.3
+
+
+@dataclass
+class Club:
+    user_ids: list[int]
+    group_ids: list[int]
+    leader_id: int
+
+
+@dataclass
+class ScenarioResult:
+    name: str
+    requests: int
+    concurrency: int
+    errors: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    throughput_rps: float
+    queries_per_request: float
+    statuses: dict[str, int] = field(default_factory=dict)
+
+
+async def seed_club(session_factory, size: ClubSize, seed: int = 0) -> Club:
+    """Insert a synthetic club of ``size`` with the bulk importer.
+
+    The first user is the leader who issues the benchmark requests.  All
+    users share the password ``benchpass``.
+    """
+    random.seed(seed)
+    leader = {
+        "username": "벤치모임장",
+        "password": hash_password("benchpass"),
+        "email": "bench-leader@example.com",
+        "role": RoleEnum.leader,
+        "gender": GenderEnum.male,
+        "interests": "",
+    }
+    members = generate_users(size.users - 1, admins=size.admins, start=1, password_hash=leader["password"])
+    await import_users(chain([leader], members), session_factory)
+    group_ids = await import_groups(generate_groups(size.groups, date(2024, 1, 6)), session_factory)
+
+    async with session_factory() as db:
+        user_ids = list((await db.scalars(select(User.id).order_by(User.id))).all())
+    await import_attendance(generate_attendance(group_ids, user_ids, size.attendance_rate), session_factory)
+    return Club(user_ids=user_ids, group_ids=group_ids, leader_id=user_ids[0])
+
+
+Request = Callable[[AsyncClient, random.Random], Awaitable]
+
+
+def scenarios(club: Club) -> dict[str, Request]:
+    """The hot paths to measure, keyed by scenario name."""
+
+    async def groups_list(client, rng):
+        return await client.get("/api/v1/groups/list")
+
+    async def attendance_set(client, rng):
+        return await client.post("/api/v1/attendance/set", data={
+            "group_id": rng.choice(club.group_ids),
+            "user_id": rng.choice(club.user_ids),
+            "part": rng.choice(["FIRST", "SECOND"]),
+            "status": rng.choice(["참석", "불참"]),
+        })
+
+    async def shuffle(client, rng):
+        return await client.post(
+            f"/api/v1/groups/{rng.choice(club.group_ids)}/shuffle",
+            data={"part": rng.choice(["FIRST", "SECOND"]), "team_size": 6, "seed": rng.randrange(1000)},
+        )
+
+    async def users_detail(client, rng):
+        return await client.get("/api/v1/users/get_users_detail")
+
+    return {
+        "groups_list": groups_list,
+        "attendance_set": attendance_set,
+        "shuffle": shuffle,
+        "users_detail": users_detail,
+    }
+
+
+def _percentile(sorted_values: list[float], q: float) -> float:
+    if len(sorted_values) == 1:
+        return sorted_values[0]
+    return statistics.quantiles(sorted_values, n=100, method="inclusive")[int(q) - 1]
+
+
+async def run_scenario(
+    app,
+    name: str,
+    request: Request,
+    token: str,
+    requests: int,
+    concurrency: int,
+    seed: int = 0,
+) -> ScenarioResult:
+    """Fire ``requests`` calls from ``concurrency`` workers and summarise them.
+
+    The response cache is invalidated before every call so the database
+    path is measured; statements per request come from the SQL
+    instrumentation used by ``/metrics``.
+    """
+    db_metrics.reset()
+    rng = random.Random(seed)
+    latencies: list[float] = []
+    statuses: dict[str, int] = {}
+    remaining = iter(range(requests))
+
+    async def worker(client: AsyncClient):
+        for _ in remaining:
+            await response_cache.invalidate_all()
+            start = time.perf_counter()
+            response = await request(client, rng)
+            latencies.append(time.perf_counter() - start)
+            statuses[str(response.status_code)] = statuses.get(str(response.status_code), 0) + 1
+
+    # 앱 예외(예: database is locked)는 500 응답으로 집계한다
+    transport = ASGITransport(app=app, raise_app_exceptions=False)
+    headers = {"Authorization": f"Bearer {token}"}
+    async with AsyncClient(transport=transport, base_url="http://bench", headers=headers) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    query_counts = [h for h in db_metrics.queries_per_request.values()]
+    total_queries = sum(h.sum for h in query_counts)
+    total_requests = sum(h.count for h in query_counts)
+    return ScenarioResult(
+        name=name,
+        requests=requests,
+        concurrency=concurrency,
+        errors=sum(count for status, count in statuses.items() if not status.startswith("2")),
+        p50_ms=round(_percentile(latencies, 50) * 1000, 3),
+        p95_ms=round(_percentile(latencies, 95) * 1000, 3),
+        p99_ms=round(_percentile(latencies, 99) * 1000, 3),
+        throughput_rps=round(requests / elapsed, 1),
+        queries_per_request=round(total_queries / total_requests, 2) if total_requests else 0.0,
+        statuses=statuses,
+    )
+
+
+async def run_all(
+    app, club: Club, requests: int, concurrency: int, only: list[str] | None = None
+) -> list[ScenarioResult]:
+    token = create_token(club.leader_id, "bench", RoleEnum.leader.value)
+    results = []
+    for name, request in scenarios(club).items():
+        if only and name not in only:
+            continue
+        results.append(await run_scenario(app, name, request, token, requests, concurrency))
+    return results
+
+
+def compare_to_baseline(
+    results: list[ScenarioResult], baseline: dict, tolerance: float
+) -> list[str]:
+    """Describe every regression against ``baseline``.
+
+    Latency (p95) may grow by ``tolerance`` (0.25 = 25 %) before it counts
+    as a regression.  Statements per request may vary by ``QUERY_SLACK``
+    because concurrent writes hit different code paths (first attendance
+    of a user, new stats rows); errors must not grow.  Scenarios whose
+    baseline was recorded with a different request count or concurrency
+    are not compared.
+    """
+    regressions = []
+    for result in results:
+        base = baseline.get(result.name)
+        if base is None or (base["requests"], base["concurrency"]) != (result.requests, result.concurrency):
+            continue
+        if result.p95_ms > base["p95_ms"] * (1 + tolerance):
+            regressions.append(
+                f"{result.name}: p95 {result.p95_ms}ms > baseline {base['p95_ms']}ms (+{tolerance:.0%})"
+            )
+        if result.queries_per_request > base["queries_per_request"] * (1 + QUERY_SLACK):
+            regressions.append(
+                f"{result.name}: {result.queries_per_request} queries/request > baseline {base['queries_per_request']}"
+            )
+        if result.errors > base.get("errors", 0):
+            regressions.append(f"{result.name}: {result.errors} errors > baseline {base.get('errors', 0)}")
+    return regressions
+
+
+def format_report(results: list[ScenarioResult]) -> str:
+    header = f"{'scenario':<16}{'reqs':>6}{'conc':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'rps':>9}{'q/req':>7}{'errors':>8}"
+    lines = [header, "-" * len(header)]
+    for r in results:
+        lines.append(
+            f"{r.name:<16}{r.requests:>6}{r.concurrency:>6}{r.p50_ms:>10.2f}{r.p95_ms:>10.2f}"
+            f"{r.p99_ms:>10.2f}{r.throughput_rps:>9.1f}{r.queries_per_request:>7.1f}{r.errors:>8}"
+        )
+    return "\n".join(lines)
+
+
+def results_to_json(results: list[ScenarioResult]) -> str:
+    return json.dumps({r.name: asdict(r) for r in results}, indent=2, ensure_ascii=False)
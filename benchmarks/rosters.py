@@ -0,0 +1,175 @@
+# benchmarks/rosters.py
+"""Compare the ORM and column-projected read paths for team rosters.
+
+    python -m benchmarks.rosters --attendees 300
+
+Seeds one group with ``--attendees`` attending users split into teams and
+times ``/groups/{id}/teams`` and ``/groups/{id}/attendee_count`` query
+code.  "before" is the previous implementation (``selectinload`` of
+``Team.members`` and ``TeamUser.user``, and counting loaded ``User`` rows
+in Python), "after" is the projected query and ``COUNT ... GROUP BY`` used
+by the API.  Uses its own SQLite file (``bench.db``) unless
+``DATABASE_URL`` is set.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+from datetime import date
+
+from sqlalchemy import insert, select
+from sqlalchemy.orm import selectinload
+
+BENCH_DB = "bench.db"
+
+
+async def _teams_orm(db, group_id: int) -> list[dict]:
+    from models.group import Team, TeamUser
+
+    result = await db.execute(
+        select(Team)
+        .options(selectinload(Team.members).selectinload(TeamUser.user))
+        .where(Team.group_id == group_id)
+        .order_by(Team.id)
+    )
+    return [
+        {
+            "team_id": team.id,
+            "part": team.part,
+            "members": [
+                {
+                    "id": member.user.id,
+                    "username": member.user.username,
+                    "role": member.user.role,
+                    "is_leader": member.is_leader,
+                }
+                for member in sorted(team.members, key=lambda m: m.id)
+            ],
+        }
+        for team in result.scalars().all()
+    ]
+
+
+async def _count_orm(db, group_id: int) -> dict:
+    from models.attendance import Attendance, AttendanceStatus
+    from models.user import RoleEnum, User
+
+    attendees = (
+        await db.execute(
+            select(User)
+            .join(Attendance, Attendance.user_id == User.id)
+            .where(Attendance.group_id == group_id)
+            .where(Attendance.status == AttendanceStatus.attending)
+        )
+    ).scalars().all()
+    return {
+        "총참석": len(attendees),
+        "운영진": sum(1 for u in attendees if u.role in [RoleEnum.admin, RoleEnum.leader]),
+        "회원": sum(1 for u in attendees if u.role == RoleEnum.member),
+    }
+
+
+async def seed_group(session_factory, attendees: int, team_size: int = 6) -> int:
+    """One group whose ``attendees`` users all attend part 1, split into teams."""
+    from db.bulk_import import generate_users, import_users
+    from models.attendance import Attendance, AttendanceStatus
+    from models.group import Group, PartEnum, Team, TeamUser
+    from models.user import User
+
+    async with session_factory() as db:
+        existing_names = set((await db.scalars(select(User.username))).all())
+    await import_users(
+        generate_users(
+            attendees, admins=attendees // 10, start=len(existing_names), existing_names=existing_names
+        ),
+        session_factory,
+    )
+
+    async with session_factory() as db:
+        user_ids = (await db.scalars(select(User.id).order_by(User.id.desc()).limit(attendees))).all()
+        group_id = (await db.scalars(insert(Group).returning(Group.id), [{"date": date(2025, 1, 4)}])).one()
+        await db.execute(
+            insert(Attendance),
+            [
+                {"group_id": group_id, "user_id": uid, "part": PartEnum.FIRST, "status": AttendanceStatus.attending}
+                for uid in user_ids
+            ],
+        )
+        teams = [user_ids[i:i + team_size] for i in range(0, len(user_ids), team_size)]
+        team_ids = (await db.scalars(
+            insert(Team).returning(Team.id), [{"group_id": group_id, "part": PartEnum.FIRST} for _ in teams]
+        )).all()
+        await db.execute(
+            insert(TeamUser),
+            [
+                {"team_id": team_id, "user_id": uid, "group_id": group_id, "part": PartEnum.FIRST,
+                 "is_leader": i == 0}
+                for team_id, members in zip(team_ids, teams)
+                for i, uid in enumerate(members)
+            ],
+        )
+        await db.commit()
+    return group_id
+
+
+async def _time(session_factory, fn, group_id: int, repeat: int) -> tuple[float, object]:
+    timings, result = [], None
+    for _ in range(repeat):
+        async with session_factory() as db:
+            start = time.perf_counter()
+            result = await fn(db, group_id)
+            timings.append(time.perf_counter() - start)
+    return statistics.median(timings), result
+
+
+async def compare(session_factory, attendees: int, repeat: int = 20) -> dict:
+    from api.v1.endpoints.group import _count_attendees, _fetch_group_teams
+
+    group_id = await seed_group(session_factory, attendees)
+    teams_before, teams_old = await _time(session_factory, _teams_orm, group_id, repeat)
+    teams_after, teams_new = await _time(session_factory, _fetch_group_teams, group_id, repeat)
+    count_before, count_old = await _time(session_factory, _count_orm, group_id, repeat)
+    count_after, count_new = await _time(session_factory, _count_attendees, group_id, repeat)
+    return {
+        "attendees": attendees,
+        "teams_before_ms": round(teams_before * 1000, 2),
+        "teams_after_ms": round(teams_after * 1000, 2),
+        "count_before_ms": round(count_before * 1000, 2),
+        "count_after_ms": round(count_after * 1000, 2),
+        "identical": teams_old == teams_new and count_old == count_new,
+    }
+
+
+async def main(args) -> None:
+    # 앱 모듈이 설정을 읽기 전에 벤치마크용 DB 를 지정한다
+    own_db = "DATABASE_URL" not in os.environ
+    if own_db:
+        os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///./{BENCH_DB}"
+        if os.path.exists(BENCH_DB):
+            os.remove(BENCH_DB)
+
+    from db.init_db import init_db
+    from db.session import AsyncSessionLocal, dispose_engines
+
+    await init_db()
+    results = [await compare(AsyncSessionLocal, n, args.repeat) for n in args.attendees]
+    await dispose_engines()
+    if own_db:
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(BENCH_DB + suffix):
+                os.remove(BENCH_DB + suffix)
+
+    print(f"{'attendees':>9}  {'teams before':>12}  {'teams after':>11}  {'count before':>12}  {'count after':>11}  identical")
+    for r in results:
+        print(
+            f"{r['attendees']:>9}  {r['teams_before_ms']:>9.2f} ms  {r['teams_after_ms']:>8.2f} ms"
+            f"  {r['count_before_ms']:>9.2f} ms  {r['count_after_ms']:>8.2f} ms  {r['identical']}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark team roster and attendee count queries")
+    parser.add_argument("--attendees", type=int, nargs="+", default=[100, 300, 600])
+    parser.add_argument("--repeat", type=int, default=20)
+    asyncio.run(main(parser.parse_args()))
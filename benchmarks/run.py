@@ -0,0 +1,109 @@
+# benchmarks/run.py
+"""Run the API benchmark suite.
+
+    python -m benchmarks.run --users 2000 --groups 200 --requests 100 --concurrency 10
+    python -m benchmarks.run --update-baseline
+
+Uses its own SQLite file (``bench.db``) unless ``DATABASE_URL`` is set and
+exits with status 1 when a scenario regresses against the stored baseline.
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+BENCH_DB = "bench.db"
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the API hot paths")
+    parser.add_argument("--users", type=int, default=2000, help="Number of synthetic users")
+    parser.add_argument("--groups", type=int, default=200, help="Number of synthetic groups")
+    parser.add_argument("--admins", type=int, default=40, help="Number of admins among the users")
+    parser.add_argument("--requests", type=int, default=100, help="Requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=10, help="Concurrent clients")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for data and requests")
+    parser.add_argument(
+        "--scenario", action="append", dest="scenarios", help="Only run this scenario (repeatable)"
+    )
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH, help="Baseline JSON file")
+    parser.add_argument(
+        "--update-baseline", action="store_true", help="Store these results as the new baseline"
+    )
+    parser.add_argument(
+        "--tolerance", type=float, default=0.25, help="Allowed p95 growth before flagging (0.25 = 25%%)"
+    )
+    parser.add_argument("--output", type=Path, help="Also write the results as JSON here")
+    return parser.parse_args(argv)
+
+
+def _current_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def main(args) -> int:
+    # 앱 모듈이 설정을 읽기 전에 벤치마크용 DB 를 지정한다
+    own_db = "DATABASE_URL" not in os.environ
+    if own_db:
+        os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///./{BENCH_DB}"
+        if os.path.exists(BENCH_DB):
+            os.remove(BENCH_DB)
+
+    from benchmarks.harness import (
+        ClubSize,
+        compare_to_baseline,
+        format_report,
+        results_to_json,
+        run_all,
+        seed_club,
+    )
+    from db.init_db import init_db
+    from db.session import AsyncSessionLocal, dispose_engines
+    from main import app
+
+    await init_db()
+    size = ClubSize(users=args.users, groups=args.groups, admins=args.admins)
+    club = await seed_club(AsyncSessionLocal, size, seed=args.seed)
+    print(f"seeded {len(club.user_ids)} users, {len(club.group_ids)} groups")
+
+    results = await run_all(app, club, args.requests, args.concurrency, only=args.scenarios)
+    await dispose_engines()
+    if own_db:
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(BENCH_DB + suffix):
+                os.remove(BENCH_DB + suffix)
+
+    print(format_report(results))
+    report = results_to_json(results)
+    if args.output:
+        args.output.write_text(report, encoding="utf-8")
+
+    if args.update_baseline:
+        # 어느 코드에서 잰 값인지 남긴다 (비교에는 쓰지 않는다)
+        baseline = {"recorded_at": _current_commit(), **json.loads(report)}
+        args.baseline.write_text(json.dumps(baseline, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+        print(f"baseline written to {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print("no baseline stored; run with --update-baseline to create one")
+        return 0
+    regressions = compare_to_baseline(
+        results, json.loads(args.baseline.read_text(encoding="utf-8")), args.tolerance
+    )
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(parse_args())))
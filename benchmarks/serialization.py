@@ -0,0 +1,83 @@
+# benchmarks/serialization.py
+"""Compare JSON serialisation paths for a large user list.
+
+    python -m benchmarks.serialization --users 3000
+
+"before" is FastAPI's default path for a returned list of rows
+(``jsonable_encoder`` + ``JSONResponse``), "after" is ``json_rows`` (plain
+dicts straight into ``ORJSONResponse``).  Also reports gzip sizes.
+"""
+import argparse
+import gzip
+import random
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from core.responses import json_rows
+from db.seed_users import generate_unique_name, random_gender, random_interest
+from models.user import RoleEnum
+
+
+def sample_rows(count: int, seed: int = 0) -> list[dict]:
+    """Rows shaped like ``/users/get_users_detail``."""
+    random.seed(seed)
+    names: set[str] = set()
+    created = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    rows = []
+    for i in range(count):
+        gender = random_gender()
+        rows.append({
+            "id": i + 1,
+            "username": generate_unique_name(gender, names),
+            "gender": gender,
+            "email": f"user{i}@example.com",
+            "role": RoleEnum.member,
+            "interests": random_interest(),
+            "created_at": created + timedelta(minutes=i),
+            "attendance_count": random.randint(0, 50),
+            "last_attended_date": (created + timedelta(days=random.randint(0, 300))).date(),
+            "first_part_count": random.randint(0, 30),
+            "second_part_count": random.randint(0, 30),
+        })
+    return rows
+
+
+def _time(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def compare(count: int, repeat: int = 20) -> dict:
+    rows = sample_rows(count)
+    before = lambda: JSONResponse(jsonable_encoder(rows)).body
+    after = lambda: json_rows(rows).body
+    before_body, after_body = before(), after()
+    return {
+        "users": count,
+        "before_ms": round(_time(before, repeat) * 1000, 2),
+        "after_ms": round(_time(after, repeat) * 1000, 2),
+        "bytes": len(after_body),
+        "gzip_bytes": len(gzip.compress(after_body, compresslevel=6)),
+        "identical": before_body == after_body,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark JSON serialisation of user lists")
+    parser.add_argument("--users", type=int, default=3000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    result = compare(args.users, args.repeat)
+    print(f"users: {result['users']}")
+    print(f"jsonable_encoder + json : {result['before_ms']:8.2f} ms")
+    print(f"orjson (json_rows)      : {result['after_ms']:8.2f} ms  ({result['before_ms'] / result['after_ms']:.1f}x)")
+    print(f"body: {result['bytes']} bytes, gzip: {result['gzip_bytes']} bytes, identical output: {result['identical']}")
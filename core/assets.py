@@ -0,0 +1,214 @@
+import gzip
+import hashlib
+import mimetypes
+import posixpath
+import re
+from dataclasses import dataclass
+from pathlib import Path
+
+from starlette.requests import Request
+from starlette.responses import FileResponse, Response
+
+try:  # optional dependency
+    import brotli
+except ImportError:  # pragma: no cover - depends on the environment
+    brotli = None
+
+# Files whose references to other assets are rewritten to hashed URLs.
+REWRITE_SUFFIXES = (".html", ".css", ".js")
+# Files worth compressing; images are already compressed.
+COMPRESS_SUFFIXES = (".html", ".css", ".js", ".svg", ".json", ".txt")
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+
+@dataclass
+class Asset:
+    """One static file, resolved and hashed at startup.
+
+    Text assets keep their (rewritten) body and precompressed variants in
+    memory; binary assets are streamed from ``path``.
+    """
+
+    path: Path
+    url: str
+    hashed_url: str
+    content_type: str
+    etag: str
+    body: bytes | None = None
+    gzip: bytes | None = None
+    br: bytes | None = None
+
+
+def _hashed_name(rel: str, digest: str) -> str:
+    stem, dot, suffix = rel.rpartition(".")
+    return f"{stem}.{digest}.{suffix}" if dot else f"{rel}.{digest}"
+
+
+def _route_path(scope) -> str:
+    """Path below the mount point: ``scope["path"]`` without ``root_path``."""
+    path, root_path = scope["path"], scope.get("root_path", "")
+    if root_path and path.startswith(root_path) and path[len(root_path):len(root_path) + 1] in ("", "/"):
+        return path[len(root_path):]
+    return path
+
+
+def _compress(body: bytes) -> tuple[bytes | None, bytes | None]:
+    gz = gzip.compress(body, compresslevel=9, mtime=0)
+    br = brotli.compress(body, quality=11) if brotli is not None else None
+    return (gz if len(gz) < len(body) else None), (br if br is not None and len(br) < len(body) else None)
+
+
+class AssetManifest:
+    """Fingerprinted, precompressed static assets.
+
+    Every file under ``directory`` is read once.  References between
+    assets (``/static/style.css`` in HTML/CSS/JS and relative imports such
+    as ``./auth.js`` in JS) are rewritten to content-hashed URLs like
+    ``/static/style.3f2a1b9c.css``, dependencies first, so an asset's hash
+    also changes when anything it references changes.  Hashed URLs are
+    served with a one-year ``immutable`` cache lifetime, original URLs and
+    HTML shells with an ``ETag`` and ``no-cache``.  Text assets are served
+    gzip (and brotli, when the ``brotli`` package is installed) compressed
+    according to ``Accept-Encoding``.
+
+    Parameters
+    ----------
+    directory: Path
+        The static directory.
+    prefix: str
+        URL prefix the directory is mounted at.
+    """
+
+    def __init__(self, directory: Path, prefix: str = "/static"):
+        self.directory = Path(directory).resolve()
+        self.prefix = prefix.rstrip("/")
+        self._sources = {
+            path.relative_to(self.directory).as_posix(): path
+            for path in sorted(self.directory.rglob("*"))
+            if path.is_file()
+        }
+        self.assets: dict[str, Asset] = {}
+        self._building: set[str] = set()
+        for rel in self._sources:
+            self._build(rel)
+        self._by_url: dict[str, tuple[Asset, bool]] = {}
+        for asset in self.assets.values():
+            self._by_url[asset.url] = (asset, False)
+            self._by_url[asset.hashed_url] = (asset, True)
+
+    def _reference_pattern(self) -> re.Pattern:
+        names = "|".join(re.escape(rel) for rel in sorted(self._sources, key=len, reverse=True))
+        return re.compile(
+            rf"(?P<abs>{re.escape(self.prefix)}/(?P<abs_rel>{names}))(?=[\"'`)\s?#])"
+            rf"|(?<=[\"'])(?P<relative>\.{{1,2}}/[\w./-]+)(?=[\"'])"
+        )
+
+    def _rewrite(self, rel: str, text: str) -> str:
+        base = posixpath.dirname(rel)
+
+        def replace(match: re.Match) -> str:
+            if match.group("abs"):
+                target = self._build(match.group("abs_rel"))
+                return target.hashed_url if target else match.group(0)
+            relative = match.group("relative")
+            target_rel = posixpath.normpath(posixpath.join(base, relative))
+            if target_rel not in self._sources:
+                return relative
+            target = self._build(target_rel)
+            if target is None:
+                return relative
+            hashed_name = posixpath.basename(target.hashed_url)
+            return posixpath.join(posixpath.dirname(relative), hashed_name)
+
+        return self._reference_pattern().sub(replace, text)
+
+    def _build(self, rel: str) -> Asset | None:
+        if rel in self.assets:
+            return self.assets[rel]
+        if rel in self._building:
+            # 순환 참조는 해시 없는 URL 로 남긴다
+            return None
+        self._building.add(rel)
+
+        path = self._sources[rel]
+        suffix = path.suffix.lower()
+        content_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+        if content_type.startswith("text/") or suffix in (".js", ".json", ".svg"):
+            content_type += "; charset=utf-8"
+
+        raw = path.read_bytes()
+        body = None
+        if suffix in REWRITE_SUFFIXES:
+            raw = self._rewrite(rel, raw.decode("utf-8")).encode("utf-8")
+        if suffix in COMPRESS_SUFFIXES:
+            body = raw
+
+        digest = hashlib.sha256(raw).hexdigest()
+        asset = Asset(
+            path=path,
+            url=f"{self.prefix}/{rel}",
+            hashed_url=f"{self.prefix}/{_hashed_name(rel, digest[:10])}",
+            content_type=content_type,
+            etag=f'"{digest[:20]}"',
+            body=body,
+        )
+        if body is not None:
+            asset.gzip, asset.br = _compress(body)
+
+        self._building.discard(rel)
+        self.assets[rel] = asset
+        return asset
+
+    def url(self, rel: str) -> str:
+        """Hashed URL of ``rel`` (e.g. ``"index.js"``) for use in templates."""
+        return self.assets[rel].hashed_url
+
+    def response(self, asset: Asset, request_headers, immutable: bool) -> Response:
+        """Build the response for ``asset`` honouring conditional and encoding headers."""
+        headers = {"Cache-Control": IMMUTABLE if immutable else REVALIDATE, "ETag": asset.etag}
+        if asset.gzip or asset.br:
+            headers["Vary"] = "Accept-Encoding"
+
+        # 압축본은 ETag 에 인코딩을 붙여 구분하고, 비교할 때는 떼어낸다
+        if_none_match = request_headers.get("if-none-match", "")
+        candidates = {
+            re.sub(r'-(gzip|br)"$', '"', tag.strip().removeprefix("W/"))
+            for tag in if_none_match.split(",")
+        }
+        if if_none_match and (asset.etag in candidates or "*" in candidates):
+            return Response(status_code=304, headers=headers)
+
+        if asset.body is None:
+            return FileResponse(asset.path, media_type=asset.content_type, headers=headers)
+
+        accepted = {
+            token.split(";")[0].strip().lower()
+            for token in request_headers.get("accept-encoding", "").split(",")
+            if not token.strip().endswith("q=0")
+        }
+        body = asset.body
+        encoding = None
+        if asset.br is not None and "br" in accepted:
+            body, encoding = asset.br, "br"
+        elif asset.gzip is not None and "gzip" in accepted:
+            body, encoding = asset.gzip, "gzip"
+        if encoding:
+            headers["Content-Encoding"] = encoding
+            headers["ETag"] = f'{asset.etag[:-1]}-{encoding}"'
+        return Response(body, media_type=asset.content_type, headers=headers)
+
+    def page(self, request, rel: str) -> Response:
+        """Serve an HTML shell such as ``index.html`` (ETag, always revalidated)."""
+        return self.response(self.assets[rel], request.headers, immutable=False)
+
+    async def __call__(self, scope, receive, send):
+        """ASGI app serving the assets under the mount prefix."""
+        request = Request(scope, receive)
+        path = _route_path(scope)
+        entry = self._by_url.get(self.prefix + path) if request.method in ("GET", "HEAD") else None
+        if entry is None:
+            response = Response("Not Found", status_code=404, media_type="text/plain")
+        else:
+            response = self.response(entry[0], request.headers, immutable=entry[1])
+        await response(scope, receive, send)
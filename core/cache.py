@@ -0,0 +1,217 @@
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Protocol
+
+from fastapi import Request, Response
+
+from core.config import Settings, get_settings
+from core.middleware import route_template
+from core.responses import render_json
+from core.singleflight import SingleFlight
+
+
+class CacheBackend(Protocol):
+    """Storage used by :class:`ResponseCache`.
+
+    Implementations must be safe to share between requests.  A shared
+    backend (e.g. Redis) is needed when several worker processes serve the
+    app, otherwise invalidations only reach the worker that handled the
+    write.
+    """
+
+    async def get(self, key: str) -> bytes | None: ...
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None: ...
+
+    async def get_counter(self, key: str) -> int: ...
+
+    async def incr(self, key: str) -> int: ...
+
+
+class MemoryCacheBackend:
+    """In-process LRU cache with per-entry expiry.
+
+    Parameters
+    ----------
+    max_entries: int
+        Least recently used entries are evicted beyond this size.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._counters: dict[str, int] = {}
+
+    async def get(self, key: str) -> bytes | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def get_counter(self, key: str) -> int:
+        return self._counters.get(key, 0)
+
+    async def incr(self, key: str) -> int:
+        self._counters[key] = self._counters.get(key, 0) + 1
+        return self._counters[key]
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._counters.clear()
+
+
+class RedisCacheBackend:
+    """Cache shared between workers, stored in Redis.
+
+    Requires the optional ``redis`` package (``pip install redis``).
+    """
+
+    def __init__(self, url: str, prefix: str = "gather:"):
+        try:
+            from redis import asyncio as redis_asyncio
+        except ImportError as exc:  # pragma: no cover - optional dependency
+            raise RuntimeError("CACHE_BACKEND=redis://... requires the 'redis' package") from exc
+        self._redis = redis_asyncio.from_url(url)
+        self.prefix = prefix
+
+    async def get(self, key: str) -> bytes | None:
+        return await self._redis.get(self.prefix + key)
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        await self._redis.set(self.prefix + key, value, px=max(1, int(ttl * 1000)))
+
+    async def get_counter(self, key: str) -> int:
+        value = await self._redis.get(self.prefix + key)
+        return int(value) if value is not None else 0
+
+    async def incr(self, key: str) -> int:
+        return await self._redis.incr(self.prefix + key)
+
+
+def create_cache_backend(settings: Settings) -> CacheBackend:
+    """Pick the backend named by ``settings.cache_backend``."""
+    if settings.cache_backend == "memory":
+        return MemoryCacheBackend(settings.cache_max_entries)
+    if settings.cache_backend.startswith(("redis://", "rediss://")):
+        return RedisCacheBackend(settings.cache_backend)
+    raise ValueError(f"Unknown CACHE_BACKEND: {settings.cache_backend}")
+
+
+def _etag(body: bytes) -> str:
+    # 약한 ETag: gzip 압축 여부와 무관하게 같은 내용이면 같은 값
+    return 'W/"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def _matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return etag.removeprefix("W/") in candidates
+
+
+class ResponseCache:
+    """Read-through cache of JSON responses with ETag support.
+
+    Keys live in namespaces (``groups`` for the group list, ``group:<id>``
+    for one group's rosters).  Invalidating a namespace bumps its
+    generation counter instead of deleting keys, so a read that started
+    before a write can never store its stale result under a key that later
+    readers will use.  Old generations simply expire with their TTL.
+
+    Concurrent misses for the same versioned key share one computation
+    (:class:`core.singleflight.SingleFlight`), also when ``ttl`` is ``0``.
+
+    Parameters
+    ----------
+    backend: CacheBackend
+        Where entries and generation counters are stored.
+    ttl: float
+        Seconds an entry stays valid.  ``0`` disables caching but keeps
+        ETag/304 handling and request coalescing.
+    """
+
+    GLOBAL_NAMESPACE = "all"
+
+    def __init__(self, backend: CacheBackend, ttl: float):
+        self.backend = backend
+        self.ttl = ttl
+        self.flights = SingleFlight()
+
+    async def _versioned_key(self, namespace: str, key: str) -> str:
+        namespace_gen = await self.backend.get_counter(f"gen:{namespace}")
+        global_gen = await self.backend.get_counter(f"gen:{self.GLOBAL_NAMESPACE}")
+        return f"{namespace}:{namespace_gen}:{global_gen}:{key}"
+
+    async def json_response(
+        self,
+        request: Request,
+        namespace: str,
+        key: str,
+        compute: Callable[[], Awaitable[tuple[Any, dict[str, str]]]],
+        private: bool = False,
+    ) -> Response:
+        """Return the cached response for ``key`` or build it with ``compute``.
+
+        ``compute`` returns the payload and extra response headers.  A
+        matching ``If-None-Match`` header yields ``304 Not Modified``.
+        Responses that depend on the caller must pass ``private=True`` so
+        that shared proxies do not store them.
+        """
+        # TTL 이 0 이어도 세대 번호가 붙은 키로 동시 요청을 묶는다
+        cache_key = await self._versioned_key(namespace, key)
+        entry = await self.backend.get(cache_key) if self.ttl > 0 else None
+
+        if entry is None:
+
+            async def build() -> bytes:
+                payload, headers = await compute()
+                body = render_json(payload)
+                headers = {**headers, "ETag": _etag(body)}
+                built = json.dumps(headers).encode("utf-8") + b"\n" + body
+                if self.ttl > 0:
+                    await self.backend.set(cache_key, built, self.ttl)
+                return built
+
+            entry = await self.flights.do(cache_key, build, label=route_template(request.scope))
+
+        meta, body = entry.split(b"\n", 1)
+        headers = json.loads(meta)
+
+        # 브라우저가 매번 재검증하도록 no-cache, 바뀌지 않았으면 304
+        headers = {**headers, "Cache-Control": "private, no-cache" if private else "no-cache"}
+        if _matches(request.headers.get("if-none-match"), headers["ETag"]):
+            return Response(status_code=304, headers=headers)
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    async def invalidate(self, *namespaces: str) -> None:
+        for namespace in namespaces:
+            await self.backend.incr(f"gen:{namespace}")
+
+    async def invalidate_all(self) -> None:
+        await self.invalidate(self.GLOBAL_NAMESPACE)
+
+
+GROUP_LIST_NAMESPACE = "groups"
+
+
+def group_namespace(group_id: int) -> str:
+    return f"group:{group_id}"
+
+
+_settings = get_settings()
+response_cache = ResponseCache(create_cache_backend(_settings), _settings.cache_ttl_seconds)
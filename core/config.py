@@ -0,0 +1,162 @@
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return default if value is None or value == "" else int(value)
+
+
+@dataclass(frozen=True)
+class Settings:
+    """Application settings read from environment variables.
+
+    Attributes
+    ----------
+    environment: str
+        ``APP_ENV`` – ``development`` (default) or ``production``.
+    database_url: str
+        ``DATABASE_URL`` – SQLAlchemy async URL.  Defaults to the local
+        ``app.db`` SQLite file; use ``postgresql+asyncpg://...`` for
+        multi-node deployments.
+    database_read_url: str
+        ``DATABASE_READ_URL`` – optional read replica used by ``GET``
+        requests.  Without it a SQLite file is reopened read-only
+        (``mode=ro``, ``query_only``) for reads, and other backends read
+        from the main database.
+    db_echo: bool
+        ``DB_ECHO`` – log every SQL statement.  Never enabled in production.
+    db_pool_size, db_max_overflow, db_pool_timeout, db_pool_recycle:
+        ``DB_POOL_SIZE``, ``DB_MAX_OVERFLOW``, ``DB_POOL_TIMEOUT`` (seconds)
+        and ``DB_POOL_RECYCLE`` (seconds) for the connection pool.
+    sqlite_journal_mode, sqlite_synchronous, sqlite_busy_timeout_ms,
+    sqlite_mmap_size, sqlite_cache_size:
+        ``SQLITE_*`` pragmas applied to every new SQLite connection.
+        ``sqlite_cache_size`` follows SQLite semantics (negative = KiB).
+    db_lock_retries: int
+        ``DB_LOCK_RETRIES`` – how many times a write transaction is retried
+        after SQLite reports ``database is locked``.
+    write_coordinator: bool
+        ``WRITE_COORDINATOR`` – send write endpoints through a single writer
+        task that commits concurrent writes together (group commit).
+    write_batch_window_ms, write_batch_max:
+        ``WRITE_BATCH_WINDOW_MS`` – how long the writer waits for more
+        writes before committing a batch; ``WRITE_BATCH_MAX`` – the most
+        writes committed in one transaction.
+    cache_backend: str
+        ``CACHE_BACKEND`` – ``memory`` (default, per process) or a
+        ``redis://`` URL shared by all workers.
+    cache_ttl_seconds: float
+        ``CACHE_TTL_SECONDS`` – lifetime of cached responses; ``0`` disables
+        the response cache.
+    cache_max_entries: int
+        ``CACHE_MAX_ENTRIES`` – size limit of the in-memory backend.
+    secret_key: str
+        ``SECRET_KEY`` – signs session tokens.  Required in production; in
+        development a random key is generated per process.
+    token_ttl_seconds: int
+        ``TOKEN_TTL_SECONDS`` – lifetime of a session token.
+    admin_token_ttl_seconds: int
+        ``ADMIN_TOKEN_TTL_SECONDS`` – lifetime of tokens issued to admins and
+        leaders.  Roles are carried in the token and cannot be revoked, so
+        a demoted admin keeps admin rights until this runs out.
+    token_cache_size: int
+        ``TOKEN_CACHE_SIZE`` – number of decoded tokens kept in memory.
+    password_hash_workers: int
+        ``PASSWORD_HASH_WORKERS`` – threads used for password hashing, which
+        also bounds how many hashes run concurrently.
+    gzip_minimum_size, gzip_level:
+        ``GZIP_MINIMUM_SIZE`` (bytes) and ``GZIP_LEVEL`` – API responses at
+        least this large are gzip-compressed when the client accepts it.
+    event_queue_size, event_keepalive_seconds:
+        ``EVENT_QUEUE_SIZE`` – events buffered per live-update subscriber
+        before a slow client is told to resync; ``EVENT_KEEPALIVE_SECONDS``
+        – interval of keep-alive comments on idle event streams.
+    """
+
+    environment: str = "development"
+    database_url: str = "sqlite+aiosqlite:///./app.db"
+    database_read_url: str = ""
+    db_echo: bool = False
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: int = 30
+    db_pool_recycle: int = 1800
+    sqlite_journal_mode: str = "WAL"
+    sqlite_synchronous: str = "NORMAL"
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_mmap_size: int = 256 * 1024 * 1024
+    sqlite_cache_size: int = -64_000
+    db_lock_retries: int = 5
+    write_coordinator: bool = False
+    write_batch_window_ms: float = 2.0
+    write_batch_max: int = 64
+    cache_backend: str = "memory"
+    cache_ttl_seconds: float = 30.0
+    cache_max_entries: int = 1024
+    secret_key: str = ""
+    token_ttl_seconds: int = 12 * 60 * 60
+    admin_token_ttl_seconds: int = 60 * 60
+    token_cache_size: int = 4096
+    password_hash_workers: int = 2
+    gzip_minimum_size: int = 1000
+    gzip_level: int = 6
+    event_queue_size: int = 64
+    event_keepalive_seconds: float = 15.0
+
+    @property
+    def is_production(self) -> bool:
+        return self.environment == "production"
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        environment = os.getenv("APP_ENV", cls.environment).strip().lower()
+        return cls(
+            environment=environment,
+            database_url=os.getenv("DATABASE_URL", cls.database_url),
+            database_read_url=os.getenv("DATABASE_READ_URL", cls.database_read_url),
+            db_echo=environment != "production" and _env_bool("DB_ECHO", cls.db_echo),
+            db_pool_size=_env_int("DB_POOL_SIZE", cls.db_pool_size),
+            db_max_overflow=_env_int("DB_MAX_OVERFLOW", cls.db_max_overflow),
+            db_pool_timeout=_env_int("DB_POOL_TIMEOUT", cls.db_pool_timeout),
+            db_pool_recycle=_env_int("DB_POOL_RECYCLE", cls.db_pool_recycle),
+            sqlite_journal_mode=os.getenv("SQLITE_JOURNAL_MODE", cls.sqlite_journal_mode),
+            sqlite_synchronous=os.getenv("SQLITE_SYNCHRONOUS", cls.sqlite_synchronous),
+            sqlite_busy_timeout_ms=_env_int("SQLITE_BUSY_TIMEOUT_MS", cls.sqlite_busy_timeout_ms),
+            sqlite_mmap_size=_env_int("SQLITE_MMAP_SIZE", cls.sqlite_mmap_size),
+            sqlite_cache_size=_env_int("SQLITE_CACHE_SIZE", cls.sqlite_cache_size),
+            db_lock_retries=_env_int("DB_LOCK_RETRIES", cls.db_lock_retries),
+            write_coordinator=_env_bool("WRITE_COORDINATOR", cls.write_coordinator),
+            write_batch_window_ms=float(
+                os.getenv("WRITE_BATCH_WINDOW_MS") or cls.write_batch_window_ms
+            ),
+            write_batch_max=_env_int("WRITE_BATCH_MAX", cls.write_batch_max),
+            cache_backend=os.getenv("CACHE_BACKEND", cls.cache_backend),
+            cache_ttl_seconds=float(os.getenv("CACHE_TTL_SECONDS") or cls.cache_ttl_seconds),
+            cache_max_entries=_env_int("CACHE_MAX_ENTRIES", cls.cache_max_entries),
+            secret_key=os.getenv("SECRET_KEY", cls.secret_key),
+            token_ttl_seconds=_env_int("TOKEN_TTL_SECONDS", cls.token_ttl_seconds),
+            admin_token_ttl_seconds=_env_int("ADMIN_TOKEN_TTL_SECONDS", cls.admin_token_ttl_seconds),
+            token_cache_size=_env_int("TOKEN_CACHE_SIZE", cls.token_cache_size),
+            password_hash_workers=_env_int("PASSWORD_HASH_WORKERS", cls.password_hash_workers),
+            gzip_minimum_size=_env_int("GZIP_MINIMUM_SIZE", cls.gzip_minimum_size),
+            gzip_level=_env_int("GZIP_LEVEL", cls.gzip_level),
+            event_queue_size=_env_int("EVENT_QUEUE_SIZE", cls.event_queue_size),
+            event_keepalive_seconds=float(
+                os.getenv("EVENT_KEEPALIVE_SECONDS") or cls.event_keepalive_seconds
+            ),
+        )
+
+
+@lru_cache
+def get_settings() -> Settings:
+    """Return the process-wide settings, read once from the environment."""
+    return Settings.from_env()
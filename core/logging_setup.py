@@ -1,10 +1,18 @@
+import atexit
 import logging
-from logging.handlers import RotatingFileHandler
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+_listener: QueueListener | None = None
 
 
 def setup_logging(log_file: str = "app.log", level: int = logging.INFO) -> None:
     """Configure root logger for the application.
 
+    Records are put on an in-memory queue by a ``QueueHandler`` and written
+    to the rotating log file by a background ``QueueListener`` thread, so
+    code running on the event loop never blocks on disk I/O.
+
     Parameters
     ----------
     log_file: str
@@ -12,6 +20,8 @@ def setup_logging(log_file: str = "app.log", level: int = logging.INFO) -> None:
     level: int
         Logging level. Defaults to ``logging.INFO``.
     """
+    global _listener
+
     logger = logging.getLogger()
     if logger.handlers:
         # Already configured
@@ -23,4 +33,18 @@ def setup_logging(log_file: str = "app.log", level: int = logging.INFO) -> None:
         "%(asctime)s - %(levelname)s - %(name)s - %(message)s"
     )
     handler.setFormatter(formatter)
-    logger.addHandler(handler)
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    logger.addHandler(QueueHandler(log_queue))
+    _listener = QueueListener(log_queue, handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+
+
+def stop_logging() -> None:
+    """Flush queued records and stop the background listener."""
+    global _listener
+
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -0,0 +1,283 @@
+import heapq
+from bisect import bisect_left
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+# Upper bounds (seconds) of the latency buckets, Prometheus style.
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Finer buckets for individual SQL statements and pool checkouts.
+QUERY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5, 1.0)
+# Number of SQL statements issued by one request.
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 250)
+
+
+class Histogram:
+    """Fixed-bucket histogram with constant-time ``observe``.
+
+    Parameters
+    ----------
+    buckets: tuple[float, ...]
+        Sorted upper bounds.  Values above the last bound go to an implicit
+        ``+Inf`` bucket.
+    """
+
+    __slots__ = ("buckets", "counts", "count", "sum")
+
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> float:
+        """Estimate the ``q`` quantile by interpolating inside its bucket."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for idx, bucket_count in enumerate(self.counts):
+            if seen + bucket_count >= rank and bucket_count:
+                lower = self.buckets[idx - 1] if idx else 0.0
+                upper = self.buckets[idx] if idx < len(self.buckets) else self.buckets[-1]
+                return lower + (upper - lower) * (rank - seen) / bucket_count
+            seen += bucket_count
+        return self.buckets[-1]
+
+    def cumulative(self) -> list[tuple[str, int]]:
+        """``(le, count)`` pairs with cumulative counts, ending with ``+Inf``."""
+        total = 0
+        result = []
+        for bound, bucket_count in zip((*map(str, self.buckets), "+Inf"), self.counts):
+            total += bucket_count
+            result.append((bound, total))
+        return result
+
+
+class RequestMetrics:
+    """Per-route request latency and status counts.
+
+    Updated from the event loop only, so no locking is needed.
+    """
+
+    def __init__(self):
+        self.latency: dict[tuple[str, str], Histogram] = {}
+        self.statuses: dict[tuple[str, str, int], int] = {}
+
+    def observe(self, method: str, route: str, status: int, seconds: float) -> None:
+        key = (method, route)
+        histogram = self.latency.get(key)
+        if histogram is None:
+            histogram = self.latency[key] = Histogram()
+        histogram.observe(seconds)
+        status_key = (method, route, status)
+        self.statuses[status_key] = self.statuses.get(status_key, 0) + 1
+
+    def snapshot(self) -> list[dict]:
+        """Aggregated latency per route, slowest average first."""
+        rows = []
+        for (method, route), histogram in self.latency.items():
+            rows.append({
+                "method": method,
+                "route": route,
+                "count": histogram.count,
+                "avg_ms": round(histogram.sum / histogram.count * 1000, 3),
+                "p50_ms": round(histogram.quantile(0.50) * 1000, 3),
+                "p95_ms": round(histogram.quantile(0.95) * 1000, 3),
+                "p99_ms": round(histogram.quantile(0.99) * 1000, 3),
+                "statuses": {
+                    str(status): count
+                    for (m, r, status), count in self.statuses.items()
+                    if m == method and r == route
+                },
+                "buckets": dict(histogram.cumulative()),
+            })
+        rows.sort(key=lambda row: row["avg_ms"], reverse=True)
+        return rows
+
+    def reset(self) -> None:
+        self.latency.clear()
+        self.statuses.clear()
+
+
+@dataclass
+class RequestContext:
+    """Per-request counters filled in by the database event hooks."""
+
+    scope: dict
+    query_count: int = 0
+    query_seconds: float = 0.0
+
+
+current_request: ContextVar[RequestContext | None] = ContextVar("current_request", default=None)
+
+
+@dataclass(order=True)
+class SlowStatement:
+    seconds: float
+    statement: str = field(compare=False)
+    route: str = field(compare=False)
+
+
+class DatabaseMetrics:
+    """SQL statement timings, statements per request and pool checkout waits.
+
+    Parameters
+    ----------
+    keep_slowest: int
+        How many of the slowest statements to remember.
+    """
+
+    def __init__(self, keep_slowest: int = 10):
+        self.keep_slowest = keep_slowest
+        self.query_latency = Histogram(QUERY_BUCKETS)
+        self.pool_wait = Histogram(QUERY_BUCKETS)
+        self.queries_per_request: dict[tuple[str, str], Histogram] = {}
+        self.query_seconds_per_request: dict[tuple[str, str], Histogram] = {}
+        self._slowest: list[SlowStatement] = []
+
+    def observe_query(self, statement: str, seconds: float, route: str) -> None:
+        self.query_latency.observe(seconds)
+        if len(self._slowest) < self.keep_slowest:
+            heapq.heappush(self._slowest, SlowStatement(seconds, _compact(statement), route))
+        elif seconds > self._slowest[0].seconds:
+            heapq.heapreplace(self._slowest, SlowStatement(seconds, _compact(statement), route))
+
+    def observe_pool_wait(self, seconds: float) -> None:
+        self.pool_wait.observe(seconds)
+
+    def observe_request(self, method: str, route: str, queries: int, seconds: float) -> None:
+        key = (method, route)
+        if key not in self.queries_per_request:
+            self.queries_per_request[key] = Histogram(QUERY_COUNT_BUCKETS)
+            self.query_seconds_per_request[key] = Histogram(LATENCY_BUCKETS)
+        self.queries_per_request[key].observe(queries)
+        self.query_seconds_per_request[key].observe(seconds)
+
+    def slowest(self) -> list[SlowStatement]:
+        return sorted(self._slowest, reverse=True)
+
+    def reset(self) -> None:
+        self.__init__(self.keep_slowest)
+
+
+class CoalescingMetrics:
+    """Requests that ran a computation vs. joined one already in flight, per route."""
+
+    def __init__(self):
+        self.leaders: dict[str, int] = {}
+        self.coalesced: dict[str, int] = {}
+
+    def observe(self, route: str, coalesced: bool) -> None:
+        counts = self.coalesced if coalesced else self.leaders
+        counts[route] = counts.get(route, 0) + 1
+
+    def snapshot(self) -> list[dict]:
+        rows = []
+        for route in sorted(self.leaders.keys() | self.coalesced.keys()):
+            leaders, coalesced = self.leaders.get(route, 0), self.coalesced.get(route, 0)
+            rows.append({
+                "route": route,
+                "computed": leaders,
+                "coalesced": coalesced,
+                "coalesced_ratio": round(coalesced / (leaders + coalesced), 3),
+            })
+        return rows
+
+    def reset(self) -> None:
+        self.leaders.clear()
+        self.coalesced.clear()
+
+
+def _compact(statement: str, limit: int = 200) -> str:
+    text = " ".join(statement.split())
+    return text if len(text) <= limit else text[: limit - 3] + "..."
+
+
+request_metrics = RequestMetrics()
+db_metrics = DatabaseMetrics()
+coalescing_metrics = CoalescingMetrics()
+
+
+def _label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels) -> str:
+    return ",".join(f'{key}="{_label(value)}"' for key, value in labels.items())
+
+
+def _histogram_lines(name: str, histogram: Histogram, **labels) -> list[str]:
+    prefix = _labels(**labels)
+    sep = "," if prefix else ""
+    suffix = f"{{{prefix}}}" if prefix else ""
+    lines = [
+        f'{name}_bucket{{{prefix}{sep}le="{le}"}} {count}'
+        for le, count in histogram.cumulative()
+    ]
+    lines.append(f"{name}_sum{suffix} {histogram.sum}")
+    lines.append(f"{name}_count{suffix} {histogram.count}")
+    return lines
+
+
+def render_prometheus(
+    requests: RequestMetrics = request_metrics,
+    database: DatabaseMetrics = db_metrics,
+    coalescing: CoalescingMetrics = coalescing_metrics,
+) -> str:
+    """Render all metrics in the Prometheus text exposition format."""
+    lines = [
+        "# HELP http_request_duration_seconds Request latency by route.",
+        "# TYPE http_request_duration_seconds histogram",
+    ]
+    for (method, route), histogram in requests.latency.items():
+        lines += _histogram_lines("http_request_duration_seconds", histogram, method=method, route=route)
+
+    lines += [
+        "# HELP http_requests_total Requests by route and status code.",
+        "# TYPE http_requests_total counter",
+    ]
+    for (method, route, status), count in requests.statuses.items():
+        lines.append(f"http_requests_total{{{_labels(method=method, route=route, status=status)}}} {count}")
+
+    lines += [
+        "# HELP db_queries_per_request SQL statements issued per request.",
+        "# TYPE db_queries_per_request histogram",
+    ]
+    for (method, route), histogram in database.queries_per_request.items():
+        lines += _histogram_lines("db_queries_per_request", histogram, method=method, route=route)
+
+    lines += [
+        "# HELP db_query_seconds_per_request Time spent in SQL per request.",
+        "# TYPE db_query_seconds_per_request histogram",
+    ]
+    for (method, route), histogram in database.query_seconds_per_request.items():
+        lines += _histogram_lines("db_query_seconds_per_request", histogram, method=method, route=route)
+
+    lines += [
+        "# HELP db_query_duration_seconds Duration of individual SQL statements.",
+        "# TYPE db_query_duration_seconds histogram",
+        *_histogram_lines("db_query_duration_seconds", database.query_latency),
+        "# HELP db_pool_checkout_wait_seconds Time spent waiting for a pooled connection.",
+        "# TYPE db_pool_checkout_wait_seconds histogram",
+        *_histogram_lines("db_pool_checkout_wait_seconds", database.pool_wait),
+        "# HELP db_slow_statement_seconds Slowest SQL statements seen since start.",
+        "# TYPE db_slow_statement_seconds gauge",
+    ]
+    for slow in database.slowest():
+        lines.append(
+            f"db_slow_statement_seconds{{{_labels(route=slow.route, statement=slow.statement)}}} {slow.seconds}"
+        )
+
+    lines += [
+        "# HELP singleflight_requests_total Reads that computed a response or joined one in flight.",
+        "# TYPE singleflight_requests_total counter",
+    ]
+    for result, counts in (("computed", coalescing.leaders), ("coalesced", coalescing.coalesced)):
+        for route, count in counts.items():
+            lines.append(f"singleflight_requests_total{{{_labels(route=route, result=result)}}} {count}")
+    return "\n".join(lines) + "\n"
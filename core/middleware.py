@@ -1,18 +1,123 @@
 import logging
+import time
 
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.middleware.gzip import GZipMiddleware
+
+from core.metrics import (
+    DatabaseMetrics,
+    RequestContext,
+    RequestMetrics,
+    current_request,
+    db_metrics,
+    request_metrics,
+)
 
 logger = logging.getLogger(__name__)
 
 
-class LoggingMiddleware(BaseHTTPMiddleware):
-    """Simple middleware that logs request and response information."""
+def route_template(scope) -> str:
+    """Return the matched route path (``/api/v1/groups/{group_id}/teams``).
+
+    Falls back to the mount path for mounted apps such as ``/static`` and to
+    ``<unmatched>`` for requests that did not match any route, so that
+    metrics keys stay bounded.
+    """
+    route = scope.get("route")
+    if route is not None:
+        return getattr(route, "path_format", None) or route.path
+    if scope.get("root_path"):
+        return f"{scope['root_path']}/{{path}}"
+    return "<unmatched>"
+
+
+class LoggingMiddleware:
+    """Pure ASGI middleware that logs and times every HTTP request.
+
+    One log line is written per request with the method, route template,
+    status code and latency, and the latency is recorded in a per-route
+    histogram (except for ``text/event-stream`` responses, whose duration is
+    how long the client stayed connected).  Unlike ``BaseHTTPMiddleware``
+    the response is passed through untouched, without an extra task or
+    body stream.
+
+    A :class:`~core.metrics.RequestContext` is exposed through
+    ``current_request`` so the database hooks can count the SQL statements
+    issued while serving the request.
+    """
+
+    def __init__(
+        self,
+        app,
+        metrics: RequestMetrics = request_metrics,
+        database: DatabaseMetrics = db_metrics,
+    ):
+        self.app = app
+        self.metrics = metrics
+        self.database = database
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500
+        streaming = False
+        context = RequestContext(scope)
+        token = current_request.set(context)
+
+        async def send_wrapper(message):
+            nonlocal status_code, streaming
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                streaming = any(
+                    name.lower() == b"content-type" and value.startswith(b"text/event-stream")
+                    for name, value in message.get("headers", [])
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_request.reset(token)
+            elapsed = time.perf_counter() - start
+            route = route_template(scope)
+            # 이벤트 스트림은 연결이 유지된 시간일 뿐이라 지연 시간 분포에서 뺀다
+            if not streaming:
+                self.metrics.observe(scope["method"], route, status_code, elapsed)
+            self.database.observe_request(
+                scope["method"], route, context.query_count, context.query_seconds
+            )
+            logger.info(
+                "%s %s (%s) -> %s %.1fms, %d queries",
+                scope["method"], scope["path"], route, status_code, elapsed * 1000,
+                context.query_count,
+            )
+
+
+class CompressionMiddleware:
+    """Negotiated gzip for responses of at least ``minimum_size`` bytes.
+
+    Wraps Starlette's ``GZipMiddleware`` but leaves paths under
+    ``exclude_prefixes`` alone: static assets are already precompressed and
+    images gain nothing from being compressed again on every request.
+    Responses that already carry ``Content-Encoding`` and event streams are
+    passed through by ``GZipMiddleware`` itself.
+    """
+
+    def __init__(
+        self,
+        app,
+        minimum_size: int = 1000,
+        compresslevel: int = 6,
+        exclude_prefixes: tuple[str, ...] = ("/static/",),
+    ):
+        self.app = app
+        self.gzip = GZipMiddleware(app, minimum_size=minimum_size, compresslevel=compresslevel)
+        self.exclude_prefixes = exclude_prefixes
 
-    async def dispatch(self, request: Request, call_next):
-        logger.info("Request: %s %s", request.method, request.url.path)
-        response = await call_next(request)
-        logger.info(
-            "Response: %s %s -> %s", request.method, request.url.path, response.status_code
-        )
-        return response
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"].startswith(self.exclude_prefixes):
+            await self.app(scope, receive, send)
+            return
+        await self.gzip(scope, receive, send)
@@ -0,0 +1,105 @@
+import asyncio
+from collections import defaultdict
+from typing import Any, Iterable
+
+from core.config import get_settings
+from core.responses import render_json
+
+
+def format_event(event: str, data: Any) -> bytes:
+    """Encode one server-sent event frame (``event:`` + JSON ``data:``)."""
+    return b"event: " + event.encode() + b"\ndata: " + render_json(data) + b"\n\n"
+
+
+# Sent instead of the dropped events when a subscriber falls behind.
+RESYNC = format_event("resync", {})
+KEEPALIVE = b": keepalive\n\n"
+
+
+class Subscription:
+    """A subscriber's bounded queue of encoded event frames.
+
+    When the client reads slower than events are published and the queue
+    fills up, the pending events are discarded and replaced by a single
+    ``resync`` event telling the client to refetch the full state.  A slow
+    client therefore never makes publishers wait or memory grow.
+    """
+
+    def __init__(self, broker: "Broker", topics: frozenset[str], maxsize: int):
+        self.broker = broker
+        self.topics = topics
+        self.queue: asyncio.Queue[bytes] = asyncio.Queue(maxsize)
+        self.resyncs = 0
+
+    def deliver(self, frame: bytes) -> None:
+        try:
+            self.queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC)
+            self.resyncs += 1
+
+    async def next(self, timeout: float | None = None) -> bytes | None:
+        """Next frame, or ``None`` when nothing arrived within ``timeout``."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self) -> None:
+        self.broker.unsubscribe(self)
+
+
+class Broker:
+    """In-process publish/subscribe with per-topic fan-out.
+
+    Each event is encoded once and the same bytes are queued for every
+    subscriber of its topic.  Only clients connected to this process are
+    reached; with several worker processes each worker publishes the writes
+    it handled.
+
+    Parameters
+    ----------
+    queue_size: int
+        Frames buffered per subscriber before it is asked to resync.
+    """
+
+    def __init__(self, queue_size: int = 64):
+        self.queue_size = queue_size
+        self._topics: dict[str, set[Subscription]] = defaultdict(set)
+
+    def subscribe(self, topics: Iterable[str]) -> Subscription:
+        subscription = Subscription(self, frozenset(topics), self.queue_size)
+        for topic in subscription.topics:
+            self._topics[topic].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        for topic in subscription.topics:
+            subscribers = self._topics.get(topic)
+            if subscribers is None:
+                continue
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._topics[topic]
+
+    def has_subscribers(self, topic: str) -> bool:
+        return bool(self._topics.get(topic))
+
+    def publish(self, topic: str, event: str, data: Any) -> int:
+        """Queue ``event`` for every subscriber of ``topic``; returns how many."""
+        subscribers = self._topics.get(topic)
+        if not subscribers:
+            return 0
+        frame = format_event(event, data)
+        for subscription in subscribers:
+            subscription.deliver(frame)
+        return len(subscribers)
+
+
+def group_topic(group_id: int) -> str:
+    return f"group:{group_id}"
+
+
+broker = Broker(get_settings().event_queue_size)
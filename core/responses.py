@@ -0,0 +1,25 @@
+from typing import Any
+
+import orjson
+from fastapi.responses import ORJSONResponse
+
+# Same options as FastAPI's ORJSONResponse, so both produce identical bytes.
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def render_json(payload: Any) -> bytes:
+    """Serialise ``payload`` with orjson.
+
+    Handles dicts, lists, dates, datetimes and enums natively, without
+    FastAPI's ``jsonable_encoder`` pass.
+    """
+    return orjson.dumps(payload, option=ORJSON_OPTIONS)
+
+
+def json_rows(rows, headers: dict[str, str] | None = None) -> ORJSONResponse:
+    """Return SQLAlchemy row mappings as an orjson response.
+
+    Returning a response object directly skips ``jsonable_encoder``, which
+    dominates serialisation time for large lists.
+    """
+    return ORJSONResponse([dict(row) for row in rows], headers=headers)
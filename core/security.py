@@ -0,0 +1,189 @@
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+import logging
+import os
+import secrets
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+
+from core.config import get_settings
+from models.user import RoleEnum
+
+logger = logging.getLogger(__name__)
+
+# scrypt cost parameters: ~16 MiB of memory and tens of milliseconds per hash.
+SCRYPT_N = 2 ** 14
+SCRYPT_R = 8
+SCRYPT_P = 1
+SCRYPT_PREFIX = "scrypt"
+
+settings = get_settings()
+
+# Hashing is CPU bound and releases the GIL, so it runs on a small dedicated
+# pool.  The pool size bounds how many hashes run at once; further login
+# attempts queue instead of starving the event loop or the default executor.
+_hash_executor = ThreadPoolExecutor(
+    max_workers=settings.password_hash_workers, thread_name_prefix="password-hash"
+)
+
+
+def _b64encode(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(text: str) -> bytes:
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+def hash_password(password: str) -> str:
+    """Return ``scrypt$n$r$p$salt$hash`` for ``password``.
+
+    Blocking; call :func:`hash_password_async` from request handlers.
+    """
+    salt = os.urandom(16)
+    digest = hashlib.scrypt(
+        password.encode("utf-8"), salt=salt, n=SCRYPT_N, r=SCRYPT_R, p=SCRYPT_P, dklen=32
+    )
+    return f"{SCRYPT_PREFIX}${SCRYPT_N}${SCRYPT_R}${SCRYPT_P}${_b64encode(salt)}${_b64encode(digest)}"
+
+
+def verify_password(password: str, stored: str) -> bool:
+    """Check ``password`` against a stored hash.
+
+    Rows created before hashing was introduced still hold the plaintext
+    password; those are compared in constant time so that users can log in
+    once and have their password rehashed (see :func:`needs_rehash`).
+    """
+    if not stored.startswith(SCRYPT_PREFIX + "$"):
+        return hmac.compare_digest(password.encode("utf-8"), stored.encode("utf-8"))
+    try:
+        _, n, r, p, salt, expected = stored.split("$")
+        digest = hashlib.scrypt(
+            password.encode("utf-8"),
+            salt=_b64decode(salt),
+            n=int(n),
+            r=int(r),
+            p=int(p),
+            dklen=len(_b64decode(expected)),
+        )
+    except ValueError:
+        return False
+    return hmac.compare_digest(digest, _b64decode(expected))
+
+
+def needs_rehash(stored: str) -> bool:
+    """True for plaintext passwords and hashes made with other parameters."""
+    return not stored.startswith(f"{SCRYPT_PREFIX}${SCRYPT_N}${SCRYPT_R}${SCRYPT_P}$")
+
+
+async def hash_password_async(password: str) -> str:
+    return await asyncio.get_running_loop().run_in_executor(_hash_executor, hash_password, password)
+
+
+async def verify_password_async(password: str, stored: str) -> bool:
+    return await asyncio.get_running_loop().run_in_executor(
+        _hash_executor, verify_password, password, stored
+    )
+
+
+@lru_cache(maxsize=1)
+def _dummy_hash() -> str:
+    return hash_password(secrets.token_urlsafe(16))
+
+
+def _verify_dummy(password: str) -> bool:
+    verify_password(password, _dummy_hash())
+    return False
+
+
+async def verify_unknown_user_async(password: str) -> bool:
+    """Spend one password verification on an account that does not exist.
+
+    Always ``False``.  Login calls this for unknown emails so that the
+    response takes as long as a wrong password and does not reveal which
+    emails are registered.
+    """
+    return await asyncio.get_running_loop().run_in_executor(_hash_executor, _verify_dummy, password)
+
+
+def _load_secret() -> bytes:
+    if settings.secret_key:
+        return settings.secret_key.encode("utf-8")
+    if settings.is_production:
+        raise RuntimeError("SECRET_KEY must be set in production")
+    logger.warning("SECRET_KEY is not set; using a random key, sessions end on restart")
+    return secrets.token_bytes(32)
+
+
+_secret = _load_secret()
+
+
+@dataclass(frozen=True)
+class TokenClaims:
+    """Identity carried by a session token."""
+
+    user_id: int
+    username: str
+    role: str
+    expires_at: int
+
+    @property
+    def is_admin(self) -> bool:
+        return self.role in (RoleEnum.admin.value, RoleEnum.leader.value)
+
+
+def _sign(payload: bytes) -> str:
+    return _b64encode(hmac.new(_secret, payload, hashlib.sha256).digest())
+
+
+def create_token(user_id: int, username: str, role: str, ttl: int | None = None) -> str:
+    """Issue a signed session token ``<payload>.<signature>``.
+
+    The payload is base64url JSON, so the client can read it but not alter
+    it without invalidating the HMAC-SHA256 signature.  Tokens cannot be
+    revoked, so unless ``ttl`` is given, admins and leaders get the shorter
+    ``admin_token_ttl_seconds`` to limit how long a role change goes
+    unnoticed.
+    """
+    if ttl is None:
+        elevated = role in (RoleEnum.admin.value, RoleEnum.leader.value)
+        ttl = settings.admin_token_ttl_seconds if elevated else settings.token_ttl_seconds
+    expires_at = int(time.time()) + ttl
+    payload = json.dumps(
+        {"sub": user_id, "name": username, "role": role, "exp": expires_at},
+        separators=(",", ":"),
+    ).encode("utf-8")
+    encoded = _b64encode(payload)
+    return f"{encoded}.{_sign(encoded.encode('ascii'))}"
+
+
+@lru_cache(maxsize=settings.token_cache_size)
+def _decode_signed(token: str) -> TokenClaims | None:
+    # 서명 검증과 JSON 파싱 결과를 캐시한다 (만료는 매번 확인)
+    encoded, _, signature = token.partition(".")
+    if not signature or not hmac.compare_digest(signature, _sign(encoded.encode("ascii"))):
+        return None
+    try:
+        data = json.loads(_b64decode(encoded))
+        return TokenClaims(int(data["sub"]), data["name"], data["role"], int(data["exp"]))
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+def decode_token(token: str) -> TokenClaims | None:
+    """Return the claims of a valid, unexpired token, otherwise ``None``.
+
+    Decoded tokens are kept in an LRU cache, so repeated requests with the
+    same token cost one dictionary lookup and no database access.
+    """
+    if not token.isascii():
+        return None
+    claims = _decode_signed(token)
+    if claims is None or claims.expires_at <= time.time():
+        return None
+    return claims
@@ -0,0 +1,65 @@
+import asyncio
+from typing import Any, Awaitable, Callable, TypeVar
+
+from core.metrics import CoalescingMetrics, coalescing_metrics
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Share one in-flight computation between concurrent identical calls.
+
+    The first caller for a key (the leader) runs the computation; callers
+    arriving while it is still running wait for and receive the same result
+    or exception.  Nothing is kept once the computation finishes, so this
+    is independent of caching and stays correct with a zero cache TTL.
+    Keys must change whenever the underlying data does (the response cache
+    uses its generation-versioned keys) so that a request arriving after a
+    write never joins a computation started before it.
+
+    If the leader is cancelled (e.g. its client disconnected) the waiting
+    callers do not fail: one of them takes over and runs the computation.
+
+    Parameters
+    ----------
+    metrics: CoalescingMetrics
+        Receives one observation per call, labelled with ``label``.
+    """
+
+    def __init__(self, metrics: CoalescingMetrics = coalescing_metrics):
+        self.metrics = metrics
+        self._calls: dict[Any, asyncio.Future] = {}
+
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: Any, fn: Callable[[], Awaitable[T]], label: str = "") -> T:
+        while True:
+            call = self._calls.get(key)
+            if call is None:
+                break
+            # wait() 는 기다리던 쪽이 취소돼도 공유 중인 계산을 취소하지 않는다
+            await asyncio.wait([call])
+            if call.cancelled():
+                continue  # 리더가 취소됐으면 직접 다시 계산한다
+            self.metrics.observe(label, coalesced=True)
+            return call.result()
+
+        call = asyncio.get_running_loop().create_future()
+        self._calls[key] = call
+        self.metrics.observe(label, coalesced=False)
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            call.cancel()
+            raise
+        except BaseException as exc:
+            call.set_exception(exc)
+            # 기다리는 쪽이 없어도 "exception was never retrieved" 경고가 나지 않게
+            call.exception()
+            raise
+        else:
+            call.set_result(result)
+            return result
+        finally:
+            del self._calls[key]
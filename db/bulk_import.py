@@ -0,0 +1,261 @@
+# db/bulk_import.py
+"""Stream large numbers of users and attendance rows into the database.
+
+Rows come from generators (synthetic staging data) or CSV files and are
+written with chunked ``executemany`` inserts, one transaction per chunk, so
+memory stays flat however many rows are imported.
+
+    python -m db.bulk_import generate --users 20000 --admins 200 --groups 100 --attendance-rate 0.3
+    python -m db.bulk_import users members.csv
+    python -m db.bulk_import attendance attendance.csv
+"""
+import asyncio
+import csv
+import random
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from itertools import islice
+from typing import Iterable, Iterator, Mapping
+
+from sqlalchemy import func, insert, select
+
+from core.security import SCRYPT_PREFIX, hash_password
+from db.session import AsyncSessionLocal
+from db.seed_users import generate_unique_name, random_gender, random_interest
+from models.attendance import AttendanceStatus
+from models.group import Group, PartEnum
+from models.user import GenderEnum, RoleEnum, User
+from services.attendance_service import rebuild_attendance_stats, upsert_attendance
+
+CHUNK_SIZE = 1000
+DEFAULT_PASSWORD = "userpass"
+
+
+def chunked(rows: Iterable[dict], size: int = CHUNK_SIZE) -> Iterator[list[dict]]:
+    """Yield lists of at most ``size`` rows."""
+    iterator = iter(rows)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def generate_users(
+    count: int,
+    *,
+    admins: int = 0,
+    start: int = 0,
+    existing_names: set[str] | None = None,
+    password_hash: str | None = None,
+) -> Iterator[dict]:
+    """Yield ``count`` synthetic users.
+
+    The first ``admins`` users are admins.  Names avoid ``existing_names``
+    and emails are numbered from ``start`` so repeated imports do not
+    collide.  Every user shares one password hash (``userpass`` by
+    default), since hashing tens of thousands of passwords would dominate
+    the import time.
+
+    Call ``random.seed`` beforehand for reproducible data.
+    """
+    password = password_hash or hash_password(DEFAULT_PASSWORD)
+    existing_names = set() if existing_names is None else existing_names
+    for i in range(start, start + count):
+        gender = random_gender()
+        yield {
+            "username": generate_unique_name(gender, existing_names),
+            "password": password,
+            "email": f"user{i}@example.com",
+            "role": RoleEnum.admin if i - start < admins else RoleEnum.member,
+            "gender": gender,
+            "interests": random_interest(),
+        }
+
+
+def _enum(enum_cls, value: str):
+    # CSV 에는 값("남") 또는 이름("male") 어느 쪽이든 올 수 있다
+    try:
+        return enum_cls(value)
+    except ValueError:
+        return enum_cls[value]
+
+
+def read_users_csv(path: str) -> Iterator[dict]:
+    """Yield users from a CSV with ``username,email,password,gender[,role,interests]``.
+
+    Passwords may be plaintext (hashed during import) or existing
+    ``scrypt$...`` hashes.
+    """
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        for row in csv.DictReader(f):
+            yield {
+                "username": row["username"],
+                "password": row["password"],
+                "email": row["email"],
+                "role": _enum(RoleEnum, row.get("role") or RoleEnum.member.value),
+                "gender": _enum(GenderEnum, row["gender"]),
+                "interests": row.get("interests", ""),
+            }
+
+
+async def import_users(rows: Iterable[dict], session_factory=AsyncSessionLocal, chunk_size: int = CHUNK_SIZE) -> int:
+    """Insert users chunk by chunk and return how many were written.
+
+    Plaintext passwords are hashed on a thread pool, one chunk at a time.
+    """
+    total = 0
+    loop = asyncio.get_running_loop()
+    with ThreadPoolExecutor(thread_name_prefix="import-hash") as executor:
+        for chunk in chunked(rows, chunk_size):
+            plain = [row for row in chunk if not row["password"].startswith(SCRYPT_PREFIX + "$")]
+            hashes = await asyncio.gather(
+                *(loop.run_in_executor(executor, hash_password, row["password"]) for row in plain)
+            )
+            for row, hashed in zip(plain, hashes):
+                row["password"] = hashed
+            async with session_factory() as db:
+                await db.execute(insert(User), chunk)
+                await db.commit()
+            total += len(chunk)
+    return total
+
+
+def generate_groups(count: int, first_date: date, every: timedelta = timedelta(weeks=1)) -> Iterator[dict]:
+    for i in range(count):
+        yield {"date": first_date + every * i}
+
+
+async def import_groups(rows: Iterable[dict], session_factory=AsyncSessionLocal) -> list[int]:
+    async with session_factory() as db:
+        ids = []
+        for chunk in chunked(rows):
+            ids += (await db.scalars(insert(Group).returning(Group.id), chunk)).all()
+        await db.commit()
+    return ids
+
+
+def generate_attendance(
+    group_ids: Iterable[int], user_ids: list[int], rate: float
+) -> Iterator[dict]:
+    """Yield attendance for a ``rate`` share of ``user_ids`` in every group."""
+    sample_size = int(len(user_ids) * rate)
+    for group_id in group_ids:
+        for user_id in random.sample(user_ids, sample_size):
+            yield {
+                "group_id": group_id,
+                "user_id": user_id,
+                "part": random.choice([PartEnum.FIRST, PartEnum.SECOND]),
+                "status": AttendanceStatus.attending,
+            }
+
+
+async def load_attendance_keys(session_factory=AsyncSessionLocal) -> tuple[dict[str, int], dict[date, int]]:
+    """Map every user email and group date to its id, with one query each."""
+    async with session_factory() as db:
+        user_ids = dict((await db.execute(select(User.email, User.id))).all())
+        group_ids = dict((await db.execute(select(Group.date, Group.id))).all())
+    return user_ids, group_ids
+
+
+def read_attendance_csv(
+    path: str, user_ids: Mapping[str, int], group_ids: Mapping[date, int]
+) -> Iterator[dict]:
+    """Yield attendance from a CSV with ``email,group_date,part,status``.
+
+    Emails and dates are resolved with ``user_ids`` and ``group_ids`` (see
+    :func:`load_attendance_keys`); rows whose user or group does not exist
+    are skipped.
+    """
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        for row in csv.DictReader(f):
+            user_id = user_ids.get(row["email"])
+            group_id = group_ids.get(datetime.strptime(row["group_date"], "%Y-%m-%d").date())
+            if user_id is None or group_id is None:
+                continue
+            yield {
+                "group_id": group_id,
+                "user_id": user_id,
+                "part": _enum(PartEnum, row["part"]),
+                "status": _enum(AttendanceStatus, row.get("status") or AttendanceStatus.attending.value),
+            }
+
+
+async def import_attendance(
+    rows: Iterable[dict], session_factory=AsyncSessionLocal, chunk_size: int = CHUNK_SIZE
+) -> int:
+    """Upsert attendance chunk by chunk, then rebuild the attendance stats."""
+    total = 0
+    for chunk in chunked(rows, chunk_size):
+        async with session_factory() as db:
+            await upsert_attendance(db, chunk)
+            await db.commit()
+        total += len(chunk)
+
+    async with session_factory() as db:
+        await rebuild_attendance_stats(db)
+        await db.commit()
+    return total
+
+
+async def generate(
+    users: int,
+    admins: int,
+    groups: int,
+    attendance_rate: float,
+    first_date: date,
+    seed: int | None = None,
+    session_factory=AsyncSessionLocal,
+) -> dict:
+    """Create a synthetic club: users, weekly groups and their attendance."""
+    random.seed(seed)
+    async with session_factory() as db:
+        start = (await db.scalar(select(func.max(User.id)))) or 0
+        existing_names = set((await db.scalars(select(User.username))).all())
+    first_new = start + 1
+
+    written_users = await import_users(
+        generate_users(users, admins=admins, start=start, existing_names=existing_names),
+        session_factory,
+    )
+    group_ids = await import_groups(generate_groups(groups, first_date), session_factory)
+    async with session_factory() as db:
+        user_ids = list((await db.scalars(select(User.id).where(User.id >= first_new))).all())
+    written_attendance = await import_attendance(
+        generate_attendance(group_ids, user_ids, attendance_rate), session_factory
+    )
+    return {"users": written_users, "groups": len(group_ids), "attendance": written_attendance}
+
+
+async def _main(args) -> None:
+    if args.command == "generate":
+        counts = await generate(
+            args.users, args.admins, args.groups, args.attendance_rate,
+            datetime.strptime(args.first_date, "%Y-%m-%d").date(), args.seed,
+        )
+        print(f"✅ 유저 {counts['users']}명, 모임 {counts['groups']}개, 출석 {counts['attendance']}건 생성")
+    elif args.command == "users":
+        print(f"✅ 유저 {await import_users(read_users_csv(args.csv))}명 가져오기 완료")
+    else:
+        rows = read_attendance_csv(args.csv, *await load_attendance_keys())
+        print(f"✅ 출석 {await import_attendance(rows)}건 가져오기 완료")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Bulk generate or import users and attendance")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    gen = sub.add_parser("generate", help="Generate a synthetic club")
+    gen.add_argument("--users", type=int, default=10000)
+    gen.add_argument("--admins", type=int, default=100)
+    gen.add_argument("--groups", type=int, default=50)
+    gen.add_argument("--attendance-rate", type=float, default=0.3)
+    gen.add_argument("--first-date", default="2024-01-06", help="Date of the first group (YYYY-MM-DD)")
+    gen.add_argument("--seed", type=int, help="Random seed for reproducible data")
+
+    users_cmd = sub.add_parser("users", help="Import users from CSV")
+    users_cmd.add_argument("csv", help="username,email,password,gender[,role,interests]")
+
+    attendance_cmd = sub.add_parser("attendance", help="Import attendance from CSV")
+    attendance_cmd.add_argument("csv", help="email,group_date,part,status")
+
+    asyncio.run(_main(parser.parse_args()))
@@ -3,6 +3,16 @@ import asyncio
 from db.session import engine
 from models import user, group, attendance
 
+def ensure_indexes(sync_conn) -> None:
+    """Create indexes declared on the models that are missing in the database.
+
+    ``create_all`` skips tables that already exist together with their
+    indexes, so databases created before an index was added need this step.
+    """
+    for table in attendance.Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(sync_conn, checkfirst=True)
+
 async def init_db(reset: bool = False):
     """Initialise the database.
 
@@ -11,6 +21,9 @@ async def init_db(reset: bool = False):
     reset: bool
         Drop existing tables before creating them again.  Useful when the
         schema has changed and the SQLite file still exists.
+
+    Without ``reset`` this also upgrades an existing database in place by
+    creating any missing tables and indexes.
     """
 
     async with engine.begin() as conn:
@@ -21,6 +34,7 @@ async def init_db(reset: bool = False):
         await conn.run_sync(user.Base.metadata.create_all)
         await conn.run_sync(group.Base.metadata.create_all)
         await conn.run_sync(attendance.Base.metadata.create_all)
+        await conn.run_sync(ensure_indexes)
 
 if __name__ == "__main__":
     import argparse
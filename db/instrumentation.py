@@ -0,0 +1,53 @@
+import time
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from core.metrics import DatabaseMetrics, current_request, db_metrics
+from core.middleware import route_template
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout waited for a connection."""
+
+    metrics: DatabaseMetrics = db_metrics
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            self.metrics.observe_pool_wait(time.perf_counter() - start)
+
+
+def instrument_engine(engine: AsyncEngine, metrics: DatabaseMetrics = db_metrics) -> None:
+    """Count and time every SQL statement executed through ``engine``.
+
+    Statements are attributed to the route of the request being served,
+    taken from :data:`core.metrics.current_request` which the logging
+    middleware sets for each HTTP request.
+    """
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        request = current_request.get()
+        if request is not None:
+            request.query_count += 1
+            request.query_seconds += elapsed
+            route = route_template(request.scope)
+        else:
+            route = "<background>"
+        metrics.observe_query(statement, elapsed, route)
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _on_error(exception_context):
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_start"):
+            conn.info["query_start"].pop()
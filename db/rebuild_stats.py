@@ -0,0 +1,45 @@
+# db/rebuild_stats.py
+import asyncio
+
+from db.session import AsyncSessionLocal
+from services.attendance_service import rebuild_attendance_stats
+from services.team_history import rebuild_team_pairs
+
+
+async def rebuild_stats(user_ids: list[int] | None = None, team_pairs: bool = False) -> None:
+    """Recompute ``user_attendance_stats`` from the attendance table.
+
+    Parameters
+    ----------
+    user_ids: list[int] | None
+        Only rebuild these users.  Rebuilds every user when omitted.
+    team_pairs: bool
+        Also rebuild the ``team_pairs`` history used to avoid repeat
+        pairings from the existing ``team_users`` rows.
+    """
+
+    async with AsyncSessionLocal() as db:
+        await rebuild_attendance_stats(db, user_ids)
+        if team_pairs:
+            await rebuild_team_pairs(db)
+        await db.commit()
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Rebuild per-user attendance statistics")
+    parser.add_argument(
+        "--user",
+        type=int,
+        action="append",
+        dest="user_ids",
+        help="Rebuild only this user id (may be given multiple times)",
+    )
+    parser.add_argument(
+        "--team-pairs",
+        action="store_true",
+        help="Also rebuild the team pairing history",
+    )
+    args = parser.parse_args()
+
+    asyncio.run(rebuild_stats(args.user_ids, team_pairs=args.team_pairs))
@@ -6,7 +6,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from db.session import AsyncSessionLocal
 from models.user import User, RoleEnum
 from models.group import Group, PartEnum
-from models.attendance import Attendance, AttendanceStatus
+from models.attendance import AttendanceStatus
+from services.attendance_service import AttendanceChange, apply_attendance_changes
 
 async def seed_attendance(group_id: int, admin_count: int, member_count: int, db: AsyncSession) -> None:
     group = await db.get(Group, group_id)
@@ -14,32 +15,33 @@ async def seed_attendance(group_id: int, admin_count: int, member_count: int, db
         print(f"Group {group_id} not found")
         return
 
+    # 전체 유저 객체 대신 id 만 가져온다
     admin_users = (
-        await db.execute(
-            select(User).where(User.role.in_([RoleEnum.leader, RoleEnum.admin]))
+        await db.scalars(
+            select(User.id).where(User.role.in_([RoleEnum.leader, RoleEnum.admin]))
         )
-    ).scalars().all()
+    ).all()
     member_users = (
-        await db.execute(select(User).where(User.role == RoleEnum.member))
-    ).scalars().all()
+        await db.scalars(select(User.id).where(User.role == RoleEnum.member))
+    ).all()
 
     selected_admins = random.sample(admin_users, min(admin_count, len(admin_users)))
     selected_members = random.sample(member_users, min(member_count, len(member_users)))
 
     selected = selected_admins + selected_members
 
-    for user in selected:
-        part = random.choice([PartEnum.FIRST, PartEnum.SECOND])
-        attendance = Attendance(
-            group_id=group_id,
-            user_id=user.id,
-            part=part,
-            status=AttendanceStatus.attending,
-        )
-        db.add(attendance)
-        user.attendance_count = (user.attendance_count or 0) + 1
-        if not user.last_attended or group.date > user.last_attended.date():
-            user.last_attended = group.date
+    await apply_attendance_changes(
+        db,
+        [
+            AttendanceChange(
+                group_id,
+                user_id,
+                random.choice([PartEnum.FIRST, PartEnum.SECOND]),
+                AttendanceStatus.attending,
+            )
+            for user_id in selected
+        ],
+    )
 
     await db.commit()
     print(
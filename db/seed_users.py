@@ -1,5 +1,6 @@
 import asyncio
 import random
+from core.security import hash_password
 from db.session import AsyncSessionLocal
 from models.user import User, GenderEnum, RoleEnum
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -21,15 +22,21 @@ def random_interest():
 def random_gender():
     return random.choice([GenderEnum.male, GenderEnum.female])
 
-def generate_unique_name(gender: GenderEnum, existing_names: set) -> str:
-    while True:
-        last = random.choice(KOREAN_LAST_NAMES)
-        first = random.choice(MALE_FIRST_NAMES if gender == GenderEnum.male else FEMALE_FIRST_NAMES)
-        name = last + first
+def generate_unique_name(gender: GenderEnum, existing_names: set, max_attempts: int = 20) -> str:
+    # 성 15 × 이름 15 조합이 소진되면 무한 반복하지 않도록 숫자를 붙인다
+    first_names = MALE_FIRST_NAMES if gender == GenderEnum.male else FEMALE_FIRST_NAMES
+    for _ in range(max_attempts):
+        name = random.choice(KOREAN_LAST_NAMES) + random.choice(first_names)
         if name not in existing_names:
             existing_names.add(name)
             return name
 
+    suffix = 2
+    while f"{name}{suffix}" in existing_names:
+        suffix += 1
+    existing_names.add(f"{name}{suffix}")
+    return f"{name}{suffix}"
+
 async def seed_users(db: AsyncSession):
     users = []
     existing_names = set()
@@ -39,7 +46,7 @@ async def seed_users(db: AsyncSession):
     users.append(User(
         username=leader_name,
         email="leader@example.com",
-        password="leaderpass",
+        password=hash_password("leaderpass"),
         role=RoleEnum.leader,
         gender=GenderEnum.male,
         interests=random_interest()
@@ -52,7 +59,7 @@ async def seed_users(db: AsyncSession):
         users.append(User(
             username=name,
             email=f"admin{i+1}@example.com",
-            password="adminpass",
+            password=hash_password("adminpass"),
             role=RoleEnum.admin,
             gender=gender,
             interests=random_interest()
@@ -65,7 +72,7 @@ async def seed_users(db: AsyncSession):
         users.append(User(
             username=name,
             email=f"user{i+1}@example.com",
-            password="userpass",
+            password=hash_password("userpass"),
             role=RoleEnum.member,
             gender=gender,
             interests=random_interest()
@@ -1,11 +1,218 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+import asyncio
+import random
+from dataclasses import replace
+from typing import Awaitable, Callable, TypeVar
+from urllib.parse import quote
+
+from sqlalchemy import event
+from fastapi import Request
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
-DATABASE_URL = "sqlite+aiosqlite:///./app.db"
+from core.config import Settings, get_settings
+from db.instrumentation import TimedQueuePool, instrument_engine
+
+T = TypeVar("T")
+
+settings = get_settings()
+DATABASE_URL = settings.database_url
+
+
+def _sqlite_pragmas(settings: Settings, read_only: bool = False) -> list[str]:
+    if read_only:
+        # 읽기 전용 연결은 저널 모드를 바꿀 수 없고, 실수로라도 쓰지 않게 막는다
+        head = ["PRAGMA query_only=ON"]
+    else:
+        head = [
+            f"PRAGMA journal_mode={settings.sqlite_journal_mode}",
+            f"PRAGMA synchronous={settings.sqlite_synchronous}",
+        ]
+    return head + [
+        f"PRAGMA busy_timeout={settings.sqlite_busy_timeout_ms}",
+        f"PRAGMA mmap_size={settings.sqlite_mmap_size}",
+        f"PRAGMA cache_size={settings.sqlite_cache_size}",
+    ]
+
+
+def read_only_url(settings: Settings) -> str | None:
+    """URL of the read-only engine, or ``None`` when reads share the main engine.
+
+    ``DATABASE_READ_URL`` (e.g. a PostgreSQL replica) wins.  A SQLite file
+    is opened a second time as a ``mode=ro`` URI; in-memory databases and
+    other backends without a replica keep using the main engine.
+    """
+    if settings.database_read_url:
+        return settings.database_read_url
+    url = make_url(settings.database_url)
+    if url.get_backend_name() != "sqlite" or url.database in (None, "", ":memory:"):
+        return None
+    if url.database.startswith("file:"):
+        return None  # 이미 URI 로 지정된 파일은 옵션을 그대로 존중한다
+    read_url = url.set(
+        database=f"file:{quote(url.database)}",
+        query={**url.query, "mode": "ro", "uri": "true"},
+    )
+    return read_url.render_as_string(hide_password=False)
+
+
+def create_engine_from_settings(settings: Settings, read_only: bool = False) -> AsyncEngine:
+    """Build the async engine described by ``settings``.
+
+    SQLite connections get the configured pragmas (WAL, ``synchronous``,
+    ``busy_timeout``, ``mmap_size``, ``cache_size``) as soon as they are
+    opened; with ``read_only`` the journal pragmas are skipped and
+    ``query_only`` is switched on instead.  Other backends such as
+    PostgreSQL via ``asyncpg`` only get the pool settings.  Every engine is
+    instrumented for the ``/metrics`` endpoint (statement counts/timings
+    and pool checkout waits).
+    """
+    url = make_url(settings.database_url)
+    is_sqlite = url.get_backend_name() == "sqlite"
+    in_memory = is_sqlite and url.database in (None, "", ":memory:")
+
+    kwargs = {"echo": settings.db_echo}
+    if not in_memory:
+        kwargs.update(
+            poolclass=TimedQueuePool,
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+            pool_recycle=settings.db_pool_recycle,
+        )
+    if not is_sqlite:
+        kwargs["pool_pre_ping"] = True
+    else:
+        # sqlite3 의 자체 대기 시간도 busy_timeout 과 맞춘다
+        kwargs["connect_args"] = {"timeout": settings.sqlite_busy_timeout_ms / 1000}
+
+    new_engine = create_async_engine(url, **kwargs)
+    instrument_engine(new_engine)
+
+    if is_sqlite:
+        pragmas = _sqlite_pragmas(settings, read_only)
+
+        @event.listens_for(new_engine.sync_engine, "connect")
+        def _set_sqlite_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            for pragma in pragmas:
+                cursor.execute(pragma)
+            cursor.close()
+
+    return new_engine
+
+
+def create_writer_engine(settings: Settings) -> AsyncEngine:
+    """Build the single-connection engine used by the write coordinator.
+
+    pysqlite only emits ``BEGIN`` right before the first DML statement and
+    does not handle ``SAVEPOINT`` correctly, so for SQLite the driver's
+    transaction handling is switched off and every transaction starts with
+    ``BEGIN IMMEDIATE`` instead: the writer holds the write lock for the
+    whole batch and each write can run in its own savepoint.
+    """
+    new_engine = create_engine_from_settings(replace(settings, db_pool_size=1, db_max_overflow=0))
+
+    if new_engine.dialect.name == "sqlite":
+
+        @event.listens_for(new_engine.sync_engine, "connect")
+        def _disable_implicit_begin(dbapi_connection, connection_record):
+            dbapi_connection.isolation_level = None
 
-engine = create_async_engine(DATABASE_URL, echo=True)
+        @event.listens_for(new_engine.sync_engine, "begin")
+        def _begin_immediate(conn):
+            conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+    return new_engine
+
+
+def create_read_engine(settings: Settings, main_engine: AsyncEngine) -> AsyncEngine:
+    """Engine for read-only requests; ``main_engine`` when there is no separate one."""
+    url = read_only_url(settings)
+    if url is None:
+        return main_engine
+    return create_engine_from_settings(replace(settings, database_url=url), read_only=True)
+
+
+engine = create_engine_from_settings(settings)
 AsyncSessionLocal = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
-async def get_db():
-    async with AsyncSessionLocal() as session:
-        yield session
\ No newline at end of file
+# GET 요청은 별도의 읽기 전용 커넥션 풀을 써서 쓰기 요청과 커넥션을 나눠 쓰지 않는다
+read_engine = create_read_engine(settings, engine)
+ReadSessionLocal = sessionmaker(read_engine, class_=AsyncSession, expire_on_commit=False)
+
+READ_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+async def get_db(request: Request):
+    """Session for the request: read-only for ``GET``/``HEAD``, read-write otherwise."""
+    factory = ReadSessionLocal if request.method in READ_METHODS else AsyncSessionLocal
+    async with factory() as session:
+        yield session
+
+
+async def get_cacheable_db():
+    """Session for endpoints whose responses go into the response cache.
+
+    A replica in ``DATABASE_READ_URL`` may lag behind the primary: a read
+    right after a write's cache invalidation could return pre-write rows
+    and cache them under the new generation for the whole TTL.  With a
+    replica these endpoints therefore read from the primary.  The
+    read-only SQLite connection sees every commit and is used as is.
+    """
+    factory = AsyncSessionLocal if settings.database_read_url else ReadSessionLocal
+    async with factory() as session:
+        yield session
+
+
+async def dispose_engines() -> None:
+    """Close the pooled connections of the read-write and read-only engines."""
+    await engine.dispose()
+    if read_engine is not engine:
+        await read_engine.dispose()
+
+
+def is_lock_error(exc: BaseException) -> bool:
+    """Whether ``exc`` is SQLite giving up on a lock (``database is locked``)."""
+    return isinstance(exc, OperationalError) and "database is locked" in str(exc.orig)
+
+
+def lock_retry_delay(attempt: int, base_delay: float) -> float:
+    """Exponential backoff with jitter before retry number ``attempt + 1``."""
+    return base_delay * 2**attempt * (0.5 + random.random())
+
+
+async def retry_on_lock(
+    db: AsyncSession,
+    operation: Callable[[], Awaitable[T]],
+    attempts: int | None = None,
+    base_delay: float = 0.05,
+) -> T:
+    """Run ``operation`` (which commits) and retry it when SQLite is locked.
+
+    ``busy_timeout`` already makes writers wait for each other; this covers
+    the cases where the wait runs out or SQLite refuses to wait at all.  The
+    session is rolled back before each retry, so ``operation`` must redo all
+    of its reads and writes.  Delays grow exponentially with jitter.
+
+    Parameters
+    ----------
+    db: AsyncSession
+        Session used by ``operation``.
+    operation: callable
+        Coroutine function performing the whole transaction.
+    attempts: int, optional
+        Total number of tries, ``settings.db_lock_retries + 1`` by default.
+    base_delay: float
+        Delay before the first retry in seconds.
+    """
+    attempts = attempts or settings.db_lock_retries + 1
+    for attempt in range(attempts):
+        try:
+            return await operation()
+        except OperationalError as exc:
+            await db.rollback()
+            if not is_lock_error(exc) or attempt == attempts - 1:
+                raise
+        await asyncio.sleep(lock_retry_delay(attempt, base_delay))
@@ -0,0 +1,210 @@
+import asyncio
+import contextvars
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from core.config import Settings
+from core.metrics import RequestContext, current_request
+from db.session import create_writer_engine, is_lock_error, lock_retry_delay, retry_on_lock, settings
+
+T = TypeVar("T")
+WriteOperation = Callable[[AsyncSession], Awaitable[T]]
+
+
+@dataclass
+class _Write:
+    operation: WriteOperation
+    future: asyncio.Future
+    request: RequestContext | None
+
+
+class WriteCoordinator:
+    """Run every write on one writer task and commit them in batches.
+
+    Writes submitted while the writer is busy, or within ``window`` seconds
+    of the first write of a batch, share one transaction (group commit), so
+    concurrent requests no longer compete for the SQLite write lock and the
+    cost of a commit is paid once per batch.  Each write runs in its own
+    savepoint: a write that raises only rolls back its own changes and its
+    caller receives the exception, while the rest of the batch commits.
+    Callers are resolved only after the batch has been committed; if the
+    commit itself fails every caller in the batch receives that error.
+    Lock errors retry the whole batch with backoff, like
+    :func:`db.session.retry_on_lock`.
+
+    Parameters
+    ----------
+    session_factory: sessionmaker
+        Produces sessions on the writer engine (see
+        :func:`db.session.create_writer_engine`).
+    window: float
+        Seconds to wait for more writes before committing a batch.
+    max_batch: int
+        Most writes committed in one transaction.
+    attempts: int
+        Total number of tries of a batch that hits ``database is locked``.
+    """
+
+    def __init__(
+        self,
+        session_factory: sessionmaker,
+        window: float = 0.002,
+        max_batch: int = 64,
+        attempts: int = 6,
+        base_delay: float = 0.05,
+    ):
+        self.session_factory = session_factory
+        self.window = window
+        self.max_batch = max_batch
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.batches = 0
+        self.writes = 0
+        self._queue: asyncio.Queue[_Write] | None = None
+        self._task: asyncio.Task | None = None
+        self._closing = False
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "WriteCoordinator":
+        engine = create_writer_engine(settings)
+        return cls(
+            sessionmaker(engine, class_=AsyncSession, expire_on_commit=False),
+            window=settings.write_batch_window_ms / 1000,
+            max_batch=settings.write_batch_max,
+            attempts=settings.db_lock_retries + 1,
+        )
+
+    async def submit(self, operation: WriteOperation[T]) -> T:
+        """Queue ``operation`` and wait until its batch is committed.
+
+        ``operation`` receives the batch's session and must not commit or
+        roll back; its return value is handed back to the caller.
+        """
+        if self._closing:
+            raise RuntimeError("write coordinator is shutting down")
+        queue = self._ensure_started()
+        future = asyncio.get_running_loop().create_future()
+        queue.put_nowait(_Write(operation, future, current_request.get()))
+        return await future
+
+    def _ensure_started(self) -> asyncio.Queue:
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._task.get_loop() is not loop:
+            self._queue = asyncio.Queue()
+            # 첫 요청의 contextvar 를 물려받지 않도록 빈 컨텍스트에서 실행한다
+            self._task = loop.create_task(self._run(self._queue), context=contextvars.Context())
+        return self._queue
+
+    async def close(self) -> None:
+        """Commit the writes already queued, then stop the writer task.
+
+        New writes are refused while closing.  The writer's connection is
+        closed afterwards; a later :meth:`submit` starts a new writer.
+        """
+        self._closing = True
+        try:
+            if self._task is not None and not self._task.done():
+                if self._task.get_loop() is asyncio.get_running_loop():
+                    await self._queue.join()  # 대기 중인 쓰기를 모두 커밋할 때까지 기다린다
+                self._task.cancel()
+                try:
+                    await self._task
+                except asyncio.CancelledError:
+                    pass
+            while self._queue is not None and not self._queue.empty():
+                self._queue.get_nowait().future.cancel()
+            self._task = self._queue = None
+            await self.session_factory.kw["bind"].dispose()
+        finally:
+            self._closing = False
+
+    async def _run(self, queue: asyncio.Queue) -> None:
+        while True:
+            batch = [await queue.get()]
+            if self.window > 0:
+                await asyncio.sleep(self.window)  # 그 사이에 들어온 쓰기를 함께 커밋한다
+            while len(batch) < self.max_batch and not queue.empty():
+                batch.append(queue.get_nowait())
+            try:
+                await self._commit_batch(batch)
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    async def _commit_batch(self, batch: list[_Write]) -> None:
+        # 기다리던 요청이 이미 취소된 쓰기는 실행하지 않는다
+        pending = [write for write in batch if not write.future.done()]
+        if not pending:
+            return
+        for attempt in range(self.attempts):
+            try:
+                outcomes = await self._execute(pending)
+            except Exception as exc:
+                if is_lock_error(exc) and attempt < self.attempts - 1:
+                    await asyncio.sleep(lock_retry_delay(attempt, self.base_delay))
+                    continue
+                for write in pending:
+                    _resolve(write.future, error=exc)
+                return
+            self.batches += 1
+            self.writes += len(pending)
+            for write, (error, result) in zip(pending, outcomes):
+                if error is None:
+                    _resolve(write.future, result=result)
+                else:
+                    _resolve(write.future, error=error)
+            return
+
+    async def _execute(self, pending: list[_Write]) -> list[tuple[Exception | None, Any]]:
+        """Run the batch in one transaction; returns ``(error, result)`` per write."""
+        outcomes: list[tuple[Exception | None, Any]] = []
+        async with self.session_factory() as db:
+            for write in pending:
+                token = current_request.set(write.request)
+                try:
+                    async with db.begin_nested():
+                        outcomes.append((None, await write.operation(db)))
+                except Exception as exc:
+                    if is_lock_error(exc):
+                        raise  # 배치 전체를 다시 시도한다
+                    outcomes.append((exc, None))
+                finally:
+                    current_request.reset(token)
+            await db.commit()
+        return outcomes
+
+
+def _resolve(future: asyncio.Future, result: Any = None, error: Exception | None = None) -> None:
+    if future.done():
+        return  # 요청이 이미 취소됐다
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+
+
+write_coordinator: WriteCoordinator | None = (
+    WriteCoordinator.from_settings(settings) if settings.write_coordinator else None
+)
+
+
+async def run_write(db: AsyncSession, operation: WriteOperation[T]) -> T:
+    """Run one write transaction and return ``operation``'s result.
+
+    With ``WRITE_COORDINATOR`` enabled the write is batched by the
+    :class:`WriteCoordinator`; otherwise ``operation`` runs on ``db``, is
+    committed and is retried when SQLite is locked.  Either way
+    ``operation`` must not commit itself.
+    """
+    if write_coordinator is not None:
+        return await write_coordinator.submit(operation)
+
+    async def transaction():
+        result = await operation(db)
+        await db.commit()
+        return result
+
+    return await retry_on_lock(db, transaction)
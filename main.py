@@ -1,35 +1,78 @@
-import os
+from contextlib import asynccontextmanager
+from pathlib import Path
 
-from fastapi import FastAPI
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi import FastAPI, Request
+from fastapi.responses import PlainTextResponse
 
+from core.assets import AssetManifest
+from core.config import get_settings
 from core.logging_setup import setup_logging
-from core.middleware import LoggingMiddleware
+from core.metrics import coalescing_metrics, render_prometheus, request_metrics
+from core.middleware import CompressionMiddleware, LoggingMiddleware
 
 from api.v1.router import api_router
+from db import write_queue
+from db.session import dispose_engines
 
 setup_logging()
 
-app = FastAPI()
+settings = get_settings()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # 종료할 때 대기 중인 쓰기를 마저 커밋하고 전용 쓰기 커넥션을 닫는다
+    if write_queue.write_coordinator is not None:
+        await write_queue.write_coordinator.close()
+    # 쓰기가 끝난 뒤 읽기/쓰기 커넥션 풀을 닫는다
+    await dispose_engines()
+
+
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.gzip_minimum_size,
+    compresslevel=settings.gzip_level,
+)
 app.add_middleware(LoggingMiddleware)
 app.include_router(api_router, prefix="/api/v1")
 
-static_dir = os.path.join(os.path.dirname(__file__), "static")
-
-# static 폴더 mount
-app.mount("/static", StaticFiles(directory=static_dir), name="static")
+# 시작할 때 한 번 static 파일을 읽어 해시 URL 과 gzip/brotli 압축본을 만든다
+static_dir = Path(__file__).resolve().parent / "static"
+assets = AssetManifest(static_dir, prefix="/static")
+app.mount("/static", assets, name="static")
 
 # index.html 라우팅
 @app.get("/")
-def read_index():
-    return FileResponse(os.path.join(static_dir, "index.html"))
+def read_index(request: Request):
+    return assets.page(request, "index.html")
+
+
+@app.get("/metrics/latency")
+def latency_metrics():
+    # 라우트별 응답 시간 히스토그램
+    return request_metrics.snapshot()
+
+
+@app.get("/metrics/coalescing")
+def coalescing_snapshot():
+    # 라우트별로 동시에 들어온 같은 요청이 진행 중인 계산에 합류한 횟수
+    return coalescing_metrics.snapshot()
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def prometheus_metrics():
+    # 요청 지연, 요청당 쿼리 수, 커넥션 대기, 느린 쿼리 (Prometheus 형식)
+    return PlainTextResponse(
+        render_prometheus(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
 
 
 @app.get("/admin")
-def admin_page():
-    return FileResponse(os.path.join("static", "admin.html"))
+def admin_page(request: Request):
+    return assets.page(request, "admin.html")
 
 @app.get("/login")
-def login_page():
-    return FileResponse("static/login.html")
\ No newline at end of file
+def login_page(request: Request):
+    return assets.page(request, "login.html")
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, Enum, UniqueConstraint
+from sqlalchemy import Column, Date, Integer, ForeignKey, Enum, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 from models.base import Base
 from models.group import PartEnum  # ✅ 1부/2부를 위한 열거형 불러오기
@@ -28,7 +28,22 @@ class Attendance(Base):
 
     __table_args__ = (
         UniqueConstraint("group_id", "user_id", "part", name="_group_user_part_uc"),  # ✅ 동일 모임-유저-부 중복 방지
+        Index("ix_attendance_user_status", "user_id", "status"),  # 유저별 참석 기록 조회 (통계/참석일 계산)
+        Index("ix_attendance_group_status_part", "group_id", "status", "part"),  # 모임별 참석자 집계/조 편성
     )
 
     user = relationship("User")
-    group = relationship("Group")
\ No newline at end of file
+    group = relationship("Group")
+
+class UserAttendanceStats(Base):
+    """유저별 출석 통계 (출석 변경 시 증분 갱신, ``db/rebuild_stats.py`` 로 재계산)."""
+
+    __tablename__ = "user_attendance_stats"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    attended_dates = Column(Integer, nullable=False, default=0)  # 참석한 날짜 수 (중복 날짜 제외)
+    last_attended = Column(Date)
+    first_part_count = Column(Integer, nullable=False, default=0)
+    second_part_count = Column(Integer, nullable=False, default=0)
+
+    user = relationship("User")
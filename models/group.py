@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, Date, ForeignKey, Enum, Boolean, UniqueConstraint
+from sqlalchemy import Column, Integer, Date, ForeignKey, Enum, Boolean, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.declarative import declarative_base
 import enum
@@ -28,6 +28,11 @@ class Team(Base):
         ),
         nullable=False,
     )  # 1부 / 2부
+
+    __table_args__ = (
+        Index("ix_teams_group_part", "group_id", "part"),  # 모임/부별 조 조회 및 재편성 시 삭제
+    )
+
     group = relationship("Group", back_populates="teams")
     members = relationship("TeamUser", back_populates="team", cascade="all, delete-orphan")
 
@@ -51,7 +56,42 @@ class TeamUser(Base):
     __table_args__ = (
         # 한 유저가 같은 부에서 두 개 이상의 팀에 속할 수 없도록 제한
         UniqueConstraint("group_id", "part", "user_id", name="_group_part_user_uc"),
+        Index("ix_team_users_team", "team_id"),  # 조별 멤버 조회
+        Index("ix_team_users_user_group", "user_id", "group_id"),  # 내 조 조회
     )
 
     team = relationship("Team", back_populates="members")
-    user = relationship("User")
\ No newline at end of file
+    user = relationship("User")
+
+class TeamPair(Base):
+    """같은 조에 배정된 유저 쌍 (조 편성 때마다 해당 모임/부 분만 다시 기록).
+
+    ``user_a_id < user_b_id`` 로 저장하며, 최근 N개 모임의 쌍 횟수를 합쳐
+    같은 사람끼리 반복해서 만나지 않도록 조를 짤 때 사용한다.
+    """
+    __tablename__ = "team_pairs"
+    group_id = Column(Integer, ForeignKey("groups.id"), primary_key=True)
+    part = Column(
+        Enum(
+            PartEnum,
+            values_callable=lambda x: [e.value for e in x],
+            native_enum=False,
+        ),
+        primary_key=True,
+    )
+    user_a_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    user_b_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+
+    __table_args__ = (
+        Index("ix_team_pairs_user_a_group", "user_a_id", "group_id"),  # 참석자 기준 이력 조회
+    )
+
+class GroupVersion(Base):
+    """모임별 변경 번호 (참석 인원이나 조 편성이 바뀔 때마다 같은 트랜잭션에서 1씩 증가).
+
+    실시간 알림과 ``/me/dashboard`` 에 함께 실어 보내, 클라이언트가 이미 받은
+    스냅샷에 포함된 이벤트는 버리고 놓친 이벤트가 있으면 다시 불러오게 한다.
+    """
+    __tablename__ = "group_versions"
+    group_id = Column(Integer, ForeignKey("groups.id"), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
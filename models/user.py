@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Enum, Boolean, ForeignKey, DateTime, func
+from sqlalchemy import Column, Integer, String, Enum, Boolean, ForeignKey, DateTime, Index, func
 from sqlalchemy.orm import relationship
 from models.base import Base
 import enum
@@ -38,6 +38,10 @@ class User(Base):
         backref="hated_by"
     )
 
+    __table_args__ = (
+        Index("ix_users_created_at_id", "created_at", "id"),  # 유저 목록 keyset 페이지네이션
+    )
+
 
 class HateList(Base):
     __tablename__ = "hate_list"
@@ -0,0 +1,390 @@
+from datetime import date
+from typing import Iterable, NamedTuple
+
+from sqlalchemy import Boolean, Date, bindparam, case, delete, func, insert, or_, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.attendance import Attendance, AttendanceStatus, UserAttendanceStats
+from models.group import Group, GroupVersion, PartEnum
+from models.user import RoleEnum, User
+
+
+class AttendanceChange(NamedTuple):
+    group_id: int
+    user_id: int
+    part: PartEnum
+    status: AttendanceStatus
+
+
+class AppliedChange(NamedTuple):
+    """실제로 상태가 바뀐 출석 변경 (이전 상태와 유저 역할 포함)."""
+
+    group_id: int
+    user_id: int
+    part: PartEnum
+    previous: AttendanceStatus | None
+    status: AttendanceStatus
+    role: RoleEnum
+
+
+class MissingEntityError(LookupError):
+    """변경 대상 유저 또는 모임이 존재하지 않을 때 발생한다."""
+
+
+_DIALECT_INSERTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
+
+_attendance = Attendance.__table__
+_update_attendance_status = (
+    update(_attendance)
+    .where(
+        _attendance.c.group_id == bindparam("key_group_id"),
+        _attendance.c.user_id == bindparam("key_user_id"),
+        _attendance.c.part == bindparam("key_part"),
+    )
+    .values(status=bindparam("new_status"))
+)
+
+
+async def upsert_attendance(db: AsyncSession, rows: Iterable[dict]) -> None:
+    """출석 기록을 쓰고, (모임, 유저, 부)가 이미 있으면 상태만 덮어쓴다.
+
+    SQLite/PostgreSQL 은 ``INSERT ... ON CONFLICT DO UPDATE`` 한 번으로 쓰고,
+    ON CONFLICT 를 모르는 DB 는 기존 키를 조회해 UPDATE 와 INSERT 로 나눠 쓴다.
+    같은 키가 여러 번 들어오면 마지막 값만 반영한다.
+    """
+    latest = {(row["group_id"], row["user_id"], row["part"]): row for row in rows}
+    if not latest:
+        return
+    rows = list(latest.values())
+
+    dialect_insert = _DIALECT_INSERTS.get(db.bind.dialect.name)
+    if dialect_insert is not None:
+        stmt = dialect_insert(Attendance)
+        await db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["group_id", "user_id", "part"],
+                set_={"status": stmt.excluded.status},
+            ),
+            rows,
+        )
+        return
+
+    existing = set(
+        (
+            await db.execute(
+                select(Attendance.group_id, Attendance.user_id, Attendance.part).where(
+                    Attendance.group_id.in_({group_id for group_id, _, _ in latest}),
+                    Attendance.user_id.in_({user_id for _, user_id, _ in latest}),
+                )
+            )
+        ).tuples()
+    )
+    updates = [row for key, row in latest.items() if key in existing]
+    inserts = [row for key, row in latest.items() if key not in existing]
+    if updates:
+        await db.execute(
+            _update_attendance_status,
+            [
+                {
+                    "key_group_id": row["group_id"],
+                    "key_user_id": row["user_id"],
+                    "key_part": row["part"],
+                    "new_status": row["status"],
+                }
+                for row in updates
+            ],
+        )
+    if inserts:
+        await db.execute(insert(Attendance), inserts)
+
+
+# 통계 증감은 SQL 에서 더하므로 동시에 실행돼도 값을 덮어쓰지 않는다
+_stats = UserAttendanceStats.__table__
+_apply_stats_delta = (
+    update(_stats)
+    .where(_stats.c.user_id == bindparam("uid"))
+    .values(
+        attended_dates=_stats.c.attended_dates + bindparam("dates_delta"),
+        first_part_count=_stats.c.first_part_count + bindparam("first_delta"),
+        second_part_count=_stats.c.second_part_count + bindparam("second_delta"),
+        last_attended=case(
+            # 최근 참석일이 취소된 경우에만 해당 유저의 최신 참석일을 다시 조회
+            (
+                bindparam("recompute_last", type_=Boolean),
+                select(func.max(Group.date))
+                .join(Attendance, Attendance.group_id == Group.id)
+                .where(
+                    Attendance.user_id == _stats.c.user_id,
+                    Attendance.status == AttendanceStatus.attending,
+                )
+                .scalar_subquery(),
+            ),
+            (
+                or_(
+                    _stats.c.last_attended.is_(None),
+                    _stats.c.last_attended < bindparam("gained_last", type_=Date),
+                ),
+                func.coalesce(bindparam("gained_last", type_=Date), _stats.c.last_attended),
+            ),
+            else_=_stats.c.last_attended,
+        ),
+    )
+)
+
+
+async def _create_missing_stats(db: AsyncSession, user_ids: set[int]) -> set[int]:
+    """통계 행이 없는 유저에게 빈 행을 만들고, 새로 만든 유저 id 를 돌려준다."""
+    dialect_insert = _DIALECT_INSERTS.get(db.bind.dialect.name)
+    if dialect_insert is None:
+        # ON CONFLICT 를 모르는 DB 는 없는 행만 골라 넣는다
+        existing = set(
+            (
+                await db.scalars(
+                    select(UserAttendanceStats.user_id).where(UserAttendanceStats.user_id.in_(user_ids))
+                )
+            ).all()
+        )
+        missing = sorted(user_ids - existing)
+        if missing:
+            await db.execute(insert(UserAttendanceStats), [{"user_id": user_id} for user_id in missing])
+        return set(missing)
+
+    return set(
+        (
+            await db.execute(
+                dialect_insert(UserAttendanceStats)
+                .values([{"user_id": user_id} for user_id in sorted(user_ids)])
+                .on_conflict_do_nothing(index_elements=["user_id"])
+                .returning(UserAttendanceStats.user_id)
+            )
+        ).scalars()
+    )
+
+
+async def bump_group_versions(db: AsyncSession, group_ids: Iterable[int]) -> dict[int, int]:
+    """모임별 변경 번호를 1씩 올리고 새 번호를 돌려준다 (쓰기 트랜잭션 안에서 호출)."""
+    group_ids = sorted(set(group_ids))
+    if not group_ids:
+        return {}
+    dialect_insert = _DIALECT_INSERTS.get(db.bind.dialect.name)
+    if dialect_insert is None:
+        existing = set(
+            (await db.scalars(select(GroupVersion.group_id).where(GroupVersion.group_id.in_(group_ids)))).all()
+        )
+        missing = [group_id for group_id in group_ids if group_id not in existing]
+        if missing:
+            await db.execute(insert(GroupVersion), [{"group_id": group_id, "version": 0} for group_id in missing])
+        await db.execute(
+            update(GroupVersion)
+            .where(GroupVersion.group_id.in_(group_ids))
+            .values(version=GroupVersion.version + 1)
+        )
+        return dict(
+            (
+                await db.execute(
+                    select(GroupVersion.group_id, GroupVersion.version).where(GroupVersion.group_id.in_(group_ids))
+                )
+            ).all()
+        )
+
+    stmt = dialect_insert(GroupVersion).values([{"group_id": group_id, "version": 1} for group_id in group_ids])
+    return dict(
+        (
+            await db.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=["group_id"], set_={"version": GroupVersion.version + 1}
+                ).returning(GroupVersion.group_id, GroupVersion.version)
+            )
+        ).all()
+    )
+
+
+async def _lock_user_stats(db: AsyncSession, user_ids: set[int]) -> None:
+    """변경할 유저들의 통계 행을 잠근다.
+
+    첫 문장이 쓰기이므로 SQLite 는 여기서 쓰기 잠금을 잡고(다른 쓰기는
+    ``busy_timeout`` 동안 대기), 이후 읽기는 최신 상태를 본다. PostgreSQL 은
+    ``FOR UPDATE`` 로 같은 유저에 대한 트랜잭션을 직렬화한다.
+    통계 행이 없던 유저(통계 도입 전 데이터)는 출석 기록에서 새로 계산한다.
+    """
+    created = await _create_missing_stats(db, user_ids)
+    await db.execute(
+        select(UserAttendanceStats.user_id)
+        .where(UserAttendanceStats.user_id.in_(user_ids))
+        .order_by(UserAttendanceStats.user_id)
+        .with_for_update()
+    )
+    if created:
+        await rebuild_attendance_stats(db, created)
+
+
+async def apply_attendance_changes(
+    db: AsyncSession, changes: Iterable[AttendanceChange]
+) -> list[AppliedChange]:
+    """출석 변경 목록을 한 트랜잭션 안에서 적용한다.
+
+    관련 유저의 통계 행을 먼저 잠근 뒤 기존 출석 기록을 한 번에 읽고,
+    변경 전후 상태를 비교한 차이만큼 ``user_attendance_stats`` 를 SQL 에서
+    증감한다. 출석 기록은 upsert 로 쓰므로 동시에 들어온 같은 요청도
+    유니크 제약에 걸리지 않는다. 커밋은 호출하는 쪽에서 하며, 잠금 대기가
+    끝내 실패하면 :func:`db.session.retry_on_lock` 으로 다시 시도한다.
+    실제로 상태가 바뀐 변경 목록을 돌려준다.
+    """
+    # 같은 (모임, 유저, 부)에 대한 변경은 마지막 것만 반영
+    latest: dict[tuple[int, int, PartEnum], AttendanceStatus] = {}
+    for change in changes:
+        latest[(change.group_id, change.user_id, change.part)] = change.status
+    if not latest:
+        return []
+
+    group_ids = {group_id for group_id, _, _ in latest}
+    user_ids = {user_id for _, user_id, _ in latest}
+
+    roles = dict((await db.execute(select(User.id, User.role).where(User.id.in_(user_ids)))).all())
+    group_dates = dict(
+        (await db.execute(select(Group.id, Group.date).where(Group.id.in_(group_ids)))).all()
+    )
+    if roles.keys() != user_ids or group_dates.keys() != group_ids:
+        raise MissingEntityError()
+
+    await _lock_user_stats(db, user_ids)
+
+    # 같은 날짜의 다른 모임 기록까지 포함해 관련 출석 기록을 일괄 조회
+    statuses: dict[tuple[int, int, PartEnum], AttendanceStatus] = {}
+    record_dates: dict[int, date] = dict(group_dates)
+    for group_id, user_id, part, status, group_date in (
+        await db.execute(
+            select(Attendance.group_id, Attendance.user_id, Attendance.part, Attendance.status, Group.date)
+            .join(Group, Attendance.group_id == Group.id)
+            .where(
+                Attendance.user_id.in_(user_ids),
+                Group.date.in_(set(group_dates.values())),
+            )
+        )
+    ).all():
+        statuses[(group_id, user_id, part)] = status
+        record_dates[group_id] = group_date
+
+    def attended_dates() -> set[tuple[int, date]]:
+        return {
+            (user_id, record_dates[group_id])
+            for (group_id, user_id, _), status in statuses.items()
+            if status == AttendanceStatus.attending
+        }
+
+    before = attended_dates()
+    part_deltas: dict[tuple[int, PartEnum], int] = {}
+    applied: list[AppliedChange] = []
+    for key, status in latest.items():
+        previous = statuses.get(key)
+        if previous == status:
+            continue
+        group_id, user_id, part = key
+        statuses[key] = status
+        applied.append(AppliedChange(group_id, user_id, part, previous, status, roles[user_id]))
+        delta = (status == AttendanceStatus.attending) - (previous == AttendanceStatus.attending)
+        if delta:
+            part_deltas[(user_id, part)] = part_deltas.get((user_id, part), 0) + delta
+    after = attended_dates()
+
+    if applied:
+        await upsert_attendance(
+            db,
+            [
+                {"group_id": c.group_id, "user_id": c.user_id, "part": c.part, "status": c.status}
+                for c in applied
+            ],
+        )
+    gained, lost = after - before, before - after
+    if part_deltas or gained or lost:
+        await _apply_stats_deltas(db, part_deltas, gained, lost)
+    return applied
+
+
+async def _apply_stats_deltas(
+    db: AsyncSession,
+    part_deltas: dict[tuple[int, PartEnum], int],
+    gained: set[tuple[int, date]],
+    lost: set[tuple[int, date]],
+) -> None:
+    """변경으로 생긴 차이만큼 통계 행을 갱신한다."""
+    affected = {user_id for user_id, _ in part_deltas} | {
+        user_id for user_id, _ in gained | lost
+    }
+    params = []
+    for user_id in sorted(affected):
+        gained_dates = [d for u, d in gained if u == user_id]
+        lost_dates = [d for u, d in lost if u == user_id]
+        params.append({
+            "uid": user_id,
+            "dates_delta": len(gained_dates) - len(lost_dates),
+            "first_delta": part_deltas.get((user_id, PartEnum.FIRST), 0),
+            "second_delta": part_deltas.get((user_id, PartEnum.SECOND), 0),
+            "recompute_last": bool(lost_dates),
+            "gained_last": max(gained_dates, default=None),
+        })
+    await db.execute(_apply_stats_delta, params)
+
+    # users 테이블의 기존 컬럼도 통계와 동일하게 유지
+    await db.execute(
+        _sync_user_columns().where(User.id.in_(affected)).execution_options(synchronize_session=False)
+    )
+
+
+def _sync_user_columns():
+    return update(User).values(
+        attendance_count=select(UserAttendanceStats.attended_dates)
+        .where(UserAttendanceStats.user_id == User.id)
+        .scalar_subquery(),
+        last_attended=select(UserAttendanceStats.last_attended)
+        .where(UserAttendanceStats.user_id == User.id)
+        .scalar_subquery(),
+    )
+
+
+async def rebuild_attendance_stats(
+    db: AsyncSession, user_ids: Iterable[int] | None = None
+) -> None:
+    """출석 기록 전체(또는 지정한 유저)로부터 통계 행을 다시 만든다."""
+    user_filter = list(user_ids) if user_ids is not None else None
+
+    clear = delete(UserAttendanceStats)
+    if user_filter is not None:
+        clear = clear.where(UserAttendanceStats.user_id.in_(user_filter))
+    await db.execute(clear)
+
+    attending = Attendance.status == AttendanceStatus.attending
+    aggregate = (
+        select(
+            User.id,
+            func.count(func.distinct(case((attending, Group.date)))),
+            func.max(case((attending, Group.date))),
+            func.count(case((attending & (Attendance.part == PartEnum.FIRST), 1))),
+            func.count(case((attending & (Attendance.part == PartEnum.SECOND), 1))),
+        )
+        .outerjoin(Attendance, Attendance.user_id == User.id)
+        .outerjoin(Group, Attendance.group_id == Group.id)
+        .group_by(User.id)
+    )
+    if user_filter is not None:
+        aggregate = aggregate.where(User.id.in_(user_filter))
+    await db.execute(
+        insert(UserAttendanceStats).from_select(
+            [
+                UserAttendanceStats.user_id,
+                UserAttendanceStats.attended_dates,
+                UserAttendanceStats.last_attended,
+                UserAttendanceStats.first_part_count,
+                UserAttendanceStats.second_part_count,
+            ],
+            aggregate,
+        )
+    )
+
+    # users 테이블의 기존 컬럼 동기화
+    sync = _sync_user_columns()
+    if user_filter is not None:
+        sync = sync.where(User.id.in_(user_filter))
+    await db.execute(sync.execution_options(synchronize_session=False))
@@ -0,0 +1,56 @@
+"""모임 실시간 알림.
+
+출석 변경은 모임 목록의 ``part_counts`` 와 같은 모양의 증감분으로,
+조 편성은 ``/groups/{id}/teams`` 와 같은 전체 명단으로 구독자에게 보낸다.
+모든 이벤트에는 변경과 같은 트랜잭션에서 올린 모임의 ``version`` 이 붙어,
+클라이언트는 ``/me/dashboard`` 스냅샷의 ``version`` 과 비교해 이미 반영된
+이벤트는 버리고 번호가 건너뛰면 다시 불러온다.
+"""
+from typing import Iterable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.pubsub import Broker, broker as default_broker, group_topic
+from models.attendance import AttendanceStatus
+from models.user import RoleEnum
+from services.attendance_service import AppliedChange, bump_group_versions
+
+ADMIN_ROLES = (RoleEnum.admin, RoleEnum.leader)
+
+
+def attendance_count_deltas(applied: Iterable[AppliedChange]) -> dict[int, dict]:
+    """모임별 ``{부: {"admin": 증감, "member": 증감}}``. 인원이 그대로인 변경은 뺀다."""
+    deltas: dict[int, dict] = {}
+    for change in applied:
+        delta = (change.status == AttendanceStatus.attending) - (
+            change.previous == AttendanceStatus.attending
+        )
+        if not delta:
+            continue
+        bucket = "admin" if change.role in ADMIN_ROLES else "member"
+        parts = deltas.setdefault(change.group_id, {})
+        counts = parts.setdefault(change.part.value, {"admin": 0, "member": 0})
+        counts[bucket] += delta
+    return deltas
+
+
+async def attendance_events(db: AsyncSession, applied: Iterable[AppliedChange]) -> list[dict]:
+    """참석 인원이 바뀐 모임의 버전을 올리고 보낼 ``attendance`` 이벤트를 만든다.
+
+    출석 변경과 같은 쓰기 트랜잭션 안에서 호출해야 버전이 변경과 함께 커밋된다.
+    """
+    deltas = attendance_count_deltas(applied)
+    versions = await bump_group_versions(db, deltas)
+    return [
+        {"group_id": group_id, "version": versions[group_id], "part_counts": part_counts}
+        for group_id, part_counts in deltas.items()
+    ]
+
+
+def publish_attendance(events: Iterable[dict], broker: Broker = default_broker) -> None:
+    for event in events:
+        broker.publish(group_topic(event["group_id"]), "attendance", event)
+
+
+def publish_teams(group_id: int, version: int, teams: list[dict], broker: Broker = default_broker) -> None:
+    broker.publish(group_topic(group_id), "teams", {"group_id": group_id, "version": version, "teams": teams})
@@ -0,0 +1,258 @@
+"""조 편성 엔진.
+
+참석자 목록을 받아 조장 1명, 성비 균형, 싫어하는 사람 분리, 과거에 같은
+조였던 횟수를 고려한 조를 만든다. DB 에 의존하지 않는 순수 함수로, 같은
+``seed`` 에는 항상 같은 결과를 돌려준다.
+"""
+import random
+from dataclasses import dataclass, field
+from typing import Iterable
+
+from models.user import GenderEnum
+
+# 싫어하는 사람과 같은 조가 되는 것은 다른 어떤 조건보다 나쁘다
+HATE_PENALTY = 1000.0
+# 과거에 같은 조였던 횟수 1회당 벌점
+REPEAT_PENALTY = 1.0
+# 한 번의 개선 시도에서 살펴볼 교환 후보 수 (큰 인원에서도 선형에 가깝게 유지)
+MAX_SWAP_CANDIDATES = 64
+MAX_IMPROVE_PASSES = 4
+
+
+@dataclass(frozen=True)
+class Candidate:
+    id: int
+    gender: GenderEnum
+    can_lead: bool = False
+
+
+@dataclass
+class TeamPlan:
+    teams: list[list[int]]
+    leaders: list[int]
+    cost: dict = field(default_factory=dict)
+
+
+def team_capacities(total: int, team_size: int) -> list[int]:
+    """모든 조가 최소 ``team_size`` 명이 되도록 조 수를 정하고 인원을 고르게 나눈다."""
+    team_count = max(1, total // team_size)
+    base, extra = divmod(total, team_count)
+    return [base + (1 if i < extra else 0) for i in range(team_count)]
+
+
+def build_teams(
+    candidates: Iterable[Candidate],
+    team_size: int,
+    *,
+    hate_pairs: Iterable[tuple[int, int]] = (),
+    pair_counts: dict[tuple[int, int], int] | None = None,
+    seed: int | None = None,
+) -> TeamPlan:
+    """참석자를 조로 나눈다.
+
+    1. 조장 후보를 조마다 한 명씩 배정한다.
+    2. 남은 인원을 조별 목표 남녀 수에 맞춰 채운다.
+    3. 싫어하는 사람과 같은 조이거나 ``pair_counts`` (과거에 같은 조였던 횟수)가
+       있는 쌍이 모인 경우 같은 성별의 다른 조원과 교환해 벌점을 줄인다.
+
+    ``pair_counts`` 의 키는 ``(작은 id, 큰 id)`` 순서의 유저 쌍이다.
+    """
+    members = list(candidates)
+    if team_size <= 0:
+        raise ValueError("team_size must be positive")
+    if not members:
+        return TeamPlan(teams=[], leaders=[], cost=_empty_cost())
+
+    rng = random.Random(seed)
+    # 입력 순서와 무관하게 seed 만으로 결과가 정해지도록 정렬 후 섞는다
+    members.sort(key=lambda c: c.id)
+    rng.shuffle(members)
+    by_id = {c.id: c for c in members}
+
+    capacities = team_capacities(len(members), team_size)
+    team_count = len(capacities)
+    teams: list[list[int]] = [[] for _ in range(team_count)]
+
+    # 1. 조장 배정
+    leader_pool = [c for c in members if c.can_lead]
+    leaders = [c.id for c in leader_pool[:team_count]]
+    for idx, leader_id in enumerate(leaders):
+        teams[idx].append(leader_id)
+    assigned = set(leaders)
+
+    # 2. 성비 목표에 맞춰 배정
+    males = [c.id for c in members if c.id not in assigned and c.gender == GenderEnum.male]
+    females = [c.id for c in members if c.id not in assigned and c.gender != GenderEnum.male]
+    total_males = sum(1 for c in members if c.gender == GenderEnum.male)
+    male_targets = _proportional_split(total_males, capacities)
+
+    for idx, team in enumerate(teams):
+        current_males = sum(1 for uid in team if by_id[uid].gender == GenderEnum.male)
+        need_males = min(max(0, male_targets[idx] - current_males), capacities[idx] - len(team))
+        while need_males and males:
+            team.append(males.pop())
+            need_males -= 1
+        while len(team) < capacities[idx] and females:
+            team.append(females.pop())
+    # 목표를 채우지 못한 경우 남은 인원을 빈 자리에 채운다
+    leftovers = males + females
+    for idx, team in enumerate(teams):
+        while len(team) < capacities[idx] and leftovers:
+            team.append(leftovers.pop())
+
+    # 조장 후보가 부족한 조는 첫 번째 조원이 조장
+    for team in teams[len(leaders):]:
+        leaders.append(team[0])
+
+    # 3. 싫어하는 사람 분리 / 반복 만남 최소화
+    hate = _pair_penalties(((a, b, HATE_PENALTY) for a, b in hate_pairs), by_id.keys())
+    repeats = _pair_penalties(
+        ((a, b, REPEAT_PENALTY * n) for (a, b), n in (pair_counts or {}).items()),
+        by_id.keys(),
+    )
+    penalties = _merge_penalties(hate, repeats)
+    if penalties:
+        _improve(teams, set(leaders), by_id, penalties, rng)
+
+    return TeamPlan(
+        teams=teams,
+        leaders=leaders,
+        cost=_cost(teams, by_id, male_targets, hate, pair_counts or {}),
+    )
+
+
+def _proportional_split(total: int, capacities: list[int]) -> list[int]:
+    """``total`` 을 조 정원 비율대로 나눈다 (최대 잔여 방식)."""
+    size = sum(capacities)
+    raw = [total * cap / size for cap in capacities]
+    result = [int(r) for r in raw]
+    order = sorted(range(len(raw)), key=lambda i: raw[i] - result[i], reverse=True)
+    for i in order[: total - sum(result)]:
+        result[i] += 1
+    return result
+
+
+def _pair_penalties(
+    weighted_pairs: Iterable[tuple[int, int, float]], member_ids
+) -> dict[int, dict[int, float]]:
+    """(a, b, 벌점) 목록을 양방향 인접 리스트(유저 → {상대: 벌점})로 만든다."""
+    ids = set(member_ids)
+    penalties: dict[int, dict[int, float]] = {}
+    for a, b, weight in weighted_pairs:
+        if a == b or a not in ids or b not in ids or weight <= 0:
+            continue
+        penalties.setdefault(a, {})[b] = weight
+        penalties.setdefault(b, {})[a] = weight
+    return penalties
+
+
+def _merge_penalties(*tables: dict[int, dict[int, float]]) -> dict[int, dict[int, float]]:
+    merged: dict[int, dict[int, float]] = {}
+    for table in tables:
+        for uid, others in table.items():
+            row = merged.setdefault(uid, {})
+            for other, weight in others.items():
+                row[other] = row.get(other, 0.0) + weight
+    return merged
+
+
+def _penalty(uid: int, team_members: set[int], penalties, exclude: int | None = None) -> float:
+    """``uid`` 가 ``team_members`` 안에서 받는 벌점 합 (``exclude`` 는 제외)."""
+    row = penalties.get(uid)
+    if not row:
+        return 0.0
+    # 조 인원은 작으므로 상대 목록 대신 조원을 순회한다
+    return sum(row.get(other, 0.0) for other in team_members if other != uid and other != exclude)
+
+
+def _improve(teams, leaders, by_id, penalties, rng) -> None:
+    """벌점이 있는 조원을 같은 성별의 다른 조원과 교환해 총 벌점을 줄인다."""
+    team_of = {uid: idx for idx, team in enumerate(teams) for uid in team}
+    team_sets = [set(team) for team in teams]
+    swappable: dict[GenderEnum, list[int]] = {}
+    for uid in team_of:
+        if uid not in leaders:
+            swappable.setdefault(by_id[uid].gender, []).append(uid)
+
+    for _ in range(MAX_IMPROVE_PASSES):
+        improved = False
+        troubled = [uid for uid in penalties if uid not in leaders and uid in team_of]
+        rng.shuffle(troubled)
+        for uid in troubled:
+            src = team_of[uid]
+            current = _penalty(uid, team_sets[src], penalties)
+            if current <= 0:
+                continue
+            pool = swappable[by_id[uid].gender]
+            sample = pool if len(pool) <= MAX_SWAP_CANDIDATES else rng.sample(pool, MAX_SWAP_CANDIDATES)
+
+            best_gain, best_other = 0.0, None
+            for other in sample:
+                dst = team_of[other]
+                if dst == src:
+                    continue
+                before = current + _penalty(other, team_sets[dst], penalties)
+                after = _penalty(uid, team_sets[dst], penalties, exclude=other) + _penalty(
+                    other, team_sets[src], penalties, exclude=uid
+                )
+                gain = before - after
+                if gain > best_gain:
+                    best_gain, best_other = gain, other
+
+            if best_other is not None:
+                _swap(teams, team_sets, team_of, uid, src, best_other, team_of[best_other])
+                improved = True
+        if not improved:
+            break
+
+
+def _swap(teams, team_sets, team_of, a, a_team, b, b_team) -> None:
+    teams[a_team][teams[a_team].index(a)] = b
+    teams[b_team][teams[b_team].index(b)] = a
+    team_sets[a_team].discard(a)
+    team_sets[a_team].add(b)
+    team_sets[b_team].discard(b)
+    team_sets[b_team].add(a)
+    team_of[a], team_of[b] = b_team, a_team
+
+
+def _empty_cost() -> dict:
+    return {
+        "hate_conflicts": 0,
+        "repeat_pairs": 0,
+        "gender_imbalance": 0,
+        "size_spread": 0,
+        "total": 0.0,
+    }
+
+
+def _cost(teams, by_id, male_targets, hate, pair_counts) -> dict:
+    """편성 결과의 점수 (낮을수록 좋음)."""
+    hate_conflicts = 0
+    repeat_pairs = 0
+    gender_imbalance = 0
+    for idx, team in enumerate(teams):
+        members = set(team)
+        hate_conflicts += sum(
+            1 for uid in team for other in hate.get(uid, {}) if other in members and uid < other
+        )
+        ordered = sorted(team)
+        repeat_pairs += sum(
+            pair_counts.get((a, b), 0)
+            for i, a in enumerate(ordered)
+            for b in ordered[i + 1:]
+        )
+        males = sum(1 for uid in team if by_id[uid].gender == GenderEnum.male)
+        gender_imbalance += abs(males - male_targets[idx])
+    sizes = [len(team) for team in teams]
+    size_spread = max(sizes) - min(sizes)
+    return {
+        "hate_conflicts": hate_conflicts,
+        "repeat_pairs": repeat_pairs,
+        "gender_imbalance": gender_imbalance,
+        "size_spread": size_spread,
+        "total": hate_conflicts * HATE_PENALTY
+        + repeat_pairs * REPEAT_PENALTY
+        + gender_imbalance
+        + size_spread,
+    }
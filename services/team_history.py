@@ -0,0 +1,64 @@
+from typing import Iterable
+
+from sqlalchemy import delete, desc, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from models.group import Group, PartEnum, TeamPair, TeamUser
+
+
+async def load_pair_counts(
+    db: AsyncSession, group_id: int, user_ids: Iterable[int], history_groups: int
+) -> dict[tuple[int, int], int]:
+    """이 모임 이전 최근 ``history_groups`` 개 모임에서 참석자끼리 같은 조였던 횟수."""
+    ids = list(user_ids)
+    if not ids or history_groups <= 0:
+        return {}
+
+    current_date = select(Group.date).where(Group.id == group_id).scalar_subquery()
+    recent_groups = (
+        select(Group.id)
+        .where(Group.date < current_date)
+        .order_by(desc(Group.date))
+        .limit(history_groups)
+    )
+    rows = await db.execute(
+        select(TeamPair.user_a_id, TeamPair.user_b_id, func.count())
+        .where(TeamPair.group_id.in_(recent_groups))
+        .where(TeamPair.user_a_id.in_(ids))
+        .where(TeamPair.user_b_id.in_(ids))
+        .group_by(TeamPair.user_a_id, TeamPair.user_b_id)
+    )
+    return {(a, b): count for a, b, count in rows.all()}
+
+
+async def record_team_pairs(
+    db: AsyncSession, group_id: int, part: PartEnum, teams: list[list[int]]
+) -> None:
+    """새로 편성된 조의 유저 쌍으로 해당 모임/부의 기록을 교체한다."""
+    await db.execute(
+        delete(TeamPair).where(TeamPair.group_id == group_id, TeamPair.part == part)
+    )
+    rows = []
+    for team in teams:
+        ordered = sorted(team)
+        rows.extend(
+            {"group_id": group_id, "part": part, "user_a_id": a, "user_b_id": b}
+            for i, a in enumerate(ordered)
+            for b in ordered[i + 1:]
+        )
+    if rows:
+        await db.execute(insert(TeamPair), rows)
+
+
+async def rebuild_team_pairs(db: AsyncSession) -> None:
+    """``team_users`` 전체로부터 유저 쌍 기록을 다시 만든다."""
+    await db.execute(delete(TeamPair))
+    a, b = aliased(TeamUser), aliased(TeamUser)
+    await db.execute(
+        insert(TeamPair).from_select(
+            [TeamPair.group_id, TeamPair.part, TeamPair.user_a_id, TeamPair.user_b_id],
+            select(a.group_id, a.part, a.user_id, b.user_id)
+            .join(b, (a.team_id == b.team_id) & (a.user_id < b.user_id)),
+        )
+    )
@@ -1,8 +1,11 @@
 // admin.js (유저 추가/수정 + 목록 토글 + 페이지네이션 포함)
+import { authFetch } from "./auth.js";
 
 const PART_ENUM_TO_LABEL = { FIRST: "1부", SECOND: "2부" };
 const PART_LABEL_TO_ENUM = { "1부": "FIRST", "2부": "SECOND" };
 const USERS_PER_PAGE = 20;
+// 회원 목록 표에 그리는 컬럼만 요청한다
+const USER_LIST_FIELDS = "username,gender,email,role,interests,attendance_count,last_attended_date,created_at";
 let currentPage = 1;
 let currentSearch = "";
 
@@ -35,7 +38,7 @@ document.addEventListener("DOMContentLoaded", () => {
       if (!confirm("이 유저를 추가하시겠습니까?")) return;
       const formData = new FormData(form);
       try {
-        const res = await fetch("/api/v1/users/register_user", {
+        const res = await authFetch("/api/v1/users/register_user", {
           method: "POST",
           body: formData
         });
@@ -67,20 +70,26 @@ document.addEventListener("DOMContentLoaded", () => {
   const bindUserSearch = () => {
     const input = document.getElementById("user-search");
     if (!input) return;
-    input.addEventListener("input", () => loadUsers(1, input.value.trim()));
+    let timer;
+    input.addEventListener("input", () => {
+      clearTimeout(timer);
+      timer = setTimeout(() => loadUsers(1, input.value.trim()), 300);
+    });
   };
 
+  // 페이지 n 의 시작 커서 (1페이지는 커서 없음)
+  let pageCursors = [null];
+
   async function loadUsers(page = 1, search = currentSearch) {
     try {
+      if (search !== currentSearch || page === 1) pageCursors = [null];
       currentSearch = search || "";
-      const res = await fetch("/api/v1/users/get_users_detail");
+      const params = new URLSearchParams({ limit: USERS_PER_PAGE, fields: USER_LIST_FIELDS });
+      if (currentSearch) params.set("q", currentSearch);
+      if (pageCursors[page - 1]) params.set("cursor", pageCursors[page - 1]);
+      const res = await authFetch(`/api/v1/users/get_users_detail?${params}`);
       const users = await res.json();
-      const filtered = users.filter(u =>
-        u.username.toLowerCase().includes(currentSearch.toLowerCase()) ||
-        u.email.toLowerCase().includes(currentSearch.toLowerCase())
-      );
-      const start = (page - 1) * USERS_PER_PAGE;
-      const paginated = filtered.slice(start, start + USERS_PER_PAGE);
+      pageCursors[page] = res.headers.get("X-Next-Cursor");
       currentPage = page;
 
       const container = document.getElementById("user-list");
@@ -95,7 +104,7 @@ document.addEventListener("DOMContentLoaded", () => {
       `;
       const tbody = table.querySelector("tbody");
 
-      paginated.forEach(user => {
+      users.forEach(user => {
         const tr = document.createElement("tr");
         tr.innerHTML = `
           <td>${user.username}</td>
@@ -104,33 +113,36 @@ document.addEventListener("DOMContentLoaded", () => {
           <td>${user.role}</td>
           <td>${user.interests || "-"}</td>
           <td>${user.attendance_count}</td>
-          <td>${user.last_attended || "-"}</td>
-          <td>${user.created_at.slice(0, 10)}</td>
+          <td>${user.last_attended_date || "-"}</td>
+          <td>${user.created_at ? user.created_at.slice(0, 10) : "-"}</td>
           <td><button class="edit-user-btn" data-user-id="${user.id}">수정</button></td>
         `;
         tbody.appendChild(tr);
       });
 
       container.appendChild(table);
-      renderPagination(filtered.length, page);
-      bindEditButtons(filtered);
+      renderPagination(page, Boolean(pageCursors[page]));
+      bindEditButtons(users);
     } catch (err) {
       console.error("유저 목록 불러오기 실패:", err);
     }
   }
 
-  function renderPagination(total, current) {
+  function renderPagination(current, hasNext) {
+    if (current === 1 && !hasNext) return;
     const container = document.getElementById("user-list");
-    const totalPages = Math.ceil(total / USERS_PER_PAGE);
-    if (totalPages <= 1) return;
     const nav = document.createElement("div");
-    for (let i = 1; i <= totalPages; i++) {
-      const btn = document.createElement("button");
-      btn.textContent = i;
-      btn.disabled = i === current;
-      btn.onclick = () => loadUsers(i, currentSearch);
-      nav.appendChild(btn);
-    }
+    const prev = document.createElement("button");
+    prev.textContent = "이전";
+    prev.disabled = current === 1;
+    prev.onclick = () => loadUsers(current - 1, currentSearch);
+    const label = document.createElement("span");
+    label.textContent = ` ${current} `;
+    const next = document.createElement("button");
+    next.textContent = "다음";
+    next.disabled = !hasNext;
+    next.onclick = () => loadUsers(current + 1, currentSearch);
+    nav.append(prev, label, next);
     container.appendChild(nav);
   }
 
@@ -151,7 +163,7 @@ document.addEventListener("DOMContentLoaded", () => {
       e.preventDefault();
       const data = new FormData(form);
       try {
-        const res = await fetch("/api/v1/groups/create", {
+        const res = await authFetch("/api/v1/groups/create", {
           method: "POST",
           body: data,
         });
@@ -185,7 +197,7 @@ document.addEventListener("DOMContentLoaded", () => {
   // 📄 모임 목록 로딩
   async function loadGroups() {
     try {
-      const res = await fetch("/api/v1/groups/list");
+      const res = await authFetch("/api/v1/groups/list");
       const groups = await res.json();
       const ul = document.getElementById("group-list");
       ul.innerHTML = "";
@@ -242,7 +254,7 @@ document.addEventListener("DOMContentLoaded", () => {
     popup.querySelector("#edit-user-form").onsubmit = async (e) => {
       e.preventDefault();
       const formData = new FormData(e.target);
-      const res = await fetch("/api/v1/users/update_user", {
+      const res = await authFetch("/api/v1/users/update_user", {
         method: "POST",
         body: formData
       });
@@ -278,7 +290,7 @@ document.addEventListener("DOMContentLoaded", () => {
       }
 
       try {
-        const res = await fetch(`/api/v1/groups/${groupId}/teams`);
+        const res = await authFetch(`/api/v1/groups/${groupId}/teams`);
         const teams = await res.json();
         const exists = teams.some(t => t.part === partEnum);
         const msg = exists
@@ -292,8 +304,9 @@ document.addEventListener("DOMContentLoaded", () => {
       const fd = new FormData();
       fd.append("part", partEnum);
       fd.append("team_size", teamSize);
+      fd.append("avoid_repeats", form.avoid_repeats.checked);
 
-      const res = await fetch(`/api/v1/groups/${groupId}/shuffle`, {
+      const res = await authFetch(`/api/v1/groups/${groupId}/shuffle`, {
         method: "POST",
         body: fd,
       });
@@ -2,11 +2,27 @@
 
 export function requireLogin() {
     const user = JSON.parse(localStorage.getItem("currentUser"));
-    if (!user) {
+    // 토큰이 없는 예전 로그인 정보는 다시 로그인하도록 한다
+    if (!user || !user.access_token) {
       window.location.href = "/login";
     }
     return user;
   }
+
+  // 세션 토큰을 Authorization 헤더에 실어 보내는 fetch
+  export async function authFetch(url, options = {}) {
+    const user = JSON.parse(localStorage.getItem("currentUser"));
+    const headers = new Headers(options.headers || {});
+    if (user && user.access_token) {
+      headers.set("Authorization", `Bearer ${user.access_token}`);
+    }
+    const res = await fetch(url, { ...options, headers });
+    if (res.status === 401) {
+      localStorage.removeItem("currentUser");
+      window.location.href = "/login";
+    }
+    return res;
+  }
   
   export function requireRole(allowedRoles = []) {
     const user = requireLogin();
@@ -1,3 +1,5 @@
+import { authFetch } from "./auth.js";
+
 // 📦 사용자 정보 로딩
 const user = JSON.parse(localStorage.getItem("currentUser"));
 
@@ -6,6 +8,11 @@ const PART_LABEL_TO_ENUM = { "1부": "FIRST", "2부": "SECOND" };
 const PART_ENUM_TO_LABEL = { FIRST: "1부", SECOND: "2부" };
 const PART_LABELS = Object.keys(PART_LABEL_TO_ENUM);
 let allGroups = [];
+let groupEvents = null;
+// 대시보드를 불러오는 동안 받은 이벤트는 새 스냅샷에 맞춰 다시 적용한다
+let loadingGroups = false;
+let reloadGroups = false;
+let bufferedEvents = [];
 
 // 📌 페이지 초기화
 window.addEventListener("DOMContentLoaded", () => {
@@ -51,13 +58,132 @@ function startClock() {
   }, 1000);
 }
 
+// 다가오는 모임, 참석 인원, 내 출석 상태와 조를 한 번의 요청으로 불러온다
 async function loadGroups() {
+  if (loadingGroups) {
+    reloadGroups = true;
+    return;
+  }
+  loadingGroups = true;
   try {
-    const res = await fetch("/api/v1/groups/list");
-    allGroups = await res.json();
+    const res = await authFetch("/api/v1/me/dashboard");
+    allGroups = (await res.json()).groups;
     renderGroups(allGroups);
   } catch (e) {
     console.error("모임 목록 로딩 실패", e);
+  } finally {
+    loadingGroups = false;
+  }
+  // 스냅샷보다 새 이벤트만 반영되고, 번호가 건너뛰면 다시 불러온다
+  const buffered = bufferedEvents;
+  bufferedEvents = [];
+  if (!buffered.every(applyGroupEvent) || reloadGroups) {
+    reloadGroups = false;
+    return loadGroups();
+  }
+  subscribeGroupEvents(allGroups);
+}
+function renderStatus(msgElem, status) {
+  msgElem.textContent =
+    status === "참석" ? `✅ 참석 상태입니다.` :
+    status === "불참" ? `❌ 불참 상태입니다.` :
+    `❓ 아직 선택하지 않음`;
+}
+
+function myTeamLabel(team) {
+  if (!team) return "";
+  const names = team.members.map(m => `${m.username}${m.is_leader ? " ⭐" : ""}`).join(", ");
+  return `🧩 내 조${team.is_leader ? " (조장)" : ""}: ${names}`;
+}
+
+function countLabel(label, counts) {
+  return `${label} - 운영진 ${counts.admin}명 회원 ${counts.member}명`;
+}
+
+// 🔔 새로고침 없이 참석 인원/조 편성 반영 (Server-Sent Events)
+// 이벤트의 version 은 모임마다 1씩 오른다. 스냅샷(version)에 이미 포함된 이벤트는
+// 버리고, 중간 번호를 놓쳤으면 목록을 다시 불러온다
+function subscribeGroupEvents(groups) {
+  const ids = groups.map(g => g.id).sort((a, b) => a - b).join(",");
+  // 같은 모임들을 이미 구독 중이면 그대로 둔다 (버전은 받은 이벤트로 따라간다)
+  if (groupEvents && groupEvents.ids === ids) return;
+  if (groupEvents) groupEvents.close();
+  groupEvents = null;
+  if (groups.length === 0 || !window.EventSource) return;
+
+  // 서버는 보낸 버전이 DB 와 다를 때만 resync 를 보낸다
+  const params = new URLSearchParams();
+  groups.forEach(g => {
+    params.append("group_id", g.id);
+    params.append("version", g.version);
+  });
+  const source = new EventSource(`/api/v1/events/groups?${params}`);
+  source.ids = ids;
+
+  for (const name of ["attendance", "teams"]) {
+    source.addEventListener(name, e => handleGroupEvent({ name, data: JSON.parse(e.data) }));
+  }
+  // 구독 전에 바뀐 모임이 있거나 이벤트를 놓쳤을 때 (느린 연결) 목록을 다시 불러온다
+  source.addEventListener("resync", () => loadGroups());
+  // 브라우저의 자동 재접속은 처음 주소(처음 버전)를 그대로 쓰므로, 닫고 지금 버전으로 다시 구독한다
+  source.onerror = () => {
+    source.close();
+    if (groupEvents !== source) return;
+    groupEvents = null;
+    setTimeout(() => {
+      if (!groupEvents) subscribeGroupEvents(allGroups);
+    }, 3000);
+  };
+  groupEvents = source;
+}
+
+function handleGroupEvent(event) {
+  if (loadingGroups) {
+    bufferedEvents.push(event);
+  } else if (!applyGroupEvent(event)) {
+    loadGroups();
+  }
+}
+
+// 이벤트를 반영한다. 번호가 건너뛰어 다시 불러와야 하면 false
+function applyGroupEvent({ name, data }) {
+  const group = allGroups.find(g => g.id === data.group_id);
+  if (!group || data.version <= group.version) return true;
+  if (data.version > group.version + 1) return false;
+  group.version = data.version;
+  if (name === "attendance") {
+    applyCountDeltas(group, data.part_counts);
+  } else {
+    applyTeams(group, data.teams);
+  }
+  return true;
+}
+
+function applyCountDeltas(group, partCounts) {
+  for (const [part, delta] of Object.entries(partCounts)) {
+    const counts = group.part_counts[part];
+    counts.admin += delta.admin;
+    counts.member += delta.member;
+    const el = document.querySelector(`.part-count[data-group-id="${group.id}"][data-part="${part}"]`);
+    if (el) el.textContent = countLabel(PART_ENUM_TO_LABEL[part], counts);
+  }
+}
+
+function applyTeams(group, teams) {
+  for (const part of Object.keys(PART_ENUM_TO_LABEL)) {
+    const mine = teams.find(t => t.part === part && t.members.some(m => m.id === user.id));
+    const team = mine && {
+      team_id: mine.team_id,
+      is_leader: mine.members.some(m => m.id === user.id && m.is_leader),
+      members: mine.members,
+    };
+    group.my_team[part] = team || null;
+    const el = document.querySelector(`.my-team[data-group-id="${group.id}"][data-part="${part}"]`);
+    if (el) el.textContent = myTeamLabel(team);
+  }
+  const box = document.querySelector(`.team-box[data-group-id="${group.id}"]`);
+  if (box && box.style.display !== "none") {
+    box.innerHTML = renderTeamsHTML(teams, group.date);
   }
 }
 
@@ -90,18 +216,23 @@ function renderGroups(groups) {
             const c = group.part_counts?.[enumKey] || { admin: 0, member: 0 };
             return `
           <div class="part-section" data-part-label="${label}">
-            <strong>${label} - 운영진 ${c.admin}명 회원 ${c.member}명</strong>
-            <span class="attend-msg" data-part-label="${label}">⏳ 상태 확인 중...</span><br/>
+            <strong class="part-count" data-group-id="${group.id}" data-part="${enumKey}">${countLabel(label, c)}</strong>
+            <span class="attend-msg" data-group-id="${group.id}" data-part-label="${label}"></span><br/>
+            <div class="my-team" data-group-id="${group.id}" data-part="${enumKey}">${myTeamLabel(group.my_team?.[enumKey])}</div>
             <button class="attend-btn" data-part-label="${label}" ${isToday ? "disabled" : ""}>참석</button>
             <button class="absent-btn" data-part-label="${label}" ${isToday ? "disabled" : ""}>불참</button>
           </div>`;
         }).join("")}
         <div class="team-toggle">
           <button class="toggle-team-btn" data-open="false">🧩 조 편성 보기</button>
-          <div class="team-box" style="display:none;"></div>
+          <div class="team-box" data-group-id="${group.id}" style="display:none;"></div>
         </div>
       `;
 
+      li.querySelectorAll(".attend-msg").forEach(msgElem => {
+        renderStatus(msgElem, group.my_status?.[PART_LABEL_TO_ENUM[msgElem.dataset.partLabel]]);
+      });
+
       li.querySelectorAll(".attend-btn, .absent-btn").forEach(btn => {
         btn.addEventListener("click", async () => {
           const partLabel = btn.dataset.partLabel;
@@ -132,23 +263,6 @@ function renderGroups(groups) {
         }
       };
 
-      for (const label of PART_LABELS) {
-        const msgElem = li.querySelector(`.attend-msg[data-part-label="${label}"]`);
-        const apiPart = PART_LABEL_TO_ENUM[label];
-
-        fetch(`/api/v1/attendance/get?group_id=${group.id}&user_id=${user.id}&part=${encodeURIComponent(apiPart)}`)
-          .then(res => res.json())
-          .then(data => {
-            msgElem.textContent =
-              data.status === "참석" ? `✅ 참석 상태입니다.` :
-              data.status === "불참" ? `❌ 불참 상태입니다.` :
-              `❓ 아직 선택하지 않음`;
-          })
-          .catch(() => {
-            msgElem.textContent = "⚠️ 상태 로딩 실패";
-          });
-      }
-
       ul.appendChild(li);
     }
   }
@@ -161,7 +275,7 @@ async function setAttendance(groupId, apiPart, status, msgElem) {
   form.append("status", status);
 
   try {
-    const res = await fetch("/api/v1/attendance/set", {
+    const res = await authFetch("/api/v1/attendance/set", {
       method: "POST",
       body: form,
     });
@@ -177,18 +291,16 @@ async function setAttendance(groupId, apiPart, status, msgElem) {
 }
 
 async function getTeamHTML(groupId, groupDate) {
-  const res = await fetch(`/api/v1/groups/${groupId}/teams`);
+  const res = await authFetch(`/api/v1/groups/${groupId}/teams`);
   const teams = await res.json();
+  return renderTeamsHTML(teams, groupDate);
+}
+
+function renderTeamsHTML(teams, groupDate) {
   if (teams.length === 0) return "<p>아직 조가 편성되지 않았습니다.</p>";
 
-  let myTeamId = null;
-  try {
-    const myRes = await fetch(`/api/v1/groups/${groupId}/my_team?user_id=${user.id}`);
-    const myTeam = await myRes.json();
-    myTeamId = myTeam.team_id;
-  } catch (e) {
-    console.warn("내 조 정보 로딩 실패", e);
-  }
+  // 전체 명단에서 내 조를 찾는다
+  const myTeamIds = new Set(teams.filter(t => t.members.some(m => m.id === user.id)).map(t => t.team_id));
 
   const part1 = teams.filter(t => t.part === "FIRST");
   const part2 = teams.filter(t => t.part === "SECOND");
@@ -199,7 +311,7 @@ async function getTeamHTML(groupId, groupDate) {
       html += `<div class="team-row">`;
       [list[i], list[i + 1]].forEach((team, j) => {
         if (!team) return;
-        const isMine = team.id === myTeamId;
+        const isMine = myTeamIds.has(team.team_id);
         const teamNumber = i + j + 1;
         const partLabel = PART_ENUM_TO_LABEL[team.part];
         html += `<div class="team-table${isMine ? " highlight" : ""}">`;
@@ -0,0 +1,69 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+import gzip
+import re
+
+import pytest
+from httpx import AsyncClient, ASGITransport
+
+from main import app, assets
+from core.assets import AssetManifest
+
+
+@pytest.mark.asyncio
+async def test_html_shell_references_hashed_assets_and_revalidates():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        page = await client.get("/", headers={"Accept-Encoding": "identity"})
+        not_modified = await client.get("/", headers={"If-None-Match": page.headers["etag"]})
+        login = await client.get("/login")
+        admin = await client.get("/admin")
+
+    assert page.status_code == 200
+    assert page.headers["cache-control"] == "no-cache"
+    assert assets.url("index.js") in page.text
+    assert assets.url("style.css") in page.text
+    assert not_modified.status_code == 304
+    assert login.status_code == admin.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_hashed_assets_are_immutable_and_precompressed():
+    url = assets.url("index.js")
+    assert re.fullmatch(r"/static/index\.[0-9a-f]{10}\.js", url)
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        compressed = await client.get(url, headers={"Accept-Encoding": "gzip"})
+        plain = await client.get("/static/index.js", headers={"Accept-Encoding": "identity"})
+        image = await client.get(assets.url("images/login-bg.jpg"))
+        missing = await client.get("/static/nope.js")
+
+    assert compressed.headers["cache-control"] == "public, max-age=31536000, immutable"
+    assert compressed.headers["content-encoding"] == "gzip"
+    assert compressed.headers["vary"] == "Accept-Encoding"
+    assert compressed.headers["etag"].endswith('-gzip"')
+    # 내부 import 도 해시 URL 로 바뀐다
+    assert f'"./{os.path.basename(assets.url("auth.js"))}"' in compressed.text
+
+    assert plain.headers["cache-control"] == "no-cache"
+    assert "content-encoding" not in plain.headers
+    assert plain.text == compressed.text
+    assert image.status_code == 200
+    assert image.headers["content-type"] == "image/jpeg"
+    assert missing.status_code == 404
+
+
+def test_hash_changes_when_a_dependency_changes(tmp_path):
+    (tmp_path / "lib.js").write_text("export const x = 1;\n", encoding="utf-8")
+    (tmp_path / "main.js").write_text('import { x } from "./lib.js";\n' * 50, encoding="utf-8")
+    before = AssetManifest(tmp_path)
+
+    (tmp_path / "lib.js").write_text("export const x = 2;\n", encoding="utf-8")
+    after = AssetManifest(tmp_path)
+
+    assert before.url("main.js") != after.url("main.js")
+    body = after.assets["main.js"].body.decode()
+    assert os.path.basename(after.url("lib.js")) in body
+    assert gzip.decompress(after.assets["main.js"].gzip) == after.assets["main.js"].body
@@ -0,0 +1,318 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+import asyncio
+import random
+import sqlite3
+from datetime import date
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient, ASGITransport
+
+from main import app
+from core.security import create_token
+from core.cache import response_cache
+from db.init_db import init_db
+from db.session import AsyncSessionLocal, dispose_engines, retry_on_lock
+from models.attendance import Attendance, AttendanceStatus, UserAttendanceStats
+from services import attendance_service
+from services.attendance_service import AttendanceChange, apply_attendance_changes, rebuild_attendance_stats
+from models.group import Group, PartEnum
+from models.user import User, GenderEnum, RoleEnum
+from sqlalchemy import select, text
+from sqlalchemy.exc import OperationalError
+
+
+# 모임장 토큰: 모든 유저를 대신해 요청할 수 있다
+ADMIN_HEADERS = {"Authorization": f"Bearer {create_token(1, '모임장', RoleEnum.leader.value)}"}
+
+
+@pytest_asyncio.fixture(scope="module", autouse=True)
+async def setup_database():
+    await dispose_engines()
+    if os.path.exists("app.db"):
+        os.remove("app.db")
+    await init_db()
+    yield
+    await dispose_engines()
+    if os.path.exists("app.db"):
+        os.remove("app.db")
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def clear_tables():
+    async with AsyncSessionLocal() as session:
+        for table in ("team_pairs", "team_users", "teams", "attendance", "user_attendance_stats", "group_versions", "groups", "users"):
+            await session.execute(text(f"DELETE FROM {table}"))
+        await session.commit()
+    await response_cache.invalidate_all()
+    yield
+
+
+async def create_club(member_count: int, group_dates: list[date]):
+    async with AsyncSessionLocal() as session:
+        users = [
+            User(username=f"user{i}", email=f"user{i}@example.com", password="x",
+                 role=RoleEnum.member, gender=GenderEnum.male)
+            for i in range(member_count)
+        ]
+        groups = [Group(date=d) for d in group_dates]
+        session.add_all(users + groups)
+        await session.commit()
+        return [u.id for u in users], [g.id for g in groups]
+
+
+@pytest.mark.asyncio
+async def test_get_my_attendance_returns_every_group_and_part():
+    (user_id,), (g1, g2, g3) = await create_club(
+        1, [date(2025, 1, 1), date(2025, 1, 8), date(2025, 1, 15)]
+    )
+    async with AsyncSessionLocal() as session:
+        session.add_all([
+            Attendance(group_id=g1, user_id=user_id, part=PartEnum.FIRST,
+                       status=AttendanceStatus.attending),
+            Attendance(group_id=g2, user_id=user_id, part=PartEnum.SECOND,
+                       status=AttendanceStatus.absent),
+        ])
+        await session.commit()
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test", headers=ADMIN_HEADERS) as client:
+        response = await client.get("/api/v1/attendance/my", params={"user_id": user_id})
+        ranged = await client.get(
+            "/api/v1/attendance/my",
+            params={"user_id": user_id, "start_date": "2025-01-08"},
+        )
+
+    assert response.status_code == 200
+    assert response.json() == [
+        {"group_id": g1, "statuses": {"FIRST": "참석", "SECOND": None}},
+        {"group_id": g2, "statuses": {"FIRST": None, "SECOND": "불참"}},
+        {"group_id": g3, "statuses": {"FIRST": None, "SECOND": None}},
+    ]
+    assert [row["group_id"] for row in ranged.json()] == [g2, g3]
+
+
+async def load_user(user_id: int) -> User:
+    async with AsyncSessionLocal() as session:
+        return await session.get(User, user_id)
+
+
+@pytest.mark.asyncio
+async def test_set_attendance_counts_distinct_dates():
+    (user_id,), (g1, g2) = await create_club(1, [date(2025, 1, 1), date(2025, 1, 8)])
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test", headers=ADMIN_HEADERS) as client:
+        for group_id, part, status in [
+            (g1, "FIRST", "참석"),
+            (g1, "SECOND", "참석"),
+            (g2, "FIRST", "참석"),
+            (g2, "FIRST", "불참"),
+        ]:
+            response = await client.post(
+                "/api/v1/attendance/set",
+                data={"group_id": group_id, "user_id": user_id, "part": part, "status": status},
+            )
+            assert response.status_code == 200
+
+        missing = await client.post(
+            "/api/v1/attendance/set",
+            data={"group_id": 9999, "user_id": user_id, "part": "FIRST", "status": "참석"},
+        )
+    assert missing.status_code == 404
+
+    user = await load_user(user_id)
+    assert user.attendance_count == 1
+    assert user.last_attended.date() == date(2025, 1, 1)
+
+
+@pytest.mark.asyncio
+async def test_set_bulk_applies_all_changes_in_one_request():
+    user_ids, (g1, g2) = await create_club(3, [date(2025, 1, 1), date(2025, 1, 8)])
+    changes = [
+        {"group_id": g, "user_id": u, "part": "FIRST", "status": "참석"}
+        for u in user_ids
+        for g in (g1, g2)
+    ]
+    # 같은 키의 마지막 변경만 반영된다
+    changes.append({"group_id": g2, "user_id": user_ids[0], "part": "FIRST", "status": "불참"})
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test", headers=ADMIN_HEADERS) as client:
+        response = await client.post("/api/v1/attendance/set_bulk", json={"changes": changes})
+        assert response.status_code == 200
+        assert response.json()["changed"] == 6
+
+        missing = await client.post(
+            "/api/v1/attendance/set_bulk",
+            json={"changes": [{"group_id": g1, "user_id": 9999, "part": "FIRST", "status": "참석"}]},
+        )
+        assert missing.status_code == 404
+
+    first = await load_user(user_ids[0])
+    assert first.attendance_count == 1
+    assert first.last_attended.date() == date(2025, 1, 1)
+    for user_id in user_ids[1:]:
+        user = await load_user(user_id)
+        assert user.attendance_count == 2
+        assert user.last_attended.date() == date(2025, 1, 8)
+
+
+async def load_stats(user_id: int) -> UserAttendanceStats | None:
+    async with AsyncSessionLocal() as session:
+        return await session.get(UserAttendanceStats, user_id)
+
+
+@pytest.mark.asyncio
+async def test_stats_are_maintained_incrementally_and_match_rebuild():
+    (user_id,), (g1, g2, g3) = await create_club(
+        1, [date(2025, 1, 1), date(2025, 1, 8), date(2025, 1, 15)]
+    )
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test", headers=ADMIN_HEADERS) as client:
+        async def set_bulk(*changes):
+            response = await client.post(
+                "/api/v1/attendance/set_bulk",
+                json={"changes": [
+                    {"group_id": g, "user_id": user_id, "part": p, "status": s}
+                    for g, p, s in changes
+                ]},
+            )
+            assert response.status_code == 200
+
+        await set_bulk((g1, "FIRST", "참석"), (g1, "SECOND", "참석"), (g3, "SECOND", "참석"))
+        stats = await load_stats(user_id)
+        assert (stats.attended_dates, stats.last_attended) == (2, date(2025, 1, 15))
+        assert (stats.first_part_count, stats.second_part_count) == (1, 2)
+
+        # 최근 참석일을 취소하면 이전 참석일로 되돌아간다
+        await set_bulk((g3, "SECOND", "불참"), (g2, "FIRST", "불참"))
+        stats = await load_stats(user_id)
+        assert (stats.attended_dates, stats.last_attended) == (1, date(2025, 1, 1))
+        assert (stats.first_part_count, stats.second_part_count) == (1, 1)
+
+        detail = await client.get("/api/v1/users/get_users_detail")
+        row = detail.json()[0]
+        assert row["attendance_count"] == 1
+        assert row["last_attended_date"] == "2025-01-01"
+        assert (row["first_part_count"], row["second_part_count"]) == (1, 1)
+
+    async with AsyncSessionLocal() as session:
+        await rebuild_attendance_stats(session)
+        await session.commit()
+    rebuilt = await load_stats(user_id)
+    assert (rebuilt.attended_dates, rebuilt.last_attended) == (1, date(2025, 1, 1))
+    assert (rebuilt.first_part_count, rebuilt.second_part_count) == (1, 1)
+    user = await load_user(user_id)
+    assert user.attendance_count == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_writes_to_one_user_keep_stats_consistent():
+    [user_id], group_ids = await create_club(1, [date(2025, 2, 1), date(2025, 2, 1), date(2025, 2, 8)])
+    rng = random.Random(7)
+    requests = [
+        {
+            "group_id": rng.choice(group_ids),
+            "user_id": user_id,
+            "part": rng.choice(["FIRST", "SECOND"]),
+            "status": rng.choice(["참석", "불참"]),
+        }
+        for _ in range(300)
+    ]
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test", headers=ADMIN_HEADERS) as client:
+        responses = await asyncio.gather(
+            *(client.post("/api/v1/attendance/set", data=data) for data in requests)
+        )
+    assert [r.status_code for r in responses] == [200] * len(requests), responses[0].text
+
+    async def snapshot():
+        async with AsyncSessionLocal() as session:
+            stats = await session.get(UserAttendanceStats, user_id)
+            user = await session.get(User, user_id)
+            return (
+                stats.attended_dates, stats.last_attended, stats.first_part_count,
+                stats.second_part_count, user.attendance_count,
+            )
+
+    incremental = await snapshot()
+    async with AsyncSessionLocal() as session:
+        await rebuild_attendance_stats(session)
+        await session.commit()
+    assert incremental == await snapshot()
+
+
+@pytest.mark.asyncio
+async def test_dialects_without_on_conflict_fall_back_to_select_then_insert(monkeypatch):
+    # ON CONFLICT 를 지원하지 않는 DB 처럼 동작시킨다
+    monkeypatch.setattr(attendance_service, "_DIALECT_INSERTS", {})
+    user_ids, (group_id,) = await create_club(3, [date(2025, 3, 1)])
+    async with AsyncSessionLocal() as session:
+        session.add(UserAttendanceStats(user_id=user_ids[0]))
+        await session.commit()
+
+    async with AsyncSessionLocal() as session:
+        applied = await apply_attendance_changes(
+            session,
+            [AttendanceChange(group_id, uid, PartEnum.FIRST, AttendanceStatus.attending) for uid in user_ids],
+        )
+        await session.commit()
+
+    assert len(applied) == 3
+    async with AsyncSessionLocal() as session:
+        stats = (await session.scalars(select(UserAttendanceStats).order_by(UserAttendanceStats.user_id))).all()
+    assert [(s.user_id, s.attended_dates, s.first_part_count) for s in stats] == [(uid, 1, 1) for uid in user_ids]
+
+    # 이미 있는 기록은 INSERT 대신 UPDATE 로 상태를 바꾼다
+    async with AsyncSessionLocal() as session:
+        applied = await apply_attendance_changes(
+            session,
+            [
+                AttendanceChange(group_id, user_ids[0], PartEnum.FIRST, AttendanceStatus.absent),
+                AttendanceChange(group_id, user_ids[1], PartEnum.SECOND, AttendanceStatus.attending),
+            ],
+        )
+        await session.commit()
+
+    assert [(c.previous, c.status) for c in applied] == [
+        (AttendanceStatus.attending, AttendanceStatus.absent),
+        (None, AttendanceStatus.attending),
+    ]
+    async with AsyncSessionLocal() as session:
+        records = (await session.execute(
+            select(Attendance.user_id, Attendance.part, Attendance.status).order_by(Attendance.user_id, Attendance.part)
+        )).all()
+        stats = (await session.scalars(select(UserAttendanceStats).order_by(UserAttendanceStats.user_id))).all()
+    assert records == [
+        (user_ids[0], PartEnum.FIRST, AttendanceStatus.absent),
+        (user_ids[1], PartEnum.FIRST, AttendanceStatus.attending),
+        (user_ids[1], PartEnum.SECOND, AttendanceStatus.attending),
+        (user_ids[2], PartEnum.FIRST, AttendanceStatus.attending),
+    ]
+    assert [(s.attended_dates, s.first_part_count, s.second_part_count) for s in stats] == [
+        (0, 0, 0), (1, 1, 1), (1, 1, 0),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_retry_on_lock_reruns_only_lock_errors():
+    calls = []
+
+    async def flaky():
+        calls.append("flaky")
+        if len(calls) < 3:
+            raise OperationalError("UPDATE", {}, sqlite3.OperationalError("database is locked"))
+        return "ok"
+
+    async def broken():
+        calls.append("broken")
+        raise OperationalError("UPDATE", {}, sqlite3.OperationalError("no such table: x"))
+
+    async with AsyncSessionLocal() as session:
+        assert await retry_on_lock(session, flaky, base_delay=0) == "ok"
+        with pytest.raises(OperationalError):
+            await retry_on_lock(session, broken, base_delay=0)
+    assert calls == ["flaky"] * 3 + ["broken"]
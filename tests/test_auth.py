@@ -1,11 +1,14 @@
 import os
 import sys
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+import time
 import pytest
 import pytest_asyncio
 from httpx import AsyncClient, ASGITransport
 
 from main import app
+from core import security
+from core.security import create_token, decode_token, hash_password, verify_password
 from db.init_db import init_db
 from db.session import AsyncSessionLocal
 from models.user import User, GenderEnum
@@ -70,3 +73,84 @@ async def test_login_invalid_credentials(setup_database):
             data={"email": "valid@example.com", "password": "wrong"},
         )
     assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_unknown_email_costs_a_password_verification(setup_database, monkeypatch):
+    verified = []
+    real_verify = security.verify_password
+
+    def recording_verify(password, stored):
+        verified.append(stored)
+        return real_verify(password, stored)
+
+    monkeypatch.setattr(security, "verify_password", recording_verify)
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.post(
+            "/api/v1/auth/login",
+            data={"email": "nobody@example.com", "password": "secret"},
+        )
+    assert response.status_code == 401
+    # 가입된 이메일의 틀린 비밀번호와 같은 scrypt 검증을 한 번 거친다
+    assert len(verified) == 1 and verified[0].startswith("scrypt$")
+
+
+@pytest.mark.asyncio
+async def test_login_rehashes_plaintext_password_and_issues_token(setup_database):
+    user = await create_user("legacy@example.com", "secret")
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.post(
+            "/api/v1/auth/login",
+            data={"email": user.email, "password": "secret"},
+        )
+        token = response.json()["access_token"]
+        again = await client.post(
+            "/api/v1/auth/login",
+            data={"email": user.email, "password": "secret"},
+        )
+
+    async with AsyncSessionLocal() as session:
+        stored = (await session.get(User, user.id)).password
+    assert stored.startswith("scrypt$")
+    assert verify_password("secret", stored)
+    assert again.status_code == 200
+
+    claims = decode_token(token)
+    assert claims.user_id == user.id
+    assert claims.role == "회원"
+
+
+@pytest.mark.asyncio
+async def test_protected_routes_require_valid_token(setup_database):
+    user = await create_user("member@example.com", hash_password("secret"))
+    own = {"Authorization": f"Bearer {create_token(user.id, user.username, '회원')}"}
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        missing = await client.get("/api/v1/attendance/my")
+        tampered = await client.get(
+            "/api/v1/attendance/my", headers={"Authorization": own["Authorization"] + "x"}
+        )
+        mine = await client.get("/api/v1/attendance/my", headers=own)
+        other = await client.get(f"/api/v1/attendance/my?user_id={user.id + 1}", headers=own)
+        admin_only = await client.get("/api/v1/users/get_users_detail", headers=own)
+
+    assert missing.status_code == 401
+    assert tampered.status_code == 401
+    assert mine.status_code == 200
+    assert other.status_code == 403
+    assert admin_only.status_code == 403
+
+
+def test_expired_token_is_rejected():
+    token = create_token(1, "testuser", "회원", ttl=-1)
+    assert decode_token(token) is None
+
+
+def test_elevated_roles_get_shorter_tokens():
+    admin = decode_token(create_token(1, "admin", "운영진"))
+    member = decode_token(create_token(2, "member", "회원"))
+    now = time.time()
+    assert admin.expires_at <= now + security.settings.admin_token_ttl_seconds
+    assert member.expires_at > now + security.settings.admin_token_ttl_seconds
@@ -0,0 +1,75 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import pytest
+import pytest_asyncio
+
+from main import app
+from benchmarks import rosters
+from benchmarks.harness import (
+    ClubSize,
+    ScenarioResult,
+    compare_to_baseline,
+    run_all,
+    seed_club,
+)
+from db.init_db import init_db
+from db.session import AsyncSessionLocal, dispose_engines
+
+
+@pytest_asyncio.fixture(scope="module", autouse=True)
+async def setup_database():
+    await dispose_engines()
+    if os.path.exists("app.db"):
+        os.remove("app.db")
+    await init_db()
+    yield
+    await dispose_engines()
+    if os.path.exists("app.db"):
+        os.remove("app.db")
+
+
+@pytest.mark.asyncio
+async def test_harness_seeds_and_measures_every_scenario():
+    club = await seed_club(AsyncSessionLocal, ClubSize(users=60, groups=4, admins=6), seed=1)
+    assert len(club.user_ids) == 60
+    assert len(club.group_ids) == 4
+
+    results = await run_all(app, club, requests=6, concurrency=3)
+
+    assert [r.name for r in results] == ["groups_list", "attendance_set", "shuffle", "users_detail"]
+    for result in results:
+        assert result.errors == 0, result.statuses
+        assert 0 < result.p50_ms <= result.p95_ms <= result.p99_ms
+        assert result.queries_per_request >= 1
+    assert results[0].queries_per_request == 1  # 모임 목록은 집계 쿼리 1개
+
+
+def _result(**overrides) -> ScenarioResult:
+    values = dict(
+        name="groups_list", requests=100, concurrency=10, errors=0,
+        p50_ms=5.0, p95_ms=10.0, p99_ms=12.0, throughput_rps=100.0, queries_per_request=1.0,
+    )
+    values.update(overrides)
+    return ScenarioResult(**values)
+
+
+def test_compare_to_baseline_flags_latency_and_query_regressions():
+    baseline = {"groups_list": {**_result().__dict__}}
+
+    assert compare_to_baseline([_result(p95_ms=12.0)], baseline, tolerance=0.25) == []
+    slower = compare_to_baseline([_result(p95_ms=13.0)], baseline, tolerance=0.25)
+    more_queries = compare_to_baseline([_result(queries_per_request=3.0)], baseline, tolerance=0.25)
+    other_load = compare_to_baseline([_result(p95_ms=50.0, concurrency=50)], baseline, tolerance=0.25)
+
+    assert len(slower) == 1 and "p95" in slower[0]
+    assert len(more_queries) == 1 and "queries/request" in more_queries[0]
+    assert other_load == []
+
+
+@pytest.mark.asyncio
+async def test_roster_benchmark_paths_agree():
+    result = await rosters.compare(AsyncSessionLocal, attendees=40, repeat=1)
+    assert result["identical"]
+    assert result["attendees"] == 40
@@ -0,0 +1,124 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+import random
+from datetime import date
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event, func, select, text
+
+from core.security import verify_password
+from db.bulk_import import (
+    generate,
+    import_attendance,
+    import_users,
+    load_attendance_keys,
+    read_attendance_csv,
+    read_users_csv,
+)
+from db.init_db import init_db
+from db.seed_users import generate_unique_name
+from db.session import AsyncSessionLocal, dispose_engines, engine
+from models.attendance import Attendance, AttendanceStatus, UserAttendanceStats
+from models.group import Group
+from models.user import GenderEnum, RoleEnum, User
+
+
+@pytest_asyncio.fixture(scope="module", autouse=True)
+async def setup_database():
+    await dispose_engines()
+    if os.path.exists("app.db"):
+        os.remove("app.db")
+    await init_db()
+    yield
+    await dispose_engines()
+    if os.path.exists("app.db"):
+        os.remove("app.db")
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def clear_tables():
+    async with AsyncSessionLocal() as session:
+        for table in ("team_pairs", "team_users", "teams", "attendance", "user_attendance_stats", "group_versions", "groups", "users"):
+            await session.execute(text(f"DELETE FROM {table}"))
+        await session.commit()
+    yield
+
+
+def test_unique_names_do_not_spin_past_the_name_space():
+    random.seed(0)
+    names: set[str] = set()
+    for _ in range(1000):  # 성 15 × 이름 15 = 225 조합보다 훨씬 많다
+        generate_unique_name(GenderEnum.male, names)
+    assert len(names) == 1000
+
+
+@pytest.mark.asyncio
+async def test_generate_streams_users_groups_and_attendance_in_chunks():
+    statements = []
+    listener = lambda conn, cursor, statement, params, context, executemany: statements.append(statement)
+    event.listen(engine.sync_engine, "before_cursor_execute", listener)
+    try:
+        counts = await generate(
+            users=2500, admins=25, groups=4, attendance_rate=0.5, first_date=date(2025, 1, 4), seed=3
+        )
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", listener)
+
+    assert counts == {"users": 2500, "groups": 4, "attendance": 5000}
+    # 1000 행 단위 executemany: 유저 3번, 출석 5번
+    assert sum(s.startswith("INSERT INTO users") for s in statements) == 3
+    assert sum(s.startswith("INSERT INTO attendance") for s in statements) == 5
+
+    async with AsyncSessionLocal() as session:
+        assert await session.scalar(select(func.count()).select_from(User)) == 2500
+        assert await session.scalar(
+            select(func.count()).select_from(User).where(User.role == RoleEnum.admin)
+        ) == 25
+        assert await session.scalar(select(func.sum(UserAttendanceStats.attended_dates))) == 5000
+
+    # 다시 실행해도 이름/이메일이 겹치지 않는다
+    again = await generate(users=300, admins=0, groups=1, attendance_rate=0.1, first_date=date(2025, 3, 1), seed=3)
+    assert again["users"] == 300
+
+
+@pytest.mark.asyncio
+async def test_csv_import_hashes_passwords_and_upserts_attendance(tmp_path):
+    users_csv = tmp_path / "users.csv"
+    users_csv.write_text(
+        "username,email,password,gender,role,interests\n"
+        "김민준,a@test.com,secret,남,운영진,독서\n"
+        "이서연,b@test.com,secret,female,,\n",
+        encoding="utf-8",
+    )
+    assert await import_users(read_users_csv(str(users_csv))) == 2
+
+    async with AsyncSessionLocal() as session:
+        session.add(Group(date=date(2025, 5, 3)))
+        await session.commit()
+        users = {u.email: u for u in (await session.scalars(select(User))).all()}
+    assert verify_password("secret", users["a@test.com"].password)
+    assert users["a@test.com"].role == RoleEnum.admin
+    assert users["b@test.com"].gender == GenderEnum.female
+
+    attendance_csv = tmp_path / "attendance.csv"
+    attendance_csv.write_text(
+        "email,group_date,part,status\n"
+        "a@test.com,2025-05-03,FIRST,참석\n"
+        "b@test.com,2025-05-03,SECOND,참석\n"
+        "a@test.com,2025-05-03,FIRST,불참\n"  # 같은 행은 나중 값으로 덮어쓴다
+        "missing@test.com,2025-05-03,FIRST,참석\n",
+        encoding="utf-8",
+    )
+    rows = read_attendance_csv(str(attendance_csv), *await load_attendance_keys())
+    written = await import_attendance(rows, chunk_size=2)
+    assert written == 3
+
+    async with AsyncSessionLocal() as session:
+        rows = (await session.execute(select(Attendance.user_id, Attendance.status))).all()
+        stats = dict((await session.execute(
+            select(UserAttendanceStats.user_id, UserAttendanceStats.attended_dates)
+        )).all())
+    assert sorted(status for _, status in rows) == [AttendanceStatus.absent, AttendanceStatus.attending]
+    assert stats == {users["a@test.com"].id: 0, users["b@test.com"].id: 1}
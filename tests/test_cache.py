@@ -0,0 +1,197 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from dataclasses import replace
+from datetime import date
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy import event, text
+
+from main import app
+from core.security import create_token
+from core.cache import MemoryCacheBackend, response_cache
+import db.session
+from db.init_db import init_db
+from db.session import AsyncSessionLocal, dispose_engines, engine, read_engine
+from models.group import Group
+from models.user import User, GenderEnum, RoleEnum
+
+
+# 모임장 토큰: 모든 유저를 대신해 요청할 수 있다
+ADMIN_HEADERS = {"Authorization": f"Bearer {create_token(1, '모임장', RoleEnum.leader.value)}"}
+
+
+@pytest_asyncio.fixture(scope="module", autouse=True)
+async def setup_database():
+    await dispose_engines()
+    if os.path.exists("app.db"):
+        os.remove("app.db")
+    await init_db()
+    yield
+    await dispose_engines()
+    if os.path.exists("app.db"):
+        os.remove("app.db")
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def clear_tables():
+    async with AsyncSessionLocal() as session:
+        for table in ("team_pairs", "team_users", "teams", "attendance", "user_attendance_stats", "group_versions", "groups", "users"):
+            await session.execute(text(f"DELETE FROM {table}"))
+        await session.commit()
+    await response_cache.invalidate_all()
+    yield
+
+
+async def create_group_with_members() -> tuple[int, list[int]]:
+    async with AsyncSessionLocal() as session:
+        users = [
+            User(username="운영진", password="pw", email="a@test.com", gender=GenderEnum.male, role=RoleEnum.admin),
+            User(username="회원1", password="pw", email="b@test.com", gender=GenderEnum.female, role=RoleEnum.member),
+            User(username="회원2", password="pw", email="c@test.com", gender=GenderEnum.male, role=RoleEnum.member),
+        ]
+        group = Group(date=date(2025, 3, 1))
+        session.add_all([*users, group])
+        await session.commit()
+        return group.id, [u.id for u in users]
+
+
+class StatementCounter:
+    def __init__(self, target=read_engine):
+        self.target = target
+        self.count = 0
+
+    def __call__(self, *args):
+        self.count += 1
+
+    def __enter__(self):
+        event.listen(self.target.sync_engine, "before_cursor_execute", self)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.target.sync_engine, "before_cursor_execute", self)
+
+
+@pytest.mark.asyncio
+async def test_group_list_is_cached_and_revalidated_with_etag():
+    await create_group_with_members()
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test", headers=ADMIN_HEADERS) as client:
+        first = await client.get("/api/v1/groups/list")
+        assert first.status_code == 200
+        etag = first.headers["etag"]
+
+        with StatementCounter() as counter:
+            second = await client.get("/api/v1/groups/list")
+            not_modified = await client.get("/api/v1/groups/list", headers={"If-None-Match": etag})
+
+    assert counter.count == 0
+    assert first.headers["cache-control"] == "no-cache"
+    assert second.json() == first.json()
+    assert second.headers["etag"] == etag
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+
+
+@pytest.mark.asyncio
+async def test_cached_endpoints_read_from_the_primary_when_a_replica_is_configured(monkeypatch):
+    # 지연된 복제본에서 읽은 값이 새 세대 키로 캐시되지 않도록 한다
+    monkeypatch.setattr(
+        db.session, "settings", replace(db.session.settings, database_read_url="postgresql+asyncpg://replica/app")
+    )
+    group_id, _ = await create_group_with_members()
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test", headers=ADMIN_HEADERS) as client:
+        with StatementCounter(engine) as primary, StatementCounter(read_engine) as replica:
+            groups = await client.get("/api/v1/groups/list")
+            teams = await client.get(f"/api/v1/groups/{group_id}/teams")
+
+    assert groups.status_code == teams.status_code == 200
+    assert primary.count == 2 and replica.count == 0
+
+
+@pytest.mark.asyncio
+async def test_attendance_write_invalidates_group_list():
+    group_id, user_ids = await create_group_with_members()
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test", headers=ADMIN_HEADERS) as client:
+        before = await client.get("/api/v1/groups/list")
+        await client.post(
+            "/api/v1/attendance/set",
+            data={"group_id": group_id, "user_id": user_ids[1], "part": "FIRST", "status": "참석"},
+        )
+        after = await client.get("/api/v1/groups/list", headers={"If-None-Match": before.headers["etag"]})
+
+    assert after.status_code == 200
+    assert after.json()[0]["part_counts"]["FIRST"] == {"admin": 0, "member": 1}
+
+
+@pytest.mark.asyncio
+async def test_shuffle_invalidates_team_rosters():
+    group_id, user_ids = await create_group_with_members()
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test", headers=ADMIN_HEADERS) as client:
+        assert (await client.get(f"/api/v1/groups/{group_id}/teams")).json() == []
+        my_team = await client.get(f"/api/v1/groups/{group_id}/my_team", params={"user_id": user_ids[0]})
+        assert my_team.json() == {"team": None}
+        # 유저별 응답은 공유 프록시가 저장하지 않도록 private
+        assert my_team.headers["cache-control"] == "private, no-cache"
+
+        await client.post(
+            "/api/v1/attendance/set_bulk",
+            json={"changes": [
+                {"group_id": group_id, "user_id": uid, "part": "FIRST", "status": "참석"}
+                for uid in user_ids
+            ]},
+        )
+        response = await client.post(
+            f"/api/v1/groups/{group_id}/shuffle", data={"part": "FIRST", "team_size": 3, "seed": 1}
+        )
+        assert response.status_code == 200
+
+        teams = (await client.get(f"/api/v1/groups/{group_id}/teams")).json()
+        my_team = (await client.get(f"/api/v1/groups/{group_id}/my_team", params={"user_id": user_ids[0]})).json()
+
+    assert sorted(m["id"] for m in teams[0]["members"]) == sorted(user_ids)
+    assert my_team["team_id"] == teams[0]["team_id"]
+    assert my_team["is_leader"] is True
+
+
+@pytest.mark.asyncio
+async def test_role_change_invalidates_every_namespace():
+    group_id, user_ids = await create_group_with_members()
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test", headers=ADMIN_HEADERS) as client:
+        await client.post(
+            "/api/v1/attendance/set",
+            data={"group_id": group_id, "user_id": user_ids[1], "part": "FIRST", "status": "참석"},
+        )
+        assert (await client.get("/api/v1/groups/list")).json()[0]["part_counts"]["FIRST"]["member"] == 1
+        await client.post(
+            "/api/v1/users/update_user",
+            data={"user_id": user_ids[1], "email": "b@test.com", "gender": "여", "role": "모임장"},
+        )
+        counts = (await client.get("/api/v1/groups/list")).json()[0]["part_counts"]["FIRST"]
+
+    assert counts == {"admin": 1, "member": 0}
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_expires_and_evicts(monkeypatch):
+    backend = MemoryCacheBackend(max_entries=2)
+    now = [100.0]
+    monkeypatch.setattr("core.cache.time.monotonic", lambda: now[0])
+
+    await backend.set("a", b"1", ttl=10)
+    await backend.set("b", b"2", ttl=10)
+    assert await backend.get("a") == b"1"
+    await backend.set("c", b"3", ttl=10)  # "b" 가 가장 오래 사용되지 않음
+    assert await backend.get("b") is None
+    assert await backend.get("a") == b"1"
+
+    now[0] += 11
+    assert await backend.get("a") is None
+    assert await backend.incr("gen:x") == 1
+    assert await backend.get_counter("gen:x") == 1
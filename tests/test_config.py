@@ -0,0 +1,76 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from core.config import Settings
+from db.session import create_engine_from_settings, create_read_engine, read_only_url
+
+
+def test_settings_from_env(monkeypatch):
+    monkeypatch.setenv("APP_ENV", "production")
+    monkeypatch.setenv("DATABASE_URL", "postgresql+asyncpg://app@db/app")
+    monkeypatch.setenv("DB_ECHO", "1")
+    monkeypatch.setenv("DB_POOL_SIZE", "20")
+    monkeypatch.setenv("SQLITE_BUSY_TIMEOUT_MS", "1000")
+
+    settings = Settings.from_env()
+
+    assert settings.is_production
+    assert settings.database_url == "postgresql+asyncpg://app@db/app"
+    assert settings.db_echo is False  # 운영 환경에서는 항상 꺼짐
+    assert settings.db_pool_size == 20
+    assert settings.sqlite_busy_timeout_ms == 1000
+
+
+@pytest.mark.asyncio
+async def test_sqlite_engine_applies_pragmas(tmp_path):
+    settings = Settings(
+        database_url=f"sqlite+aiosqlite:///{tmp_path / 'pragma.db'}",
+        sqlite_busy_timeout_ms=1234,
+        sqlite_cache_size=-2000,
+    )
+    engine = create_engine_from_settings(settings)
+    try:
+        async with engine.connect() as conn:
+            pragma = lambda name: conn.exec_driver_sql(f"PRAGMA {name}")
+            assert (await pragma("journal_mode")).scalar() == "wal"
+            assert (await pragma("synchronous")).scalar() == 1  # NORMAL
+            assert (await pragma("busy_timeout")).scalar() == 1234
+            assert (await pragma("cache_size")).scalar() == -2000
+    finally:
+        await engine.dispose()
+
+
+def test_read_only_url():
+    replica = "postgresql+asyncpg://app@replica/app"
+    assert read_only_url(Settings(database_url="sqlite+aiosqlite:///./app.db")) == (
+        "sqlite+aiosqlite:///file:./app.db?mode=ro&uri=true"
+    )
+    assert read_only_url(Settings(database_url="sqlite+aiosqlite:///:memory:")) is None
+    assert read_only_url(Settings(database_url="postgresql+asyncpg://app@db/app")) is None
+    assert read_only_url(
+        Settings(database_url="postgresql+asyncpg://app@db/app", database_read_url=replica)
+    ) == replica
+
+
+@pytest.mark.asyncio
+async def test_read_engine_sees_commits_but_cannot_write(tmp_path):
+    settings = Settings(database_url=f"sqlite+aiosqlite:///{tmp_path / 'read only.db'}")
+    engine = create_engine_from_settings(settings)
+    reader = create_read_engine(settings, engine)
+    try:
+        async with engine.begin() as conn:
+            await conn.exec_driver_sql("CREATE TABLE t (x INTEGER)")
+            await conn.exec_driver_sql("INSERT INTO t VALUES (1)")
+        async with reader.connect() as conn:
+            assert (await conn.exec_driver_sql("PRAGMA query_only")).scalar() == 1
+            assert (await conn.exec_driver_sql("PRAGMA journal_mode")).scalar() == "wal"
+            assert (await conn.exec_driver_sql("SELECT count(*) FROM t")).scalar() == 1
+            with pytest.raises(OperationalError):
+                await conn.exec_driver_sql("INSERT INTO t VALUES (2)")
+    finally:
+        await reader.dispose()
+        await engine.dispose()
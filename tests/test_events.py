@@ -0,0 +1,185 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+import asyncio
+import json
+from datetime import date
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy import text
+
+from main import app
+from core.cache import response_cache
+from core.pubsub import RESYNC, Broker, broker, group_topic
+from core.security import create_token
+from db.init_db import init_db
+from db.session import AsyncSessionLocal, dispose_engines
+from models.group import Group
+from models.user import GenderEnum, RoleEnum, User
+
+ADMIN_HEADERS = {"Authorization": f"Bearer {create_token(1, '모임장', RoleEnum.leader.value)}"}
+
+
+@pytest_asyncio.fixture(scope="module", autouse=True)
+async def setup_database():
+    await dispose_engines()
+    if os.path.exists("app.db"):
+        os.remove("app.db")
+    await init_db()
+    yield
+    await dispose_engines()
+    if os.path.exists("app.db"):
+        os.remove("app.db")
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def clear_tables():
+    async with AsyncSessionLocal() as session:
+        for table in ("team_pairs", "team_users", "teams", "attendance", "user_attendance_stats", "group_versions", "groups", "users"):
+            await session.execute(text(f"DELETE FROM {table}"))
+        await session.commit()
+    await response_cache.invalidate_all()
+    yield
+
+
+class EventStream:
+    """ASGI 앱에 직접 연결한 SSE 스트림 (httpx 의 ASGITransport 는 응답 전체를 기다린다)."""
+
+    def __init__(self, path: str, query: str):
+        self.scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+            "method": "GET", "scheme": "http", "path": path, "raw_path": path.encode(),
+            "root_path": "", "query_string": query.encode(), "headers": [(b"host", b"test")],
+            "server": ("test", 80), "client": ("127.0.0.1", 1234),
+        }
+        self.messages: asyncio.Queue = asyncio.Queue()
+        self.disconnected = asyncio.Event()
+        self.requested = False
+
+    async def receive(self):
+        if not self.requested:
+            self.requested = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await self.disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(self, message):
+        await self.messages.put(message)
+
+    async def __aenter__(self):
+        self.task = asyncio.create_task(app(self.scope, self.receive, self.send))
+        self.start = await asyncio.wait_for(self.messages.get(), 5)
+        return self
+
+    async def __aexit__(self, *exc):
+        self.disconnected.set()
+        await asyncio.wait_for(self.task, 5)
+
+    async def next_event(self) -> tuple[str, dict]:
+        while True:
+            message = await asyncio.wait_for(self.messages.get(), 5)
+            body = message.get("body", b"")
+            if body.startswith(b"event: "):
+                head, data = body.decode().strip().split("\n", 1)
+                return head.removeprefix("event: "), json.loads(data.removeprefix("data: "))
+
+
+async def create_group_with_members():
+    async with AsyncSessionLocal() as session:
+        users = [
+            User(username=f"user{i}", email=f"user{i}@example.com", password="x",
+                 role=RoleEnum.admin if i == 0 else RoleEnum.member, gender=GenderEnum.male)
+            for i in range(4)
+        ]
+        group = Group(date=date(2025, 6, 7))
+        session.add_all(users + [group])
+        await session.commit()
+        return [u.id for u in users], group.id
+
+
+def test_slow_subscribers_get_a_resync_instead_of_unbounded_queues():
+    local = Broker(queue_size=3)
+    fast = local.subscribe([group_topic(1)])
+    slow = local.subscribe([group_topic(1), group_topic(2)])
+    other = local.subscribe([group_topic(2)])
+
+    for i in range(3):
+        assert local.publish(group_topic(1), "attendance", {"n": i}) == 2
+        fast.queue.get_nowait()
+    local.publish(group_topic(1), "attendance", {"n": 3})
+
+    assert fast.queue.qsize() == 1
+    assert [slow.queue.get_nowait()] == [RESYNC] and slow.resyncs == 1
+    assert other.queue.empty()
+
+    slow.close()
+    assert local.has_subscribers(group_topic(1)) and local.has_subscribers(group_topic(2))
+    fast.close()
+    other.close()
+    assert not local.has_subscribers(group_topic(1)) and not local.has_subscribers(group_topic(2))
+
+
+async def set_attendance(client, group_id: int, user_id: int, status: str = "참석"):
+    response = await client.post("/api/v1/attendance/set",
+                                 data={"group_id": group_id, "user_id": user_id, "part": "FIRST", "status": status})
+    assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_stream_pushes_versioned_count_deltas_and_rosters():
+    user_ids, group_id = await create_group_with_members()
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test", headers=ADMIN_HEADERS) as client:
+        dashboard = await client.get("/api/v1/me/dashboard", params={"start_date": "2025-06-01"})
+        (snapshot,) = dashboard.json()["groups"]
+        assert snapshot["version"] == 0
+
+        async with EventStream("/api/v1/events/groups", f"group_id={group_id}&version=0") as stream:
+            assert stream.start["status"] == 200
+            assert (b"content-type", b"text/event-stream; charset=utf-8") in stream.start["headers"]
+            assert broker.has_subscribers(group_topic(group_id))
+
+            # 스냅샷과 버전이 같으므로 resync 없이 바로 변경분이 온다
+            for user_id in user_ids:
+                await set_attendance(client, group_id, user_id)
+            await set_attendance(client, group_id, user_ids[1], "불참")
+            events = [await stream.next_event() for _ in range(5)]
+
+            shuffle = await client.post(f"/api/v1/groups/{group_id}/shuffle", data={"part": "FIRST", "team_size": 3})
+            assert shuffle.status_code == 200
+            name, roster = await stream.next_event()
+
+    assert [name for name, _ in events] == ["attendance"] * 5
+    assert [data["version"] for _, data in events] == [1, 2, 3, 4, 5]
+    counts = {"admin": 0, "member": 0}
+    for _, data in events:
+        assert data["group_id"] == group_id
+        for bucket, delta in data["part_counts"]["FIRST"].items():
+            counts[bucket] += delta
+    assert counts == {"admin": 1, "member": 2}
+
+    assert name == "teams" and roster["version"] == 6
+    assert sorted(m["id"] for t in roster["teams"] for m in t["members"]) == sorted(set(user_ids) - {user_ids[1]})
+    assert not broker.has_subscribers(group_topic(group_id))
+
+
+@pytest.mark.asyncio
+async def test_resync_is_sent_only_to_stale_subscribers():
+    user_ids, group_id = await create_group_with_members()
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test", headers=ADMIN_HEADERS) as client:
+        await set_attendance(client, group_id, user_ids[0])
+
+        # 구독 전에 생긴 변경을 놓친 클라이언트, 버전을 보내지 않은 클라이언트는 다시 불러온다
+        for query in (f"group_id={group_id}&version=0", f"group_id={group_id}"):
+            async with EventStream("/api/v1/events/groups", query) as stream:
+                assert await stream.next_event() == ("resync", {})
+
+        async with EventStream("/api/v1/events/groups", f"group_id={group_id}&version=1") as stream:
+            await set_attendance(client, group_id, user_ids[1])
+            assert await stream.next_event() == (
+                "attendance",
+                {"group_id": group_id, "version": 2, "part_counts": {"FIRST": {"admin": 0, "member": 1}}},
+            )
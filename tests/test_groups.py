@@ -0,0 +1,277 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from datetime import date
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient, ASGITransport
+
+from main import app
+from core.security import create_token
+from core.cache import response_cache
+from db.init_db import init_db
+from db.session import AsyncSessionLocal, dispose_engines, engine
+from models.attendance import Attendance, AttendanceStatus
+from models.group import Group, PartEnum, TeamPair
+from models.user import User, GenderEnum, HateList, RoleEnum
+from services.team_history import rebuild_team_pairs
+from sqlalchemy import event, select, text
+
+
+# 모임장 토큰: 모든 유저를 대신해 요청할 수 있다
+ADMIN_HEADERS = {"Authorization": f"Bearer {create_token(1, '모임장', RoleEnum.leader.value)}"}
+
+
+@pytest_asyncio.fixture(scope="module", autouse=True)
+async def setup_database():
+    await dispose_engines()
+    if os.path.exists("app.db"):
+        os.remove("app.db")
+    await init_db()
+    yield
+    await dispose_engines()
+    if os.path.exists("app.db"):
+        os.remove("app.db")
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def clear_tables():
+    async with AsyncSessionLocal() as session:
+        for table in ("team_pairs", "team_users", "teams", "attendance", "user_attendance_stats", "hate_list", "group_versions", "groups", "users"):
+            await session.execute(text(f"DELETE FROM {table}"))
+        await session.commit()
+    await response_cache.invalidate_all()
+    yield
+
+
+async def create_club(group_dates: list[date]):
+    """운영진 1명, 회원 2명과 주어진 날짜의 모임을 만든다."""
+    async with AsyncSessionLocal() as session:
+        users = [
+            User(username="admin", email="a@example.com", password="x",
+                 role=RoleEnum.admin, gender=GenderEnum.male),
+            User(username="m1", email="m1@example.com", password="x",
+                 role=RoleEnum.member, gender=GenderEnum.female),
+            User(username="m2", email="m2@example.com", password="x",
+                 role=RoleEnum.member, gender=GenderEnum.male),
+        ]
+        groups = [Group(date=d) for d in group_dates]
+        session.add_all(users + groups)
+        await session.commit()
+        return [u.id for u in users], [g.id for g in groups]
+
+
+async def add_attendance(rows):
+    async with AsyncSessionLocal() as session:
+        session.add_all(
+            Attendance(group_id=g, user_id=u, part=p, status=s) for g, u, p, s in rows
+        )
+        await session.commit()
+
+
+@pytest.mark.asyncio
+async def test_list_groups_counts_by_part_and_role():
+    (admin, m1, m2), (g1, g2) = await create_club([date(2025, 1, 1), date(2025, 1, 8)])
+    await add_attendance([
+        (g1, admin, PartEnum.FIRST, AttendanceStatus.attending),
+        (g1, m1, PartEnum.FIRST, AttendanceStatus.attending),
+        (g1, m2, PartEnum.SECOND, AttendanceStatus.attending),
+        (g1, m2, PartEnum.FIRST, AttendanceStatus.absent),
+    ])
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test", headers=ADMIN_HEADERS) as client:
+        response = await client.get("/api/v1/groups/list")
+    assert response.status_code == 200
+    data = response.json()
+    assert [g["id"] for g in data] == [g1, g2]
+    assert data[0]["part_counts"] == {
+        "FIRST": {"admin": 1, "member": 1},
+        "SECOND": {"admin": 0, "member": 1},
+    }
+    assert data[1]["part_counts"] == {
+        "FIRST": {"admin": 0, "member": 0},
+        "SECOND": {"admin": 0, "member": 0},
+    }
+
+
+@pytest.mark.asyncio
+async def test_list_groups_date_range_and_cursor():
+    dates = [date(2025, 1, d) for d in (1, 8, 15, 22)]
+    _, group_ids = await create_club(dates)
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test", headers=ADMIN_HEADERS) as client:
+        first = await client.get("/api/v1/groups/list", params={"limit": 2})
+        assert [g["id"] for g in first.json()] == group_ids[:2]
+        cursor = first.headers["X-Next-Cursor"]
+
+        second = await client.get("/api/v1/groups/list", params={"limit": 2, "cursor": cursor})
+        assert [g["id"] for g in second.json()] == group_ids[2:]
+        assert "X-Next-Cursor" not in second.headers
+
+        ranged = await client.get(
+            "/api/v1/groups/list",
+            params={"start_date": "2025-01-08", "end_date": "2025-01-15"},
+        )
+        assert [g["id"] for g in ranged.json()] == group_ids[1:3]
+
+        bad = await client.get("/api/v1/groups/list", params={"cursor": "nope"})
+        assert bad.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_shuffle_honours_hate_list_and_seed():
+    (admin, m1, m2), (group_id,) = await create_club([date(2025, 1, 1)])
+    async with AsyncSessionLocal() as session:
+        extra = [
+            User(username=f"x{i}", email=f"x{i}@example.com", password="x",
+                 role=RoleEnum.member, gender=GenderEnum.female if i % 2 else GenderEnum.male)
+            for i in range(5)
+        ]
+        session.add_all(extra)
+        await session.flush()
+        member_ids = [m1, m2] + [u.id for u in extra]
+        session.add(HateList(user_id=m1, hated_user_id=m2))
+        await session.commit()
+    await add_attendance(
+        [(group_id, uid, PartEnum.FIRST, AttendanceStatus.attending) for uid in [admin] + member_ids]
+    )
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test", headers=ADMIN_HEADERS) as client:
+        rosters = []
+        for _ in range(2):
+            response = await client.post(
+                f"/api/v1/groups/{group_id}/shuffle",
+                data={"part": "1부", "team_size": 4, "seed": 5},
+            )
+            assert response.status_code == 200
+            body = response.json()
+            assert body["조 수"] == 2 and body["총원"] == 8
+            assert body["cost"]["hate_conflicts"] == 0
+
+            teams = (await client.get(f"/api/v1/groups/{group_id}/teams")).json()
+            rosters.append(sorted(sorted(m["id"] for m in t["members"]) for t in teams))
+
+    assert rosters[0] == rosters[1]
+    for members in rosters[0]:
+        assert not (m1 in members and m2 in members)
+
+
+@pytest.mark.asyncio
+async def test_shuffle_persists_teams_in_constant_round_trips():
+    _, (group_id,) = await create_club([date(2025, 1, 1)])
+    async with AsyncSessionLocal() as session:
+        users = [
+            User(username=f"bulk{i}", email=f"bulk{i}@example.com", password="x",
+                 role=RoleEnum.admin if i < 10 else RoleEnum.member,
+                 gender=GenderEnum.female if i % 2 else GenderEnum.male)
+            for i in range(60)
+        ]
+        session.add_all(users)
+        await session.flush()
+        user_ids = [u.id for u in users]
+        await session.commit()
+    await add_attendance(
+        [(group_id, uid, PartEnum.SECOND, AttendanceStatus.attending) for uid in user_ids]
+    )
+
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", count)
+    try:
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test", headers=ADMIN_HEADERS) as client:
+            response = await client.post(
+                f"/api/v1/groups/{group_id}/shuffle", data={"part": "SECOND", "team_size": 4}
+            )
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", count)
+
+    assert response.status_code == 200
+    assert response.json()["조 수"] == 15
+    # 참석자, 싫어하는 관계, 삭제 2회, 조 INSERT, 조원 INSERT, 쌍 기록 삭제/INSERT, 모임 버전
+    assert len(statements) <= 9, statements
+
+    async with AsyncSessionLocal() as session:
+        rows = (await session.execute(
+            text("SELECT team_id, count(*), sum(is_leader) FROM team_users GROUP BY team_id")
+        )).all()
+    assert len(rows) == 15
+    assert all(size == 4 and leaders == 1 for _, size, leaders in rows)
+
+
+@pytest.mark.asyncio
+async def test_shuffle_records_pairs_and_avoids_repeats():
+    _, (g1, g2) = await create_club([date(2025, 1, 1), date(2025, 1, 8)])
+    async with AsyncSessionLocal() as session:
+        users = [
+            User(username=f"pair{i}", email=f"pair{i}@example.com", password="x",
+                 role=RoleEnum.member, gender=GenderEnum.female)
+            for i in range(12)
+        ]
+        session.add_all(users)
+        await session.flush()
+        user_ids = [u.id for u in users]
+        await session.commit()
+    await add_attendance(
+        [(g, uid, PartEnum.FIRST, AttendanceStatus.attending) for g in (g1, g2) for uid in user_ids]
+    )
+
+    async def pairs(group_id):
+        async with AsyncSessionLocal() as session:
+            rows = await session.execute(
+                select(TeamPair.user_a_id, TeamPair.user_b_id).where(TeamPair.group_id == group_id)
+            )
+            return set(rows.all())
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test", headers=ADMIN_HEADERS) as client:
+        first = await client.post(
+            f"/api/v1/groups/{g1}/shuffle", data={"part": "FIRST", "team_size": 4, "seed": 1}
+        )
+        assert first.status_code == 200
+        # 3개 조 x 4명 = 조마다 6쌍
+        assert len(await pairs(g1)) == 18
+
+        second = await client.post(
+            f"/api/v1/groups/{g2}/shuffle",
+            data={"part": "FIRST", "team_size": 4, "seed": 1, "avoid_repeats": "true"},
+        )
+        assert second.status_code == 200
+        assert second.json()["cost"]["repeat_pairs"] == len(await pairs(g1) & await pairs(g2))
+        assert second.json()["cost"]["repeat_pairs"] <= 6
+
+        # 같은 모임을 다시 편성하면 이전 기록은 교체된다
+        again = await client.post(
+            f"/api/v1/groups/{g2}/shuffle", data={"part": "FIRST", "team_size": 6, "seed": 2}
+        )
+        assert again.status_code == 200
+        assert len(await pairs(g2)) == 30
+
+    incremental = await pairs(g1) | await pairs(g2)
+    async with AsyncSessionLocal() as session:
+        await rebuild_team_pairs(session)
+        await session.commit()
+    assert await pairs(g1) | await pairs(g2) == incremental
+
+
+@pytest.mark.asyncio
+async def test_attendee_count_groups_by_role_in_sql():
+    (admin, m1, m2), (group_id,) = await create_club([date(2025, 1, 1)])
+    await add_attendance([
+        (group_id, admin, PartEnum.FIRST, AttendanceStatus.attending),
+        (group_id, m1, PartEnum.FIRST, AttendanceStatus.attending),
+        (group_id, m1, PartEnum.SECOND, AttendanceStatus.attending),
+        (group_id, m2, PartEnum.FIRST, AttendanceStatus.absent),
+    ])
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        counts = (await client.get(f"/api/v1/groups/{group_id}/attendee_count")).json()
+    assert counts == {"총참석": 3, "운영진": 1, "회원": 2}
@@ -0,0 +1,138 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from datetime import date
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy import event, inspect, text
+
+from main import app
+from core.security import create_token
+from db.init_db import init_db
+from db.session import AsyncSessionLocal, dispose_engines, engine, read_engine
+from models.attendance import Attendance, AttendanceStatus
+from models.group import Group, PartEnum
+from models.user import User, GenderEnum, RoleEnum
+
+# 인덱스 없이 전체 스캔되면 안 되는 테이블
+INDEXED_TABLES = ("users", "attendance", "teams", "team_users", "team_pairs", "user_attendance_stats")
+
+
+# 모임장 토큰: 모든 유저를 대신해 요청할 수 있다
+ADMIN_HEADERS = {"Authorization": f"Bearer {create_token(1, '모임장', RoleEnum.leader.value)}"}
+
+
+@pytest_asyncio.fixture(scope="module", autouse=True)
+async def setup_database():
+    await dispose_engines()
+    if os.path.exists("app.db"):
+        os.remove("app.db")
+    await init_db()
+    yield
+    await dispose_engines()
+    if os.path.exists("app.db"):
+        os.remove("app.db")
+
+
+async def seed():
+    async with AsyncSessionLocal() as session:
+        users = [
+            User(username=f"user{i}", email=f"user{i}@example.com", password="x",
+                 role=RoleEnum.admin if i < 2 else RoleEnum.member,
+                 gender=GenderEnum.male if i % 2 else GenderEnum.female)
+            for i in range(8)
+        ]
+        group = Group(date=date(2025, 1, 1))
+        session.add_all(users + [group])
+        await session.flush()
+        session.add_all(
+            Attendance(group_id=group.id, user_id=u.id, part=PartEnum.FIRST,
+                       status=AttendanceStatus.attending)
+            for u in users
+        )
+        await session.commit()
+        return [u.id for u in users], group.id
+
+
+async def capture_statements(calls):
+    """요청을 보내는 동안 실행된 SQL 문과 파라미터를 모은다."""
+    captured = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().upper().startswith(("SELECT", "DELETE", "UPDATE")):
+            captured.append((statement, parameters))
+
+    # GET 은 읽기 전용 엔진, 나머지는 쓰기 엔진에서 실행된다
+    for target in (engine, read_engine):
+        event.listen(target.sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test", headers=ADMIN_HEADERS) as client:
+            for method, url, kwargs in calls:
+                response = await client.request(method, url, **kwargs)
+                assert response.status_code == 200, response.text
+    finally:
+        for target in (engine, read_engine):
+            event.remove(target.sync_engine, "before_cursor_execute", before_cursor_execute)
+    return captured
+
+
+def full_scans(plan_rows):
+    """``SCAN <table>`` 중 인덱스를 쓰지 않는 항목을 돌려준다."""
+    scans = []
+    for row in plan_rows:
+        detail = row[-1]
+        for table in INDEXED_TABLES:
+            if detail.startswith(f"SCAN {table}") and "INDEX" not in detail:
+                scans.append(detail)
+    return scans
+
+
+@pytest.mark.asyncio
+async def test_models_declare_hot_path_indexes():
+    async with engine.connect() as conn:
+        indexes = await conn.run_sync(
+            lambda sync_conn: {
+                table: {ix["name"] for ix in inspect(sync_conn).get_indexes(table)}
+                for table in ("attendance", "teams", "team_users")
+            }
+        )
+    assert {"ix_attendance_user_status", "ix_attendance_group_status_part"} <= indexes["attendance"]
+    assert "ix_teams_group_part" in indexes["teams"]
+    assert {"ix_team_users_team", "ix_team_users_user_group"} <= indexes["team_users"]
+
+
+@pytest.mark.asyncio
+async def test_init_db_adds_missing_indexes_to_existing_database():
+    async with engine.begin() as conn:
+        await conn.execute(text("DROP INDEX ix_attendance_user_status"))
+    await init_db()
+    async with engine.connect() as conn:
+        names = await conn.run_sync(
+            lambda sync_conn: {ix["name"] for ix in inspect(sync_conn).get_indexes("attendance")}
+        )
+    assert "ix_attendance_user_status" in names
+
+
+@pytest.mark.asyncio
+async def test_hot_queries_use_indexes():
+    user_ids, group_id = await seed()
+    captured = await capture_statements([
+        ("GET", "/api/v1/groups/list", {}),
+        ("GET", "/api/v1/attendance/my", {"params": {"user_id": user_ids[0]}}),
+        ("POST", "/api/v1/attendance/set",
+         {"data": {"group_id": group_id, "user_id": user_ids[0], "part": "FIRST", "status": "불참"}}),
+        ("POST", f"/api/v1/groups/{group_id}/shuffle", {"data": {"part": "FIRST", "team_size": 4, "avoid_repeats": "true"}}),
+        ("GET", f"/api/v1/groups/{group_id}/teams", {}),
+        ("GET", f"/api/v1/groups/{group_id}/my_team", {"params": {"user_id": user_ids[1]}}),
+        ("GET", "/api/v1/users/get_users_detail", {"params": {"limit": 3}}),
+        ("GET", "/api/v1/users/get_users", {"params": {"limit": 3, "cursor": user_ids[4], "fields": "username"}}),
+    ])
+    assert captured
+
+    async with engine.connect() as conn:
+        for statement, parameters in captured:
+            plan = (await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)).all()
+            assert not full_scans(plan), f"{statement}\n{plan}"
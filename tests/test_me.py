@@ -0,0 +1,118 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from datetime import date, timedelta
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy import event, text
+
+from main import app
+from core.cache import response_cache
+from core.security import create_token
+from db.init_db import init_db
+from db.session import AsyncSessionLocal, dispose_engines, read_engine
+from models.group import Group
+from models.user import GenderEnum, RoleEnum, User
+
+ADMIN_HEADERS = {"Authorization": f"Bearer {create_token(1, '모임장', RoleEnum.leader.value)}"}
+
+
+@pytest_asyncio.fixture(scope="module", autouse=True)
+async def setup_database():
+    await dispose_engines()
+    if os.path.exists("app.db"):
+        os.remove("app.db")
+    await init_db()
+    yield
+    await dispose_engines()
+    if os.path.exists("app.db"):
+        os.remove("app.db")
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def clear_tables():
+    async with AsyncSessionLocal() as session:
+        for table in ("team_pairs", "team_users", "teams", "attendance", "user_attendance_stats", "group_versions", "groups", "users"):
+            await session.execute(text(f"DELETE FROM {table}"))
+        await session.commit()
+    await response_cache.invalidate_all()
+    yield
+
+
+async def create_club(group_count: int):
+    today = date.today()
+    async with AsyncSessionLocal() as session:
+        users = [
+            User(username=f"user{i}", email=f"user{i}@example.com", password="x",
+                 role=RoleEnum.admin if i < 2 else RoleEnum.member, gender=GenderEnum.male)
+            for i in range(6)
+        ]
+        groups = [Group(date=today - timedelta(days=7))] + [
+            Group(date=today + timedelta(days=7 * i)) for i in range(group_count)
+        ]
+        session.add_all(users + groups)
+        await session.commit()
+        return [u.id for u in users], [g.id for g in groups]
+
+
+async def dashboard_for(user_id: int):
+    """``user_id`` 로 로그인해 대시보드를 받고, 실행된 SQL 문 수도 센다."""
+    statements = []
+    listener = lambda conn, cursor, statement, params, context, executemany: statements.append(statement)
+    headers = {"Authorization": f"Bearer {create_token(user_id, 'user', RoleEnum.member.value)}"}
+    event.listen(read_engine.sync_engine, "before_cursor_execute", listener)
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            response = await client.get("/api/v1/me/dashboard", headers=headers)
+    finally:
+        event.remove(read_engine.sync_engine, "before_cursor_execute", listener)
+    assert response.status_code == 200, response.text
+    return response.json(), len(statements)
+
+
+@pytest.mark.asyncio
+async def test_dashboard_combines_counts_status_and_team():
+    user_ids, (past_id, *upcoming) = await create_club(2)
+    me = user_ids[2]
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test", headers=ADMIN_HEADERS) as client:
+        for user_id in user_ids:
+            await client.post("/api/v1/attendance/set",
+                              data={"group_id": upcoming[0], "user_id": user_id, "part": "FIRST", "status": "참석"})
+        await client.post("/api/v1/attendance/set",
+                          data={"group_id": upcoming[1], "user_id": me, "part": "SECOND", "status": "불참"})
+        shuffle = await client.post(f"/api/v1/groups/{upcoming[0]}/shuffle",
+                                    data={"part": "FIRST", "team_size": 3, "seed": 1})
+        assert shuffle.status_code == 200
+
+    data, _ = await dashboard_for(me)
+    groups = data["groups"]
+    assert [g["id"] for g in groups] == upcoming  # 지난 모임은 빠진다
+
+    first, second = groups
+    assert first["part_counts"]["FIRST"] == {"admin": 2, "member": 4}
+    # 인원이 바뀐 출석 변경과 조 편성마다 버전이 오르고, 인원이 그대로인 불참은 오르지 않는다
+    assert (first["version"], second["version"]) == (len(user_ids) + 1, 0)
+    assert first["my_status"] == {"FIRST": "참석", "SECOND": None}
+    assert second["my_status"] == {"FIRST": None, "SECOND": "불참"}
+
+    team = first["my_team"]["FIRST"]
+    assert first["my_team"]["SECOND"] is None and second["my_team"] == {"FIRST": None, "SECOND": None}
+    assert len(team["members"]) == 3 and me in {m["id"] for m in team["members"]}
+    assert sum(m["is_leader"] for m in team["members"]) == 1
+
+
+@pytest.mark.asyncio
+async def test_dashboard_query_count_does_not_grow_with_groups():
+    user_ids, _ = await create_club(1)
+    _, few = await dashboard_for(user_ids[0])
+
+    async with AsyncSessionLocal() as session:
+        session.add_all(Group(date=date.today() + timedelta(days=i + 100)) for i in range(15))
+        await session.commit()
+    data, many = await dashboard_for(user_ids[0])
+
+    assert len(data["groups"]) == 16
+    assert few == many == 3
@@ -0,0 +1,68 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from datetime import date
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient, ASGITransport
+
+from main import app
+from core.cache import response_cache
+from core.metrics import db_metrics, render_prometheus, request_metrics
+from db.init_db import init_db
+from db.session import AsyncSessionLocal, dispose_engines
+from models.group import Group
+
+
+@pytest_asyncio.fixture(scope="module", autouse=True)
+async def setup_database():
+    await dispose_engines()
+    if os.path.exists("app.db"):
+        os.remove("app.db")
+    await init_db()
+    async with AsyncSessionLocal() as session:
+        session.add_all(Group(date=date(2025, 1, d)) for d in range(1, 21))
+        await session.commit()
+    yield
+    await dispose_engines()
+    if os.path.exists("app.db"):
+        os.remove("app.db")
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def reset_metrics():
+    request_metrics.reset()
+    db_metrics.reset()
+    await response_cache.invalidate_all()
+    yield
+
+
+@pytest.mark.asyncio
+async def test_queries_are_counted_per_route():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        # 응답 캐시를 피하도록 매번 다른 limit 으로 조회
+        for limit in (100, 200, 300):
+            assert (await client.get(f"/api/v1/groups/list?limit={limit}")).status_code == 200
+        response = await client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    # 모임이 20개여도 목록 조회는 요청당 쿼리 1개
+    key = ("GET", "/api/v1/groups/list")
+    assert db_metrics.queries_per_request[key].count == 3
+    assert db_metrics.queries_per_request[key].sum == 3
+    assert 'db_queries_per_request_count{method="GET",route="/api/v1/groups/list"} 3' in body
+    assert 'http_requests_total{method="GET",route="/api/v1/groups/list",status="200"} 3' in body
+    assert "db_pool_checkout_wait_seconds_count" in body
+    assert db_metrics.slowest()[0].route == "/api/v1/groups/list"
+
+
+def test_render_prometheus_escapes_labels():
+    request_metrics.observe("GET", '/quote"d', 200, 0.01)
+    db_metrics.observe_query("SELECT 1\nFROM t", 0.002, "/r")
+    body = render_prometheus()
+    assert 'route="/quote\\"d"' in body
+    assert 'statement="SELECT 1 FROM t"' in body
@@ -0,0 +1,90 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+import logging
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from httpx import AsyncClient, ASGITransport
+
+from core.logging_setup import setup_logging, stop_logging
+from core.metrics import Histogram, RequestMetrics
+from core.middleware import LoggingMiddleware
+
+
+def make_app(metrics: RequestMetrics) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(LoggingMiddleware, metrics=metrics)
+
+    @app.get("/items/{item_id}")
+    async def read_item(item_id: int):
+        return {"id": item_id}
+
+    @app.get("/events")
+    async def events():
+        async def stream():
+            yield b"event: ping\ndata: {}\n\n"
+
+        return StreamingResponse(stream(), media_type="text/event-stream")
+
+    return app
+
+
+@pytest.mark.asyncio
+async def test_requests_are_recorded_by_route_template():
+    metrics = RequestMetrics()
+    transport = ASGITransport(app=make_app(metrics))
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        for item_id in range(5):
+            assert (await client.get(f"/items/{item_id}")).status_code == 200
+        assert (await client.get("/items/abc")).status_code == 422
+        assert (await client.get("/missing")).status_code == 404
+
+    rows = {(row["method"], row["route"]): row for row in metrics.snapshot()}
+    item = rows[("GET", "/items/{item_id}")]
+    assert item["count"] == 6
+    assert item["statuses"] == {"200": 5, "422": 1}
+    assert item["buckets"]["+Inf"] == 6
+    assert rows[("GET", "<unmatched>")]["statuses"] == {"404": 1}
+
+
+@pytest.mark.asyncio
+async def test_event_streams_stay_out_of_the_latency_histogram():
+    metrics = RequestMetrics()
+    transport = ASGITransport(app=make_app(metrics))
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        assert (await client.get("/events")).status_code == 200
+        assert (await client.get("/items/1")).status_code == 200
+
+    # 스트림은 연결 유지 시간일 뿐이라 p99 를 왜곡하지 않도록 기록하지 않는다
+    assert [row["route"] for row in metrics.snapshot()] == ["/items/{item_id}"]
+
+
+def test_histogram_quantiles():
+    histogram = Histogram(buckets=(0.01, 0.1, 1.0))
+    for _ in range(90):
+        histogram.observe(0.005)
+    for _ in range(10):
+        histogram.observe(0.5)
+    assert histogram.count == 100
+    assert histogram.quantile(0.5) <= 0.01
+    assert 0.1 < histogram.quantile(0.99) <= 1.0
+    assert histogram.cumulative() == [("0.01", 90), ("0.1", 90), ("1.0", 100), ("+Inf", 100)]
+
+
+def test_setup_logging_writes_through_queue_listener(tmp_path, monkeypatch):
+    root = logging.getLogger()
+    monkeypatch.setattr(root, "handlers", [])
+    log_file = tmp_path / "app.log"
+
+    setup_logging(str(log_file))
+    try:
+        assert [type(h).__name__ for h in root.handlers] == ["QueueHandler"]
+        logging.getLogger("test").info("hello queue")
+    finally:
+        stop_logging()
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+
+    assert "hello queue" in log_file.read_text(encoding="utf-8")
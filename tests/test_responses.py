@@ -0,0 +1,62 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+import gzip
+
+import pytest
+import pytest_asyncio
+from fastapi.responses import ORJSONResponse
+from fastapi.routing import APIRoute
+from httpx import AsyncClient, ASGITransport
+
+from main import app
+from benchmarks.serialization import compare
+from core.security import create_token
+from db.bulk_import import generate_users, import_users
+from db.init_db import init_db
+from db.session import dispose_engines
+from models.user import RoleEnum
+
+ADMIN_HEADERS = {"Authorization": f"Bearer {create_token(1, '모임장', RoleEnum.leader.value)}"}
+
+
+@pytest_asyncio.fixture(scope="module", autouse=True)
+async def setup_database():
+    await dispose_engines()
+    if os.path.exists("app.db"):
+        os.remove("app.db")
+    await init_db()
+    yield
+    await dispose_engines()
+    if os.path.exists("app.db"):
+        os.remove("app.db")
+
+
+def test_api_routes_default_to_orjson():
+    api_routes = [r for r in app.routes if isinstance(r, APIRoute) and r.path.startswith("/api/v1")]
+    assert api_routes
+    assert all(r.response_class is ORJSONResponse for r in api_routes)
+
+
+@pytest.mark.asyncio
+async def test_large_responses_are_gzipped_small_ones_are_not():
+    await import_users(generate_users(200))
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test", headers=ADMIN_HEADERS) as client:
+        # httpx 는 자동으로 압축을 풀기 때문에 raw 스트림으로 확인한다
+        async with client.stream(
+            "GET", "/api/v1/users/get_users_detail", headers={"Accept-Encoding": "gzip"}
+        ) as response:
+            raw = b"".join([chunk async for chunk in response.aiter_raw()])
+        small = await client.get("/api/v1/attendance/my", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["content-type"] == "application/json"
+    assert len(gzip.decompress(raw)) > len(raw)
+    assert "content-encoding" not in small.headers
+
+
+def test_orjson_output_matches_default_encoder():
+    result = compare(200, repeat=1)
+    assert result["identical"]
+    assert result["gzip_bytes"] < result["bytes"]
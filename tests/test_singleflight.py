@@ -0,0 +1,110 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+import asyncio
+from datetime import date
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy import event
+
+from main import app
+from core.cache import response_cache
+from core.metrics import CoalescingMetrics, coalescing_metrics
+from core.singleflight import SingleFlight
+from db.init_db import init_db
+from db.session import AsyncSessionLocal, dispose_engines, read_engine
+from models.group import Group
+
+
+@pytest_asyncio.fixture(scope="module", autouse=True)
+async def setup_database():
+    await dispose_engines()
+    if os.path.exists("app.db"):
+        os.remove("app.db")
+    await init_db()
+    async with AsyncSessionLocal() as session:
+        session.add_all(Group(date=date(2025, 3, d)) for d in range(1, 11))
+        await session.commit()
+    yield
+    await dispose_engines()
+    if os.path.exists("app.db"):
+        os.remove("app.db")
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_computation_and_its_errors():
+    flights = SingleFlight(CoalescingMetrics())
+    calls = []
+
+    async def compute(value):
+        calls.append(value)
+        await asyncio.sleep(0.01)
+        if value == "boom":
+            raise ValueError(value)
+        return [value]
+
+    results = await asyncio.gather(*(flights.do("a", lambda: compute("a"), "r") for _ in range(5)))
+    errors = await asyncio.gather(
+        *(flights.do("b", lambda: compute("boom"), "r") for _ in range(3)), return_exceptions=True
+    )
+    again = await flights.do("a", lambda: compute("a2"), "r")
+
+    assert calls == ["a", "boom", "a2"]
+    assert all(r is results[0] for r in results)
+    assert all(isinstance(e, ValueError) for e in errors)
+    assert again == ["a2"]  # 끝난 계산은 보관하지 않는다
+    assert flights.metrics.snapshot() == [
+        {"route": "r", "computed": 3, "coalesced": 6, "coalesced_ratio": 0.667}
+    ]
+    assert flights.in_flight() == 0
+
+
+@pytest.mark.asyncio
+async def test_waiters_take_over_when_the_leader_is_cancelled():
+    flights = SingleFlight(CoalescingMetrics())
+    started = asyncio.Event()
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        started.set()
+        await asyncio.sleep(0.02)
+        return calls
+
+    leader = asyncio.create_task(flights.do("k", compute))
+    await started.wait()
+    follower = asyncio.create_task(flights.do("k", compute))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert await follower == 2
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+
+
+@pytest.mark.asyncio
+async def test_identical_list_requests_run_one_query_even_without_cache(monkeypatch):
+    monkeypatch.setattr(response_cache, "ttl", 0)
+    await response_cache.invalidate_all()
+    coalescing_metrics.reset()
+    statements = []
+    listener = lambda conn, cursor, statement, params, context, executemany: statements.append(statement)
+
+    event.listen(read_engine.sync_engine, "before_cursor_execute", listener)
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            responses = await asyncio.gather(*(client.get("/api/v1/groups/list") for _ in range(20)))
+            later = await client.get("/api/v1/groups/list")
+    finally:
+        event.remove(read_engine.sync_engine, "before_cursor_execute", listener)
+
+    assert {r.status_code for r in responses} == {200}
+    assert all(r.content == responses[0].content for r in responses + [later])
+    # 동시에 온 20개는 한 번, 끝난 뒤 온 요청은 (TTL 0 이므로) 다시 조회
+    assert len(statements) == 2
+    [row] = coalescing_metrics.snapshot()
+    assert row["route"] == "/api/v1/groups/list"
+    assert (row["computed"], row["coalesced"]) == (2, 19)
@@ -0,0 +1,124 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+import random
+
+import pytest
+
+from models.user import GenderEnum
+from services import team_builder
+from services.team_builder import Candidate, build_teams, team_capacities
+
+
+def make_candidates(count: int, leaders: int, seed: int = 0) -> list[Candidate]:
+    rng = random.Random(seed)
+    return [
+        Candidate(
+            id=i + 1,
+            gender=rng.choice([GenderEnum.male, GenderEnum.female]),
+            can_lead=i < leaders,
+        )
+        for i in range(count)
+    ]
+
+
+def test_team_capacities_keep_minimum_size():
+    assert team_capacities(11, 4) == [6, 5]
+    assert team_capacities(12, 4) == [4, 4, 4]
+    assert team_capacities(3, 4) == [3]
+
+
+def test_build_teams_is_deterministic_for_seed():
+    candidates = make_candidates(30, 5)
+    first = build_teams(candidates, 4, seed=42)
+    second = build_teams(list(reversed(candidates)), 4, seed=42)
+    assert first.teams == second.teams
+    assert first.leaders == second.leaders
+
+
+def test_build_teams_one_leader_per_team_and_everyone_assigned():
+    candidates = make_candidates(43, 6)
+    plan = build_teams(candidates, 5, seed=1)
+
+    assert sorted(uid for team in plan.teams for uid in team) == [c.id for c in candidates]
+    assert len(plan.leaders) == len(plan.teams) == 8
+    for team, leader in zip(plan.teams, plan.leaders):
+        assert leader in team
+    # 조장 후보 6명은 서로 다른 조의 조장
+    assert set(plan.leaders[:6]) == {c.id for c in candidates if c.can_lead}
+    assert plan.cost["size_spread"] <= 1
+
+
+def test_build_teams_balances_gender():
+    candidates = [
+        Candidate(id=i, gender=GenderEnum.male if i < 12 else GenderEnum.female)
+        for i in range(24)
+    ]
+    plan = build_teams(candidates, 4, seed=3)
+    by_id = {c.id: c for c in candidates}
+    for team in plan.teams:
+        assert sum(by_id[uid].gender == GenderEnum.male for uid in team) == 2
+    assert plan.cost["gender_imbalance"] == 0
+
+
+def test_build_teams_separates_hated_pairs():
+    candidates = [Candidate(id=i, gender=GenderEnum.female) for i in range(20)]
+    # 모두가 다음 사람을 싫어하는 사슬
+    hate_pairs = [(i, i + 1) for i in range(19)]
+    plan = build_teams(candidates, 5, hate_pairs=hate_pairs, seed=7)
+    for team in plan.teams:
+        members = set(team)
+        assert not any(a in members and b in members for a, b in hate_pairs)
+    assert plan.cost["hate_conflicts"] == 0
+
+
+def test_build_teams_scales_to_large_meetings(monkeypatch):
+    # 벽시계 시간 대신 벌점 계산 횟수로 확인해 느린 CI 에서도 결과가 같다
+    calls = 0
+    penalty = team_builder._penalty
+
+    def counting_penalty(*args, **kwargs):
+        nonlocal calls
+        calls += 1
+        return penalty(*args, **kwargs)
+
+    monkeypatch.setattr(team_builder, "_penalty", counting_penalty)
+
+    def evaluations(count: int) -> int:
+        nonlocal calls
+        rng = random.Random(0)
+        hate_pairs = [(rng.randint(1, count), rng.randint(1, count)) for _ in range(count // 2)]
+        calls = 0
+        plan = build_teams(make_candidates(count, count // 10), 6, hate_pairs=hate_pairs, seed=0)
+        assert plan.cost["hate_conflicts"] == 0
+        # 벌점이 있는 조원마다 한 번 + 교환 후보마다 세 번, 최대 MAX_IMPROVE_PASSES 회
+        troubled = 2 * len(hate_pairs)
+        assert calls <= team_builder.MAX_IMPROVE_PASSES * troubled * (1 + 3 * team_builder.MAX_SWAP_CANDIDATES)
+        return calls
+
+    small, large = evaluations(2000), evaluations(4000)
+    # 인원이 두 배가 되어도 계산량은 (제곱이 아니라) 선형에 가깝게 늘어난다
+    assert large < 3 * small
+
+
+def test_build_teams_minimizes_repeat_pairings():
+    candidates = [Candidate(id=i, gender=GenderEnum.female) for i in range(16)]
+    # 지난 모임에서 0-3, 4-7, 8-11, 12-15 가 같은 조였다
+    previous = [list(range(start, start + 4)) for start in range(0, 16, 4)]
+    pair_counts = {
+        (a, b): 1 for team in previous for i, a in enumerate(team) for b in team[i + 1:]
+    }
+    baseline = build_teams(candidates, 4, seed=11)
+    optimized = build_teams(candidates, 4, pair_counts=pair_counts, seed=11)
+
+    def repeats(plan):
+        return sum(
+            pair_counts.get((a, b), 0)
+            for team in plan.teams
+            for i, a in enumerate(sorted(team))
+            for b in sorted(team)[i + 1:]
+        )
+
+    assert optimized.cost["repeat_pairs"] == repeats(optimized)
+    assert repeats(optimized) <= 1
+    assert repeats(optimized) <= repeats(baseline)
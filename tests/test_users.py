@@ -0,0 +1,133 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+import asyncio
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy import text
+
+from main import app
+from core.config import get_settings
+from core.security import create_token
+from db.bulk_import import generate_users, import_users
+from db.init_db import init_db
+from db.session import AsyncSessionLocal, dispose_engines, engine
+from models.user import GenderEnum, RoleEnum
+
+ADMIN_HEADERS = {"Authorization": f"Bearer {create_token(1, '모임장', RoleEnum.leader.value)}"}
+
+
+@pytest_asyncio.fixture(scope="module", autouse=True)
+async def setup_database():
+    await dispose_engines()
+    if os.path.exists("app.db"):
+        os.remove("app.db")
+    await init_db()
+    yield
+    await dispose_engines()
+    if os.path.exists("app.db"):
+        os.remove("app.db")
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def clear_users():
+    async with AsyncSessionLocal() as session:
+        await session.execute(text("DELETE FROM user_attendance_stats"))
+        await session.execute(text("DELETE FROM users"))
+        await session.commit()
+    yield
+
+
+async def fetch_all_pages(client, url, **params):
+    rows, cursor, pages = [], None, 0
+    while True:
+        query = dict(params, **({"cursor": cursor} if cursor else {}))
+        response = await client.get(url, params=query)
+        assert response.status_code == 200, response.text
+        rows.extend(response.json())
+        pages += 1
+        cursor = response.headers.get("x-next-cursor")
+        if cursor is None:
+            return rows, pages
+
+
+@pytest.mark.asyncio
+async def test_keyset_pages_cover_every_user_once():
+    # 한 번에 가져온 유저는 created_at 이 같으므로 id 로 순서가 갈린다
+    await import_users(generate_users(45, admins=5))
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test", headers=ADMIN_HEADERS) as client:
+        rows, pages = await fetch_all_pages(client, "/api/v1/users/get_users_detail", limit=10)
+        plain = await client.get("/api/v1/users/get_users", params={"limit": 500})
+
+    assert pages == 5
+    ids = [row["id"] for row in rows]
+    assert len(ids) == len(set(ids)) == 45
+    assert ids == sorted(ids, reverse=True)
+    assert all("password" not in row for row in rows + plain.json())
+    assert len(plain.json()) == 45
+
+
+@pytest.mark.asyncio
+async def test_search_filters_and_field_projection():
+    await import_users(generate_users(30, admins=4))
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test", headers=ADMIN_HEADERS) as client:
+        admins = await client.get(
+            "/api/v1/users/get_users_detail",
+            params={"role": RoleEnum.admin.value, "fields": "username,role,attendance_count"},
+        )
+        by_email = await client.get("/api/v1/users/get_users", params={"q": "user7@", "fields": "email"})
+        females = await client.get("/api/v1/users/get_users", params={"gender": "여", "fields": "gender"})
+        unknown = await client.get("/api/v1/users/get_users", params={"fields": "username,password"})
+        bad_cursor = await client.get("/api/v1/users/get_users", params={"cursor": "abc"})
+
+    assert len(admins.json()) == 4
+    assert all(set(row) == {"id", "username", "role", "attendance_count"} for row in admins.json())
+    assert all(row["role"] == RoleEnum.admin.value for row in admins.json())
+    assert by_email.json() == [{"id": by_email.json()[0]["id"], "email": "user7@example.com"}]
+    assert females.json() and all(row["gender"] == "여" for row in females.json())
+    assert unknown.status_code == 400
+    assert bad_cursor.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_search_matches_wildcard_characters_literally():
+    await import_users(generate_users(10))
+    await import_users([
+        {"username": name, "password": "x", "email": f"{email}@example.com", "role": RoleEnum.member,
+         "gender": GenderEnum.male, "interests": ""}
+        for name, email in (("under_score", "under"), ("100%", "percent"), ("back\\slash", "back"))
+    ])
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test", headers=ADMIN_HEADERS) as client:
+        found = {
+            q: [row["username"] for row in (await client.get(
+                "/api/v1/users/get_users", params={"q": q, "fields": "username"}
+            )).json()]
+            for q in ("_", "%", "\\", "r_s")
+        }
+
+    assert found == {"_": ["under_score"], "%": ["100%"], "\\": ["back\\slash"], "r_s": ["under_score"]}
+
+
+@pytest.mark.asyncio
+async def test_detail_reads_do_not_wait_for_the_write_pool():
+    await import_users(generate_users(20, admins=2))
+    settings = get_settings()
+    held = [await engine.connect() for _ in range(settings.db_pool_size + settings.db_max_overflow)]
+    try:
+        # 쓰기 풀을 모두 잡고, 그중 하나는 쓰기 잠금까지 쥔 채로 목록을 조회한다
+        await held[0].execute(text("UPDATE users SET interests = 'busy'"))
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test", headers=ADMIN_HEADERS) as client:
+            response = await asyncio.wait_for(client.get("/api/v1/users/get_users_detail"), 5)
+    finally:
+        for conn in held:
+            await conn.close()
+
+    assert response.status_code == 200
+    assert len(response.json()) == 20
+    assert all(row["interests"] != "busy" for row in response.json())
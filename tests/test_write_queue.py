@@ -0,0 +1,166 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+import asyncio
+import random
+from datetime import date
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy import func, select, text
+
+import db.write_queue
+from main import app
+from core.cache import response_cache
+from core.config import get_settings
+from core.security import create_token, verify_password
+from db.init_db import init_db
+from db.session import AsyncSessionLocal, dispose_engines
+from db.write_queue import WriteCoordinator
+from models.attendance import UserAttendanceStats
+from models.group import Group
+from models.user import GenderEnum, RoleEnum, User
+from services.attendance_service import rebuild_attendance_stats
+
+ADMIN_HEADERS = {"Authorization": f"Bearer {create_token(1, '모임장', RoleEnum.leader.value)}"}
+
+
+@pytest_asyncio.fixture(scope="module", autouse=True)
+async def setup_database():
+    await dispose_engines()
+    if os.path.exists("app.db"):
+        os.remove("app.db")
+    await init_db()
+    yield
+    await dispose_engines()
+    if os.path.exists("app.db"):
+        os.remove("app.db")
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def clear_tables():
+    async with AsyncSessionLocal() as session:
+        for table in ("team_pairs", "team_users", "teams", "attendance", "user_attendance_stats", "group_versions", "groups", "users"):
+            await session.execute(text(f"DELETE FROM {table}"))
+        await session.commit()
+    await response_cache.invalidate_all()
+    yield
+
+
+@pytest_asyncio.fixture
+async def coordinator(monkeypatch):
+    writer = WriteCoordinator.from_settings(get_settings())
+    monkeypatch.setattr(db.write_queue, "write_coordinator", writer)
+    yield writer
+    await writer.close()
+
+
+async def count_groups() -> int:
+    async with AsyncSessionLocal() as session:
+        return await session.scalar(select(func.count()).select_from(Group))
+
+
+@pytest.mark.asyncio
+async def test_batched_writes_fail_independently(coordinator):
+    async def add_group(day: int, session):
+        session.add(Group(date=date(2025, 4, day)))
+        await session.flush()
+        if day == 13:
+            raise ValueError("boom")
+        return day
+
+    results = await asyncio.gather(
+        *(coordinator.submit(lambda s, d=d: add_group(d, s)) for d in range(1, 21)),
+        return_exceptions=True,
+    )
+
+    assert [r for r in results if not isinstance(r, int)] == [results[12]]
+    assert isinstance(results[12], ValueError)
+    # 실패한 쓰기만 되돌리고 나머지는 같은 트랜잭션으로 커밋된다
+    assert await count_groups() == 19
+    assert coordinator.writes == 20 and coordinator.batches < 5
+
+
+@pytest.mark.asyncio
+async def test_concurrent_endpoint_writes_go_through_the_coordinator(coordinator):
+    async with AsyncSessionLocal() as session:
+        users = [
+            User(username=f"user{i}", email=f"user{i}@example.com", password="x",
+                 role=RoleEnum.member, gender=GenderEnum.male)
+            for i in range(5)
+        ]
+        groups = [Group(date=date(2025, 5, d)) for d in (3, 10)]
+        session.add_all(users + groups)
+        await session.commit()
+        user_ids, group_ids = [u.id for u in users], [g.id for g in groups]
+
+    rng = random.Random(3)
+    requests = [
+        {
+            "group_id": rng.choice(group_ids),
+            "user_id": rng.choice(user_ids),
+            "part": rng.choice(["FIRST", "SECOND"]),
+            "status": rng.choice(["참석", "불참"]),
+        }
+        for _ in range(200)
+    ]
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test", headers=ADMIN_HEADERS) as client:
+        responses = await asyncio.gather(
+            *(client.post("/api/v1/attendance/set", data=data) for data in requests)
+        )
+        duplicate = await client.post("/api/v1/groups/create", data={"date": "2025-05-03"})
+        created = await client.post("/api/v1/groups/create", data={"date": "2025-05-17"})
+        missing = await client.post("/api/v1/users/update_user",
+                                    data={"user_id": 999999, "email": "x@example.com", "gender": "남"})
+
+    assert [r.status_code for r in responses] == [200] * len(requests)
+    assert coordinator.batches < coordinator.writes
+    assert duplicate.status_code == 400 and duplicate.json()["detail"] == "이미 존재하는 날짜입니다."
+    assert created.status_code == 200 and await count_groups() == 3
+    assert missing.status_code == 404
+
+    async def snapshot():
+        async with AsyncSessionLocal() as session:
+            return sorted(
+                (s.user_id, s.attended_dates, s.last_attended, s.first_part_count, s.second_part_count)
+                for s in (await session.scalars(select(UserAttendanceStats))).all()
+            )
+
+    incremental = await snapshot()
+    async with AsyncSessionLocal() as session:
+        await rebuild_attendance_stats(session)
+        await session.commit()
+    assert incremental == await snapshot()
+
+
+@pytest.mark.asyncio
+async def test_login_rehash_goes_through_the_coordinator(coordinator):
+    async with AsyncSessionLocal() as session:
+        session.add(User(username="legacy", email="legacy@example.com", password="plain",
+                         role=RoleEnum.member, gender=GenderEnum.male))
+        await session.commit()
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.post("/api/v1/auth/login", data={"email": "legacy@example.com", "password": "plain"})
+
+    assert response.status_code == 200
+    assert coordinator.writes == 1
+    async with AsyncSessionLocal() as session:
+        stored = await session.scalar(select(User.password).where(User.email == "legacy@example.com"))
+    assert verify_password("plain", stored) and stored != "plain"
+
+
+@pytest.mark.asyncio
+async def test_app_shutdown_commits_queued_writes(coordinator):
+    async def add_group(day: int, session):
+        session.add(Group(date=date(2025, 6, day)))
+
+    async with app.router.lifespan_context(app):
+        pending = [asyncio.create_task(coordinator.submit(lambda s, d=d: add_group(d, s))) for d in range(1, 6)]
+        await asyncio.sleep(0)
+
+    assert all(task.done() and task.exception() is None for task in pending)
+    assert await count_groups() == 5